@@ -0,0 +1,73 @@
+"""Sobrecosto de autenticación por petición, con y sin caché de tokens verificados
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_auth [--requests 5000]
+
+Compara una ruta pública con la misma ruta protegida por ``@jwt_required``,
+reutilizando un único token como hacen los clientes entre servicios. La
+lista de revocación se simula en memoria para aislar el costo del JWT.
+"""
+import argparse
+import statistics
+import time
+
+from flask import Flask
+from flask_jwt_extended import create_access_token, jwt_required
+
+from src.infrastructure.auth.token_cache import CachingJWTManager
+
+
+def build_app(cache_size: int) -> Flask:
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'benchmark-secret-key-with-enough-bytes'
+    app.config['JWT_VERIFIED_TOKEN_CACHE_SIZE'] = cache_size
+    jwt = CachingJWTManager(app)
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(_jwt_header, _jwt_payload):
+        return False
+
+    @app.route('/public')
+    def public():
+        return {'ok': True}
+
+    @app.route('/protected')
+    @jwt_required()
+    def protected():
+        return {'ok': True}
+
+    return app
+
+
+def per_request_us(client, path: str, headers: dict, requests: int, rounds: int = 5) -> float:
+    """Mediana (en microsegundos) del tiempo por petición sobre varias rondas"""
+    for _ in range(200):
+        client.get(path, headers=headers)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get(path, headers=headers)
+        samples.append((time.perf_counter() - started) / requests * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000, help='Peticiones por ronda')
+    args = parser.parse_args()
+
+    print(f'{"caché":<10}{"pública (µs)":>15}{"protegida (µs)":>17}{"auth (µs)":>12}')
+    for label, cache_size in (('sin', 0), ('con', 1024)):
+        app = build_app(cache_size)
+        with app.app_context():
+            headers = {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+        client = app.test_client()
+        public = per_request_us(client, '/public', {}, args.requests)
+        protected = per_request_us(client, '/protected', headers, args.requests)
+        print(f'{label:<10}{public:>15.1f}{protected:>17.1f}{protected - public:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
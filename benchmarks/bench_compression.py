@@ -0,0 +1,64 @@
+"""Costo de CPU de la compresión frente a los bytes ahorrados, por tamaño de lista
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_compression [--sizes 10 100 1000 10000]
+
+Serializa listas de usuarios como GET /users y las comprime con cada
+codificación disponible (gzip siempre; brotli y zstd si están instalados)
+en varios niveles, usando los mismos compresores que ResponseCompression.
+"""
+import argparse
+import json
+import time
+
+from src.core.entities.user import User
+from src.interfaces.rest.compression import available_encoders
+from src.interfaces.rest.serializers import serialize_user
+
+LEVELS = {'gzip': (1, 6, 9), 'br': (1, 4, 11), 'zstd': (1, 3, 19)}
+
+
+def user_list_body(count: int) -> bytes:
+    users = [
+        User(id=i, email=f'usuario{i}@example.com', password='x', first_name='José',
+             last_name=f'Pérez {i % 97}', is_active=i % 10 != 0)
+        for i in range(1, count + 1)
+    ]
+    return json.dumps([serialize_user(user) for user in users], ensure_ascii=False).encode('utf-8')
+
+
+def compress_ms(factory, level: int, body: bytes, min_seconds: float = 0.2):
+    """Milisegundos por compresión (promedio) y tamaño resultante"""
+    runs, started = 0, time.perf_counter()
+    while True:
+        compressor = factory(level)
+        compressed = compressor.compress(body) + compressor.flush()
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return elapsed / runs * 1000, len(compressed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    args = parser.parse_args()
+
+    encoders = available_encoders()
+    print(f'codificaciones disponibles: {", ".join(encoders)}\n')
+    print(f'{"usuarios":>9}{"original":>11}{"codif.":>8}{"nivel":>7}{"comprimido":>12}'
+          f'{"ahorro":>8}{"ms":>9}{"MB/s":>8}')
+    for size in args.sizes:
+        body = user_list_body(size)
+        for name, factory in encoders.items():
+            for level in LEVELS[name]:
+                ms, compressed = compress_ms(factory, level, body)
+                saved = 1 - compressed / len(body)
+                throughput = len(body) / 1e6 / (ms / 1000)
+                print(f'{size:>9}{len(body):>11,}{name:>8}{level:>7}{compressed:>12,}'
+                      f'{saved:>8.0%}{ms:>9.3f}{throughput:>8.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Sobrecosto de Python por llamada de cada método de SQLAlchemyUserRepository
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_repository [--calls 2000] [--users 1000]
+
+Usa SQLite en memoria, donde ejecutar la consulta cuesta muy poco: lo que se
+mide es sobre todo construir la sentencia, compilarla (o encontrarla en la
+caché de compilación) y mapear filas a entidades. Antes de cada lectura se
+vacía el identity map, como al empezar una petición nueva.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+from flask import Flask
+
+from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor
+from src.infrastructure.database.models import db
+from src.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+
+def new_user(index: int, prefix: str = 'user') -> User:
+    return User(email=f'{prefix}{index}@example.com', password='x' * 60, first_name='Ana', last_name='Pérez')
+
+
+def per_call_us(call, calls: int, rounds: int = 5) -> float:
+    """Mediana (en microsegundos) del tiempo por llamada sobre varias rondas"""
+    session = db.session
+    for index in range(min(calls, 200)):
+        session.expunge_all()
+        call(index)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for index in range(calls):
+            session.expunge_all()
+            call(index)
+        samples.append((time.perf_counter() - started) / calls * 1e6)
+    return statistics.median(samples)
+
+
+def writes_us(repository: SQLAlchemyUserRepository, calls: int) -> dict:
+    """Tiempo por llamada de save, update y delete sobre filas nuevas"""
+    results = {}
+    started = time.perf_counter()
+    saved = [repository.save(new_user(index, 'bench')) for index in range(calls)]
+    results['save'] = (time.perf_counter() - started) / calls * 1e6
+    started = time.perf_counter()
+    for user in saved:
+        repository.update(user)
+    results['update'] = (time.perf_counter() - started) / calls * 1e6
+    started = time.perf_counter()
+    for user in saved:
+        repository.delete(user.id)
+    results['delete'] = (time.perf_counter() - started) / calls * 1e6
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=2000, help='Llamadas por ronda')
+    parser.add_argument('--users', type=int, default=1000, help='Usuarios precargados')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        repository = SQLAlchemyUserRepository()
+        ids = [repository.save(new_user(index)).id for index in range(args.users)]
+        middle = ids[len(ids) // 2]
+        cursor = repository.get_changes(ChangeCursor(), len(ids) // 2, datetime.utcnow()).cursor
+
+        reads = {
+            'get_by_id': lambda i: repository.get_by_id(ids[i % len(ids)]),
+            'get_by_email': lambda i: repository.get_by_email(f'user{i % len(ids)}@example.com'),
+            'get_credentials_by_email': lambda i: repository.get_credentials_by_email(f'user{i % len(ids)}@example.com'),
+            'exists_by_email': lambda i: repository.exists_by_email(f'user{i % len(ids)}@example.com'),
+            'get_page (50)': lambda i: repository.get_page(middle, 50),
+            'get_changes (50)': lambda i: repository.get_changes(cursor, 50, datetime.utcnow()),
+        }
+        print(f'{"método":<28}{"µs/llamada":>12}')
+        for name, call in reads.items():
+            print(f'{name:<28}{per_call_us(call, args.calls):>12.1f}')
+        for name, value in writes_us(repository, args.calls).items():
+            print(f'{name:<28}{value:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
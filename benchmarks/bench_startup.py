@@ -0,0 +1,87 @@
+"""Tiempo de arranque de la aplicación, con y sin documentación Swagger
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_startup [--runs 10]
+
+Cada muestra es un intérprete nuevo que importa ``src.app`` y ejecuta
+``create_app``, como un worker recién lanzado por el autoescalado. Se mide
+también ``create_app`` con los módulos ya importados (lo que pagan los
+fixtures de los tests) y la primera petición a ``/apispec_1.json`` frente a
+las siguientes, servidas desde memoria. Usa SQLite para no depender de
+PostgreSQL.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Se ejecuta en un intérprete nuevo: imprime import, create_app y create_app repetido en ms
+PROBE = '''
+import time
+started = time.perf_counter()
+from src.app import create_app
+imported = time.perf_counter()
+create_app('development')
+created = time.perf_counter()
+create_app('development')
+print((imported - started) * 1000, (created - imported) * 1000, (time.perf_counter() - created) * 1000)
+'''
+
+
+def cold_start_ms(swagger_enabled: bool, spec_path: str, database_url: str) -> list:
+    env = dict(os.environ, DATABASE_URL=database_url, SWAGGER_ENABLED=str(swagger_enabled).lower())
+    if spec_path:
+        env['SWAGGER_SPEC_PATH'] = spec_path
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return [float(value) for value in output.split()]
+
+
+def spec_request_ms(database_url: str) -> tuple:
+    os.environ['DATABASE_URL'] = database_url
+    from src.app import create_app
+
+    client = create_app('development').test_client()
+    started = time.perf_counter()
+    etag = client.get('/apispec_1.json').headers['ETag']
+    first = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    client.get('/apispec_1.json')
+    cached = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    client.get('/apispec_1.json', headers={'If-None-Match': etag})
+    revalidated = (time.perf_counter() - started) * 1000
+    return first, cached, revalidated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Intérpretes nuevos por variante')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f'sqlite:///{directory}/bench.db'
+        spec_path = os.path.join(directory, 'openapi.json')
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'src.app:create_app', 'docs', 'export', spec_path],
+            env=dict(os.environ, DATABASE_URL=database_url), capture_output=True, check=True
+        )
+
+        print(f'{"documentación":<22}{"import (ms)":>13}{"create_app (ms)":>17}{"repetido (ms)":>15}')
+        for label, enabled, path in (('deshabilitada', False, None), ('generada', True, None),
+                                     ('pre-generada', True, spec_path)):
+            samples = [cold_start_ms(enabled, path, database_url) for _ in range(args.runs)]
+            imported, created, repeated = (statistics.median(column) for column in zip(*samples))
+            print(f'{label:<22}{imported:>13.1f}{created:>17.1f}{repeated:>15.1f}')
+
+        first, cached, revalidated = spec_request_ms(database_url)
+        print(f'\n/apispec_1.json: primera {first:.1f} ms, cacheada {cached:.2f} ms, 304 {revalidated:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""gunicorn configuration: FLASK_ENV=production gunicorn -c gunicorn.conf.py src.wsgi:app"""
+import multiprocessing
+import os
+import time
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Threaded workers: each open /users/stream holds a thread for its whole lifetime
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = 30
+
+# Import the app once in the master; workers inherit it (copy-on-write) instead of
+# paying imports, create_app and schema compilation each
+preload_app = True
+# The master only forks: the event bridge listener starts in each worker (post_fork)
+os.environ.setdefault('EVENT_BRIDGE_AUTOSTART', 'false')
+
+
+def post_fork(server, worker):
+    # Pools created in the master must not be shared with the worker
+    from src.wsgi import app
+    from src.worker import after_fork
+
+    worker.forked_at = time.monotonic()
+    after_fork(app)
+
+
+def post_worker_init(worker):
+    # Runs before the worker accepts connections
+    from src.wsgi import app
+    from src.worker import warm_up
+
+    warm_up_seconds = warm_up(app)
+    worker.log.info(
+        'Worker %s ready in %.0f ms (warm-up %.0f ms)',
+        worker.pid, (time.monotonic() - worker.forked_at) * 1000, warm_up_seconds * 1000
+    )
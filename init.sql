@@ -2,7 +2,7 @@
 CREATE TABLE
     IF NOT EXISTS users (
         id SERIAL PRIMARY KEY,
-        email VARCHAR(255) NOT NULL UNIQUE,
+        email VARCHAR(255) NOT NULL,
         password VARCHAR(255) NOT NULL,
         first_name VARCHAR(100) NOT NULL,
         last_name VARCHAR(100) NOT NULL,
@@ -11,8 +11,8 @@ CREATE TABLE
         updated_at TIMESTAMP
     );
 
--- Crear índice para búsquedas por email
-CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
+-- Crear índice único y cubriente de email: unicidad y login con index-only scan
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_login ON users (email) INCLUDE (id, password, is_active);
 
--- Crear índice para filtrar usuarios activos
-CREATE INDEX IF NOT EXISTS idx_users_is_active ON users (is_active);
\ No newline at end of file
+-- Crear índice parcial para filtrar usuarios inactivos
+CREATE INDEX IF NOT EXISTS idx_users_inactive ON users (id) WHERE NOT is_active;
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""add user change feed
+
+Revision ID: 5c1a9d0e7b21
+Revises: 
+Create Date: 2026-10-19 09:12:44.318270
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1a9d0e7b21'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Los usuarios creados antes del flujo de cambios no tienen updated_at
+    op.execute('UPDATE users SET updated_at = created_at WHERE updated_at IS NULL')
+    op.create_index('idx_users_updated_at', 'users', ['updated_at', 'id'], unique=False)
+
+    op.create_table(
+        'user_tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_tombstones')
+    op.drop_index('idx_users_updated_at', table_name='users')
@@ -0,0 +1,52 @@
+"""audit user indexes
+
+Revision ID: 8e4b2f6a1c93
+Revises: 5c1a9d0e7b21
+Create Date: 2026-10-19 11:40:03.552817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b2f6a1c93'
+down_revision = '5c1a9d0e7b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Los índices INCLUDE y parciales son específicos de PostgreSQL
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # CONCURRENTLY no bloquea escrituras, pero no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        # Un único índice UNIQUE sobre email cubre el login y la unicidad (y ON CONFLICT (email));
+        # se crea antes de quitar la restricción para que la unicidad nunca quede sin índice
+        op.create_index('idx_users_email_login', 'users', ['email'], unique=True,
+                        postgresql_include=['id', 'password', 'is_active'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.execute('ALTER TABLE users DROP CONSTRAINT IF EXISTS users_email_key')
+        op.drop_index('idx_users_email', table_name='users', if_exists=True,
+                      postgresql_concurrently=True)
+
+        op.drop_index('idx_users_is_active', table_name='users', if_exists=True,
+                      postgresql_concurrently=True)
+        op.create_index('idx_users_inactive', 'users', ['id'],
+                        postgresql_where=sa.text('NOT is_active'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_users_inactive', table_name='users', postgresql_concurrently=True)
+        op.create_index('idx_users_is_active', 'users', ['is_active'], postgresql_concurrently=True)
+
+        op.create_index('idx_users_email', 'users', ['email'], postgresql_concurrently=True)
+        op.create_unique_constraint('users_email_key', 'users', ['email'])
+        op.drop_index('idx_users_email_login', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,25 @@
+"""add user version
+
+Revision ID: b71d3e9f0a42
+Revises: 8e4b2f6a1c93
+Create Date: 2026-10-19 15:27:03.904112
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71d3e9f0a42'
+down_revision = '8e4b2f6a1c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Con un DEFAULT constante PostgreSQL (11+) agrega la columna sin reescribir la tabla
+    op.add_column('users', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('users', 'version')
@@ -0,0 +1,35 @@
+"""add token blocklist
+
+Revision ID: f2c7a9b4e816
+Revises: d4a8c1e6f359
+Create Date: 2026-10-19 19:12:08.334051
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7a9b4e816'
+down_revision = 'd4a8c1e6f359'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'token_blocklist',
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('jti', sa.String(length=64), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'jti')
+    )
+    op.create_index('ix_token_blocklist_revoked_at', 'token_blocklist', ['revoked_at'], unique=False)
+    op.create_index('ix_token_blocklist_expires_at', 'token_blocklist', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_token_blocklist_expires_at', table_name='token_blocklist')
+    op.drop_index('ix_token_blocklist_revoked_at', table_name='token_blocklist')
+    op.drop_table('token_blocklist')
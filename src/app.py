@@ -1,13 +1,38 @@
 import os
 from flask import Flask
-from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 from flask_cors import CORS
-from flasgger import Swagger
+from sqlalchemy.engine import make_url
 
 from src.config import config
+from src.infrastructure.auth.profile_claims import profile_versions
+from src.infrastructure.auth.refresh_tokens import refresh_token_store
+from src.infrastructure.auth.token_cache import CachingJWTManager
+from src.infrastructure.auth.token_blocklist import token_blocklist
+from src.infrastructure.database.group_commit import GroupCommitBatcher
 from src.infrastructure.database.models import db
+from src.infrastructure.events.broker import event_broker
+from src.infrastructure.idempotency.store import build_idempotency_store
+from src.infrastructure.repositories.factory import build_user_repository
+from src.interfaces.rest.admin import admin_api
+from src.interfaces.rest.admission import AdmissionController
+from src.interfaces.rest.compression import ResponseCompression
 from src.interfaces.rest.controllers import api
+from src.interfaces.rest.deadlines import RequestDeadlines
+from src.interfaces.rest.docs import ApiDocs
+from src.interfaces.rest.profiling import RequestProfiler
+from src.interfaces.cli.diagnostics_commands import diagnostics_cli
+from src.interfaces.cli.docs_commands import docs_cli
+from src.interfaces.cli.user_commands import users_cli
+from src.interfaces.cli import db_commands  # noqa: F401 - registra 'flask db index-report'
+
+def _uses_queue_pool(database_uri: str) -> bool:
+    """Indica si SQLAlchemy creará el engine con QueuePool (todo menos SQLite en memoria)"""
+    url = make_url(database_uri)
+    if url.get_backend_name() != 'sqlite':
+        return True
+    return url.database not in (None, '', ':memory:') and url.query.get('mode') != 'memory'
+
 
 def create_app(config_name=None):
     """Fábrica de aplicación Flask"""
@@ -21,24 +46,66 @@ def create_app(config_name=None):
     # Configurar JSON encoder para manejar caracteres UTF-8
     app.json.ensure_ascii = False
 
+    # pool_timeout solo es válido con QueuePool
+    engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    if _uses_queue_pool(app.config['SQLALCHEMY_DATABASE_URI']):
+        engine_options.setdefault('pool_timeout', app.config.get('DB_POOL_TIMEOUT', 5))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+
     # Inicializar extensiones
     db.init_app(app)
     Migrate(app, db)
-    jwt = JWTManager(app)
+    jwt = CachingJWTManager(app)
     CORS(app)
+    event_broker.init_app(app)
+    if app.config.get('JWT_PROFILE_CLAIMS'):
+        profile_versions.init_app(app, event_broker)
+    if app.config.get('GROUP_COMMIT_ENABLED'):
+        with app.app_context():
+            app.extensions['group_commit'] = GroupCommitBatcher(
+                db.engine,
+                max_batch_size=app.config['GROUP_COMMIT_MAX_BATCH_SIZE'],
+                max_delay=app.config['GROUP_COMMIT_MAX_DELAY_MS'] / 1000
+            )
+    app.extensions['user_repository'] = build_user_repository(
+        app.config, group_commit=app.extensions.get('group_commit')
+    )
+    app.extensions['idempotency_store'] = build_idempotency_store(app)
+    if app.config.get('REFRESH_TOKENS_ENABLED'):
+        refresh_token_store.init_app(app, event_broker)
+    if app.config.get('TOKEN_BLOCKLIST_ENABLED'):
+        token_blocklist.init_app(app, event_broker)
+
+        @jwt.token_in_blocklist_loader
+        def check_if_token_revoked(_jwt_header, jwt_payload):
+            return token_blocklist.is_revoked(jwt_payload)
 
     # Configurar JWT para extraer el token del header
     app.config['JWT_TOKEN_LOCATION'] = ['headers']
     
-    Swagger(app)
+    ApiDocs(app)
+
+    if app.config.get('ADMISSION_CONTROL_ENABLED'):
+        AdmissionController(app)
+    RequestDeadlines(app)
+    RequestProfiler(app)
+    if app.config.get('COMPRESSION_ENABLED'):
+        ResponseCompression(app)
 
     # Registrar blueprints
     app.register_blueprint(api, url_prefix='/api/v1')
+    app.register_blueprint(admin_api, url_prefix='/admin')
+
+    # Registrar comandos CLI
+    app.cli.add_command(users_cli)
+    app.cli.add_command(diagnostics_cli)
+    app.cli.add_command(docs_cli)
 
     @app.route('/health')
     def health_check():
         """Endpoint de verificación de salud"""
-        return {'status': 'healthy'}, 200
+        admission = app.extensions.get('admission_control')
+        return {'status': 'healthy', 'shedding': admission.shedding if admission else False}, 200
 
     return app
 
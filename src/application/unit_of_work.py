@@ -0,0 +1,106 @@
+from abc import abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from src.core.entities.user_event import UserEvent
+from src.core.ports.event_publisher import EventPublisher
+from src.core.ports.user_repository import UserRepository
+
+
+class UnitOfWork(EventPublisher):
+    """Agrupa las operaciones de una petición en una sola transacción
+
+    Los repositorios de la unidad no confirman por su cuenta: ``commit`` lo
+    hace una única vez al final. La unidad también actúa como publicador de
+    eventos y los retiene hasta el commit, así nunca se anuncia un cambio
+    que terminó revirtiéndose.
+    """
+
+    users: UserRepository
+
+    def __init__(self, event_publisher: Optional[EventPublisher] = None):
+        self.event_publisher = event_publisher
+        self._pending_events: List[UserEvent] = []
+
+    def __enter__(self) -> 'UnitOfWork':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def publish(self, event: UserEvent) -> None:
+        self._pending_events.append(event)
+
+    def commit(self) -> None:
+        """Confirma la transacción y entrega los eventos retenidos"""
+        try:
+            self._commit()
+        except Exception:
+            self.rollback()
+            raise
+        events, self._pending_events = self._pending_events, []
+        if self.event_publisher is not None:
+            for event in events:
+                self.event_publisher.publish(event)
+
+    def rollback(self) -> None:
+        """Revierte la transacción y descarta los eventos retenidos"""
+        self._pending_events = []
+        self._rollback()
+
+    @contextmanager
+    def savepoint(self) -> Iterator[None]:
+        """Punto de reversión para una operación anidada
+
+        Si el bloque lanza una excepción solo se revierten sus cambios y sus
+        eventos; la transacción de la petición sigue abierta.
+        """
+        pending = len(self._pending_events)
+        try:
+            with self._savepoint():
+                yield
+        except Exception:
+            del self._pending_events[pending:]
+            raise
+
+    @abstractmethod
+    def _commit(self) -> None:
+        pass
+
+    @abstractmethod
+    def _rollback(self) -> None:
+        pass
+
+    @abstractmethod
+    def _savepoint(self):
+        pass
+
+
+class AutocommitUnitOfWork(UnitOfWork):
+    """Unidad de trabajo para repositorios que confirman cada operación
+
+    Los repositorios en memoria y particionados no comparten una transacción
+    con la petición: sus cambios ya son definitivos, así que los eventos se
+    publican de inmediato.
+    """
+
+    def __init__(self, users: UserRepository, event_publisher: Optional[EventPublisher] = None):
+        super().__init__(event_publisher)
+        self.users = users
+
+    def publish(self, event: UserEvent) -> None:
+        if self.event_publisher is not None:
+            self.event_publisher.publish(event)
+
+    def _commit(self) -> None:
+        pass
+
+    def _rollback(self) -> None:
+        pass
+
+    @contextmanager
+    def _savepoint(self) -> Iterator[None]:
+        yield
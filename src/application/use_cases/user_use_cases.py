@@ -1,7 +1,14 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import List, Optional
 
 from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor, UserChanges
+from src.core.entities.user_event import (
+    USER_ACTIVATED, USER_CREATED, USER_DEACTIVATED, USER_DELETED, USER_UPDATED, UserEvent
+)
+from src.core.exceptions import ConcurrencyConflictError
+from src.core.ports.event_publisher import EventPublisher
 from src.core.ports.user_repository import UserRepository
 
 
@@ -22,8 +29,26 @@ class UpdateUserDTO:
 class UserUseCases:
     """Casos de uso para la gestión de usuarios"""
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, event_publisher: Optional[EventPublisher] = None):
         self.user_repository = user_repository
+        self.event_publisher = event_publisher
+
+    def _publish(self, event_type: str, user: User) -> None:
+        """Publica un evento con los datos públicos del usuario"""
+        if self.event_publisher is None:
+            return
+        self.event_publisher.publish(UserEvent(
+            type=event_type,
+            user_id=user.id,
+            data={
+                'id': user.id,
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'is_active': user.is_active,
+                'version': user.version
+            }
+        ))
 
     def create_user(self, user_dto: CreateUserDTO) -> User:
         """Crea un nuevo usuario"""
@@ -37,7 +62,9 @@ class UserUseCases:
             last_name=user_dto.last_name
         )
         
-        return self.user_repository.save(user)
+        user = self.user_repository.save(user)
+        self._publish(USER_CREATED, user)
+        return user
 
     def get_user(self, user_id: int) -> Optional[User]:
         """Obtiene un usuario por su ID"""
@@ -50,25 +77,41 @@ class UserUseCases:
         """Obtiene todos los usuarios"""
         return self.user_repository.get_all()
 
-    def update_user(self, user_id: int, user_dto: UpdateUserDTO) -> User:
-        """Actualiza un usuario existente"""
+    def list_users(self, after_id: Optional[int], limit: int) -> List[User]:
+        """Obtiene una página de usuarios ordenada por ID"""
+        return self.user_repository.get_page(after_id, limit)
+
+    def get_user_changes(self, cursor: ChangeCursor, limit: int, until: datetime) -> UserChanges:
+        """Obtiene los usuarios modificados o eliminados desde el cursor"""
+        return self.user_repository.get_changes(cursor, limit, until)
+
+    def update_user(self, user_id: int, user_dto: UpdateUserDTO, expected_version: Optional[int] = None) -> User:
+        """Actualiza un usuario existente, opcionalmente solo si sigue en ``expected_version``"""
         user = self.user_repository.get_by_id(user_id)
         if not user:
             raise ValueError(f"No existe un usuario con el ID {user_id}")
+        if expected_version is not None and user.version != expected_version:
+            raise ConcurrencyConflictError(f"El usuario {user_id} está en la versión {user.version}")
 
         user.update_profile(
             first_name=user_dto.first_name,
             last_name=user_dto.last_name
         )
         
-        return self.user_repository.update(user)
+        user = self.user_repository.update(user)
+        self._publish(USER_UPDATED, user)
+        return user
 
     def delete_user(self, user_id: int) -> bool:
         """Elimina un usuario"""
-        if not self.user_repository.get_by_id(user_id):
+        user = self.user_repository.get_by_id(user_id)
+        if not user:
             raise ValueError(f"No existe un usuario con el ID {user_id}")
         
-        return self.user_repository.delete(user_id)
+        deleted = self.user_repository.delete(user_id)
+        if deleted:
+            self._publish(USER_DELETED, user)
+        return deleted
 
     def change_password(self, user_id: int, new_password: str) -> User:
         """Cambia la contraseña de un usuario"""
@@ -77,7 +120,9 @@ class UserUseCases:
             raise ValueError(f"No existe un usuario con el ID {user_id}")
 
         user.update_password(new_password)  # En una implementación real, aquí se haría el hash del password
-        return self.user_repository.update(user)
+        user = self.user_repository.update(user)
+        self._publish(USER_UPDATED, user)
+        return user
 
     def toggle_user_status(self, user_id: int, activate: bool) -> User:
         """Activa o desactiva un usuario"""
@@ -90,4 +135,6 @@ class UserUseCases:
         else:
             user.deactivate()
 
-        return self.user_repository.update(user)
\ No newline at end of file
+        user = self.user_repository.update(user)
+        self._publish(USER_ACTIVATED if activate else USER_DEACTIVATED, user)
+        return user
\ No newline at end of file
@@ -2,6 +2,14 @@ import os
 from datetime import timedelta
 
 
+def _shard_database_uris():
+    """Collect DATABASE_URL_SHARD_0..n until the first missing index"""
+    uris = []
+    while os.getenv(f'DATABASE_URL_SHARD_{len(uris)}'):
+        uris.append(os.getenv(f'DATABASE_URL_SHARD_{len(uris)}'))
+    return uris
+
+
 class Config:
     """Base application configuration
     
@@ -21,17 +29,177 @@ class Config:
     )
     # Disable SQLAlchemy event system for better performance
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Give up after this many seconds waiting for a pooled connection (answered with 503).
+    # create_app passes it as pool_timeout only to engines that use a QueuePool
+    # (not to in-memory SQLite, whose StaticPool rejects the argument).
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '5'))
+
+    # User repository backend: 'sqlalchemy' (default), 'memory' for a
+    # zero-I/O store used in tests, benchmarks and edge nodes, or 'sharded'
+    USER_REPOSITORY = os.getenv('USER_REPOSITORY', 'sqlalchemy')
+    # Optional JSON file the in-memory repository loads on start and writes on exit
+    USER_REPOSITORY_SNAPSHOT_PATH = os.getenv('USER_REPOSITORY_SNAPSHOT_PATH')
+    # Shards used when USER_REPOSITORY = 'sharded', one engine per DATABASE_URL_SHARD_n
+    SHARD_DATABASE_URIS = _shard_database_uris()
+    # Database holding the global email -> shard directory and the tombstones;
+    # defaults to SQLALCHEMY_DATABASE_URI
+    SHARD_DIRECTORY_URL = os.getenv('SHARD_DIRECTORY_URL')
+
+    # Group commit: signups from concurrent requests are written together in one
+    # transaction (one WAL flush) instead of one commit each. Only applies to the
+    # 'sqlalchemy' repository on PostgreSQL or SQLite.
+    GROUP_COMMIT_ENABLED = os.getenv('GROUP_COMMIT_ENABLED', 'false').lower() == 'true'
+    # A batch is written when it reaches this many rows...
+    GROUP_COMMIT_MAX_BATCH_SIZE = int(os.getenv('GROUP_COMMIT_MAX_BATCH_SIZE', '64'))
+    # ...or this many milliseconds after its first row arrived. Higher values
+    # raise throughput under bursts at the cost of signup latency.
+    GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv('GROUP_COMMIT_MAX_DELAY_MS', '5'))
+    # How long a request waits for its batch before giving up
+    GROUP_COMMIT_TIMEOUT_SECONDS = 5
     
     # JWT Authentication settings
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key')
-    # Tokens expire after 1 hour
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    # Access tokens are short-lived; clients renew them with POST /auth/refresh
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    # Rotating refresh tokens (refresh_tokens table, stored as HMACs). Each use
+    # issues a new one; replaying a used token revokes its whole family. Opt-in:
+    # login then writes a row per session, so the table must exist.
+    REFRESH_TOKENS_ENABLED = os.getenv('REFRESH_TOKENS_ENABLED', 'false').lower() == 'true'
+    # A token presented again this soon after its rotation is a client retry (lost
+    # response): its unused successor is revoked and a new one issued. Responses
+    # carrying tokens are never stored by Idempotency-Key.
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS = 10
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     # Use Bearer token authentication scheme
     JWT_HEADER_TYPE = 'Bearer'
     # Only accept tokens in request headers
     JWT_TOKEN_LOCATION = ['headers']
     JWT_HEADER_NAME = 'Authorization'
+    # Embed the public profile (email, names, is_active, version) in access tokens
+    # so GET /users/me is served from the verified claims without a DB query.
+    # Claims are trusted until an event reports a newer profile version; across
+    # workers that requires EVENT_BRIDGE=postgres. Off by default: with claims on,
+    # login reads the full user instead of the covering-index credentials lookup.
+    JWT_PROFILE_CLAIMS = os.getenv('JWT_PROFILE_CLAIMS', 'false').lower() == 'true'
+    # Users whose latest profile version is tracked per process (LRU)
+    PROFILE_VERSION_CACHE_SIZE = 10000
+
+    # Token revocation (token_blocklist table). Each worker keeps a Bloom filter
+    # of revoked jtis/users, refreshed incrementally every
+    # TOKEN_BLOCKLIST_REFRESH_SECONDS, so tokens that were never revoked are
+    # accepted without a query. Revocations from other workers take effect
+    # within one refresh interval. Opt-in: every authenticated request needs the
+    # token_blocklist table once enabled.
+    TOKEN_BLOCKLIST_ENABLED = os.getenv('TOKEN_BLOCKLIST_ENABLED', 'false').lower() == 'true'
+    TOKEN_BLOCKLIST_REFRESH_SECONDS = float(os.getenv('TOKEN_BLOCKLIST_REFRESH_SECONDS', '5'))
+    TOKEN_BLOCKLIST_BLOOM_CAPACITY = 100000
+    TOKEN_BLOCKLIST_BLOOM_ERROR_RATE = 0.001
+    # Verdicts cached for tokens that hit the filter (revoked or false positives)
+    TOKEN_BLOCKLIST_CACHE_SIZE = 10000
+    # Opt-in LRU of verified bearer tokens -> decoded claims (keyed by SHA-256),
+    # skipping the signature check for tokens reused across many requests.
+    # Revocation is still checked on every request. 0 disables the cache.
+    JWT_VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv('JWT_VERIFIED_TOKEN_CACHE_SIZE', '0'))
+
+    # Change feed (GET /users/changes) settings
+    CHANGE_FEED_PAGE_SIZE = 500
+    CHANGE_FEED_MAX_PAGE_SIZE = 5000
+    # Changes newer than this are held back one poll so transactions still
+    # committing with an earlier updated_at are not skipped by the cursor
+    CHANGE_FEED_SETTLE_SECONDS = 1
+
+    # User event stream (GET /users/stream) settings
+    # Events buffered per subscriber before a slow consumer is disconnected
+    EVENT_SUBSCRIBER_QUEUE_SIZE = 100
+    # Set to 'postgres' to fan out events across workers with LISTEN/NOTIFY
+    EVENT_BRIDGE = os.getenv('EVENT_BRIDGE')
+    # Start the bridge's listener when the app is created. gunicorn.conf.py turns it
+    # off: with preload_app the master must not hold a LISTEN thread or connection,
+    # and each worker starts its own in post_fork.
+    EVENT_BRIDGE_AUTOSTART = os.getenv('EVENT_BRIDGE_AUTOSTART', 'true').lower() == 'true'
+    EVENT_CHANNEL = 'user_events'
+    # Idle streams receive a comment line this often to keep proxies from closing them
+    SSE_HEARTBEAT_SECONDS = 15
+
+    # Idempotency-Key support for POST /users: 'memory' (per-process LRU),
+    # 'database' (idempotency_keys table, shared by all workers) or 'none'.
+    # /auth/login and /auth/refresh are deliberately excluded: storing their
+    # responses would keep live tokens in plaintext for the whole TTL. Login is
+    # safe to retry as is, and refresh retries are covered by
+    # REFRESH_TOKEN_REUSE_GRACE_SECONDS.
+    IDEMPOTENCY_STORE = os.getenv('IDEMPOTENCY_STORE', 'memory')
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_TTL_SECONDS', '86400'))
+    IDEMPOTENCY_MAX_ENTRIES = 10000
+    # How long a duplicate waits for the in-flight original before answering 409
+    IDEMPOTENCY_WAIT_SECONDS = 10
+
+    # Admission control: concurrent requests admitted per route class before
+    # answering 503 + Retry-After. Limits adapt (AIMD) between ADMISSION_MIN_LIMIT
+    # and ADMISSION_MAX_LIMITS depending on whether requests finish within their
+    # class's ADMISSION_LATENCY_TARGETS_MS (or half their ROUTE_DEADLINES_MS budget,
+    # if longer); at most one decrease per target window.
+    ADMISSION_CONTROL_ENABLED = os.getenv('ADMISSION_CONTROL_ENABLED', 'true').lower() == 'true'
+    ADMISSION_LIMITS = {'read': 64, 'write': 16, 'auth': 16}
+    ADMISSION_MAX_LIMITS = {'read': 256, 'write': 64, 'auth': 64}
+    ADMISSION_MIN_LIMIT = 1
+    ADMISSION_LATENCY_TARGET_MS = 500
+    ADMISSION_LATENCY_TARGETS_MS = {'read': 500, 'write': 1000, 'auth': 500}
+    # Shed load once this fraction of the DB pool (pool_size + max_overflow) is checked out
+    ADMISSION_POOL_SATURATION = 1.0
+    ADMISSION_RETRY_AFTER_SECONDS = 1
+
+    # Request deadlines: time budget per endpoint. The remaining budget becomes the
+    # statement_timeout of every transaction, and clients may shorten it with an
+    # X-Request-Deadline header (Unix time in milliseconds). Expired requests get 504.
+    REQUEST_DEADLINE_MS = 5000
+    ROUTE_DEADLINES_MS = {
+        'api.login': 2000,
+        'api.get_users': 15000,
+        'api.get_user_changes': 10000
+    }
+
+    # Prefork servers (gunicorn.conf.py): pooled connections each worker opens,
+    # together with its caches, before it accepts traffic. Capped at the pool size.
+    WORKER_WARMUP_CONNECTIONS = int(os.getenv('WORKER_WARMUP_CONNECTIONS', '2'))
+
+    # Shared secret for operational tooling (profiling header, admin endpoints).
+    # Leave unset to disable token-triggered access entirely.
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+    # On-demand profiling: when enabled, requests carrying X-Profile: <ADMIN_TOKEN>
+    # (or a random PROFILING_SAMPLE_RATE fraction) are profiled with cProfile and
+    # written as .prof files to PROFILING_DIR, keeping at most PROFILING_MAX_FILES
+    # files / PROFILING_MAX_BYTES bytes.
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+    PROFILING_DIR = os.getenv('PROFILING_DIR', 'profiles')
+    PROFILING_MAX_FILES = 100
+    PROFILING_MAX_BYTES = 100 * 1024 * 1024
+
+    # Largest page GET /users returns when paginating with ?limit=
+    USERS_MAX_PAGE_SIZE = 1000
+    # Lists longer than this are streamed in chunks of this many items
+    # (JSON or MessagePack, negotiated with Accept: application/msgpack)
+    SERIALIZER_CHUNK_SIZE = 500
+    # Largest request body accepted by validated endpoints (POST/PUT users, login);
+    # bigger bodies get 413 before they are read or parsed
+    REQUEST_MAX_BODY_SIZE = 16 * 1024
+
+    # Response compression negotiated via Accept-Encoding: brotli/zstd when the
+    # packages are installed, gzip always. Bodies under COMPRESSION_MIN_SIZE
+    # bytes are sent as-is; streamed lists are compressed chunk by chunk.
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    # Per-encoding levels; kept low because responses are compressed on every request
+    COMPRESSION_LEVELS = {'gzip': 6, 'br': 4, 'zstd': 3}
     
+    # Swagger UI at /docs/ and the spec at /apispec_1.json. When disabled flasgger
+    # is never imported and no docs routes exist. The spec is built on first
+    # request and cached with an ETag; SWAGGER_SPEC_PATH loads one exported with
+    # 'flask docs export' instead of generating it.
+    SWAGGER_ENABLED = os.getenv('SWAGGER_ENABLED', 'true').lower() == 'true'
+    SWAGGER_SPEC_PATH = os.getenv('SWAGGER_SPEC_PATH')
+
     # Swagger/OpenAPI documentation configuration
     SWAGGER = {
         'title': 'Users API',
@@ -88,6 +256,8 @@ class ProductionConfig(Config):
     SECRET_KEY = os.getenv('SECRET_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
+    # API docs are opt-in in production
+    SWAGGER_ENABLED = os.getenv('SWAGGER_ENABLED', 'false').lower() == 'true'
 
 
 # Configuration dictionary for easy environment switching
@@ -15,6 +15,8 @@ class User:
     created_at: datetime = datetime.utcnow()
     updated_at: Optional[datetime] = None
     id: Optional[int] = None
+    # Versión de la fila, usada para el control de concurrencia optimista
+    version: int = 1
 
     def update_password(self, new_password: str) -> None:
         """Actualiza la contraseña del usuario"""
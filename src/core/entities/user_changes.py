@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from src.core.entities.user import User
+
+
+@dataclass(frozen=True)
+class ChangeCursor:
+    """Posición monotónica dentro del flujo de cambios de usuarios"""
+
+    updated_at: Optional[datetime] = None
+    user_id: int = 0
+    tombstone_id: int = 0
+
+
+@dataclass
+class UserChanges:
+    """Página de cambios de usuarios desde un cursor"""
+
+    cursor: ChangeCursor
+    updated: List[User] = field(default_factory=list)
+    deleted_ids: List[int] = field(default_factory=list)
+    has_more: bool = False
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class UserCredentials:
+    """Datos mínimos para autenticar a un usuario"""
+
+    id: int
+    password: str
+    is_active: bool
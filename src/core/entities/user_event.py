@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict
+
+USER_CREATED = 'user.created'
+USER_UPDATED = 'user.updated'
+USER_ACTIVATED = 'user.activated'
+USER_DEACTIVATED = 'user.deactivated'
+USER_DELETED = 'user.deleted'
+
+
+@dataclass(frozen=True)
+class UserEvent:
+    """Evento de dominio emitido tras una mutación de usuario"""
+
+    type: str
+    user_id: int
+    data: Dict[str, Any] = field(default_factory=dict)
+    occurred_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte el evento a un diccionario serializable"""
+        return {
+            'type': self.type,
+            'user_id': self.user_id,
+            'data': self.data,
+            'occurred_at': self.occurred_at.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> 'UserEvent':
+        """Reconstruye un evento a partir de su forma serializada"""
+        return cls(
+            type=payload['type'],
+            user_id=payload['user_id'],
+            data=payload.get('data', {}),
+            occurred_at=datetime.fromisoformat(payload['occurred_at'])
+        )
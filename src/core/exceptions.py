@@ -0,0 +1,3 @@
+class ConcurrencyConflictError(Exception):
+    """El recurso fue modificado por otra operación desde que se leyó"""
+    pass
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+
+from src.core.entities.user_event import UserEvent
+
+
+class EventPublisher(ABC):
+    """Puerto (interfaz) para publicar eventos de usuario"""
+
+    @abstractmethod
+    def publish(self, event: UserEvent) -> None:
+        """Publica un evento para todos los suscriptores"""
+        pass
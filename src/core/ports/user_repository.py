@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 
 from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor, UserChanges
+from src.core.entities.user_credentials import UserCredentials
 
 
 class UserRepository(ABC):
@@ -22,11 +25,21 @@ class UserRepository(ABC):
         """Obtiene un usuario por su email"""
         pass
 
+    @abstractmethod
+    def get_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        """Obtiene solo los datos necesarios para el login"""
+        pass
+
     @abstractmethod
     def get_all(self) -> List[User]:
         """Obtiene todos los usuarios"""
         pass
 
+    @abstractmethod
+    def get_page(self, after_id: Optional[int], limit: int) -> List[User]:
+        """Obtiene hasta ``limit`` usuarios con ID mayor a ``after_id``, ordenados por ID"""
+        pass
+
     @abstractmethod
     def update(self, user: User) -> User:
         """Actualiza un usuario existente"""
@@ -40,4 +53,9 @@ class UserRepository(ABC):
     @abstractmethod
     def exists_by_email(self, email: str) -> bool:
         """Verifica si existe un usuario con el email dado"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_changes(self, cursor: ChangeCursor, limit: int, until: datetime) -> UserChanges:
+        """Obtiene los usuarios creados, actualizados o eliminados desde el cursor"""
+        pass
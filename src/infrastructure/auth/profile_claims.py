@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.core.entities.user import User
+from src.core.entities.user_event import USER_DELETED, UserEvent
+
+PROFILE_VERSION_CLAIM = 'profile_version'
+PROFILE_CLAIMS = ('email', 'first_name', 'last_name', 'is_active', PROFILE_VERSION_CLAIM)
+
+# Versión asignada a los usuarios eliminados: ningún token la alcanza
+DELETED = float('inf')
+
+
+def profile_claims(user: User) -> Dict[str, Any]:
+    """Claims adicionales del access token con el perfil público del usuario"""
+    return {
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'is_active': user.is_active,
+        PROFILE_VERSION_CLAIM: user.version
+    }
+
+
+def profile_from_claims(user_id: int, claims: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Perfil reconstruido desde los claims; None si el token no los incluye"""
+    if any(claim not in claims for claim in PROFILE_CLAIMS):
+        return None
+    return {
+        'id': user_id,
+        'email': claims['email'],
+        'first_name': claims['first_name'],
+        'last_name': claims['last_name'],
+        'is_active': claims['is_active'],
+        'version': claims[PROFILE_VERSION_CLAIM]
+    }
+
+
+class ProfileVersionCache:
+    """Última versión conocida de cada perfil, alimentada por los eventos del broker
+
+    Permite decidir si los claims de un token siguen vigentes sin consultar la
+    base de datos. Solo guarda los usuarios modificados desde que arrancó el
+    proceso, acotados por LRU; los tokens emitidos antes del arranque o de la
+    última expulsión del LRU se consideran desactualizados, porque sobre ellos
+    no se sabe nada. Entre workers la caché solo es exacta con
+    ``EVENT_BRIDGE = 'postgres'``.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._versions: 'OrderedDict[int, float]' = OrderedDict()
+        self._horizon = time.time()
+        self._lock = threading.Lock()
+
+    def init_app(self, app, broker) -> None:
+        """Se suscribe a los eventos del broker"""
+        self.max_entries = app.config.get('PROFILE_VERSION_CACHE_SIZE', self.max_entries)
+        broker.add_listener(self.observe)
+        app.extensions['profile_versions'] = self
+
+    def observe(self, event: UserEvent) -> None:
+        """Registra la versión que deja un evento de usuario"""
+        if event.type == USER_DELETED:
+            version = DELETED
+        elif 'version' in event.data:
+            version = event.data['version']
+        else:
+            return
+        with self._lock:
+            current = self._versions.pop(event.user_id, 0)
+            self._versions[event.user_id] = max(current, version)
+            while len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+                self._horizon = time.time()
+
+    def is_current(self, user_id: int, version: int, issued_at: float) -> bool:
+        """Indica si un perfil de la versión dada, emitido en ``issued_at``, sigue vigente"""
+        with self._lock:
+            known = self._versions.get(user_id)
+            if known is None:
+                return issued_at >= self._horizon
+            self._versions.move_to_end(user_id)
+        return version >= known
+
+
+profile_versions = ProfileVersionCache()
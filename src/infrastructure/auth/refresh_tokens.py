@@ -0,0 +1,179 @@
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.entities.user_event import USER_DEACTIVATED, USER_DELETED, UserEvent
+from src.infrastructure.database.models import RefreshTokenModel, db
+
+logger = logging.getLogger(__name__)
+
+refresh_table = RefreshTokenModel.__table__
+
+
+class InvalidRefreshTokenError(Exception):
+    """El refresh token no existe, venció o fue revocado"""
+    pass
+
+
+class RefreshTokenReuseError(InvalidRefreshTokenError):
+    """Se presentó un refresh token ya rotado: su familia queda revocada"""
+    pass
+
+
+class RefreshTokenStore:
+    """Refresh tokens opacos y rotativos en la tabla ``refresh_tokens``
+
+    Solo se guarda el HMAC-SHA256 de cada token, así una copia de la tabla no
+    sirve para autenticarse. Cada uso entrega un token nuevo de la misma
+    familia y marca el anterior como usado; presentar uno ya usado indica que
+    fue robado, y se revoca la familia completa. Renovar cuesta un HMAC y una
+    actualización por clave primaria, sin verificar credenciales.
+
+    Dentro de ``reuse_grace`` desde su rotación, volver a presentar un token
+    se trata como un reintento del cliente que perdió la respuesta: se revoca
+    el sucesor no usado y se entrega otro, sin revocar la familia.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, secret: str = '',
+                 lifetime: timedelta = timedelta(days=30),
+                 reuse_grace: timedelta = timedelta(seconds=10)):
+        self.engine = engine
+        self.secret = secret.encode('utf-8')
+        self.lifetime = lifetime
+        self.reuse_grace = reuse_grace
+        self._next_purge = 0.0
+
+    def init_app(self, app, broker) -> None:
+        """Configura el almacén desde la aplicación y se suscribe a los eventos del broker"""
+        with app.app_context():
+            self.engine = db.engine
+        self.secret = app.config['JWT_SECRET_KEY'].encode('utf-8')
+        self.lifetime = app.config.get('JWT_REFRESH_TOKEN_EXPIRES', self.lifetime)
+        self.reuse_grace = timedelta(
+            seconds=app.config.get('REFRESH_TOKEN_REUSE_GRACE_SECONDS', self.reuse_grace.total_seconds())
+        )
+        broker.add_listener(self.observe)
+        app.extensions['refresh_tokens'] = self
+
+    def _hash(self, token: str) -> str:
+        return hmac.new(self.secret, token.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def issue(self, user_id: int, family_id: Optional[str] = None) -> str:
+        """Emite un refresh token, en una familia nueva salvo que se indique otra"""
+        self._purge_if_due()
+        token = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        with self.engine.begin() as connection:
+            connection.execute(insert(refresh_table).values(
+                token_hash=self._hash(token),
+                family_id=family_id or secrets.token_hex(16),
+                user_id=user_id,
+                created_at=now,
+                expires_at=now + self.lifetime
+            ))
+        return token
+
+    def rotate(self, token: str) -> Tuple[int, str]:
+        """Consume el token y retorna el usuario y el token que lo reemplaza"""
+        token_hash = self._hash(token)
+        now = datetime.utcnow()
+        with self.engine.begin() as connection:
+            # El UPDATE condicional garantiza que solo un uso concurrente gane
+            consumed = connection.execute(
+                update(refresh_table).where(
+                    refresh_table.c.token_hash == token_hash,
+                    refresh_table.c.used_at.is_(None),
+                    refresh_table.c.revoked_at.is_(None),
+                    refresh_table.c.expires_at > now
+                ).values(used_at=now)
+            ).rowcount
+            row = connection.execute(
+                select(
+                    refresh_table.c.user_id, refresh_table.c.family_id, refresh_table.c.used_at,
+                    refresh_table.c.revoked_at, refresh_table.c.expires_at
+                ).where(refresh_table.c.token_hash == token_hash)
+            ).first()
+            reused = not consumed and row is not None and row.used_at is not None
+            retried = (
+                reused and row.revoked_at is None and row.expires_at > now
+                and now - row.used_at < self.reuse_grace
+            )
+            if retried:
+                # Reintento: el sucesor que el cliente no recibió deja de valer
+                connection.execute(
+                    update(refresh_table).where(
+                        refresh_table.c.family_id == row.family_id,
+                        refresh_table.c.used_at.is_(None),
+                        refresh_table.c.revoked_at.is_(None)
+                    ).values(revoked_at=now)
+                )
+                reused = False
+                consumed = True
+            elif reused:
+                connection.execute(
+                    update(refresh_table).where(
+                        refresh_table.c.family_id == row.family_id,
+                        refresh_table.c.revoked_at.is_(None)
+                    ).values(revoked_at=now)
+                )
+        if reused:
+            logger.warning('Reutilización de refresh token del usuario %s; familia revocada', row.user_id)
+            raise RefreshTokenReuseError()
+        if not consumed:
+            raise InvalidRefreshTokenError()
+        return row.user_id, self.issue(row.user_id, row.family_id)
+
+    def revoke(self, token: str) -> None:
+        """Revoca la familia del token (cierre de sesión)"""
+        family = select(refresh_table.c.family_id).where(
+            refresh_table.c.token_hash == self._hash(token)
+        ).scalar_subquery()
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(refresh_table).where(
+                    refresh_table.c.family_id == family,
+                    refresh_table.c.revoked_at.is_(None)
+                ).values(revoked_at=datetime.utcnow())
+            )
+
+    def revoke_user(self, user_id: int) -> int:
+        """Revoca todos los refresh tokens vigentes del usuario"""
+        with self.engine.begin() as connection:
+            return connection.execute(
+                update(refresh_table).where(
+                    refresh_table.c.user_id == user_id,
+                    refresh_table.c.revoked_at.is_(None)
+                ).values(revoked_at=datetime.utcnow())
+            ).rowcount
+
+    def observe(self, event: UserEvent) -> None:
+        """Revoca los refresh tokens de los usuarios desactivados o eliminados"""
+        if event.type in (USER_DEACTIVATED, USER_DELETED):
+            try:
+                self.revoke_user(event.user_id)
+            except SQLAlchemyError:
+                logger.exception('No se pudieron revocar los refresh tokens del usuario %s', event.user_id)
+
+    def purge_expired(self) -> int:
+        """Elimina los tokens vencidos y retorna cuántos borró"""
+        with self.engine.begin() as connection:
+            return connection.execute(
+                delete(refresh_table).where(refresh_table.c.expires_at <= datetime.utcnow())
+            ).rowcount
+
+    def _purge_if_due(self) -> None:
+        # Limpieza perezosa: como mucho una vez por hora y por proceso
+        if time.monotonic() >= self._next_purge:
+            self._next_purge = time.monotonic() + 3600
+            self.purge_expired()
+
+
+refresh_token_store = RefreshTokenStore()
@@ -0,0 +1,224 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from src.core.entities.user_event import USER_DEACTIVATED, USER_DELETED, UserEvent
+from src.infrastructure.auth.bloom_filter import BloomFilter
+from src.infrastructure.database.models import TokenBlocklistModel, db
+
+logger = logging.getLogger(__name__)
+
+blocklist_table = TokenBlocklistModel.__table__
+
+# jti de las filas que revocan todos los tokens de un usuario emitidos antes de revoked_at
+ALL_TOKENS = '*'
+# Margen de la lectura incremental para no perder filas confirmadas tarde
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+def user_key(user_id: int) -> str:
+    return f'user:{user_id}'
+
+
+def token_lifetime(expires) -> timedelta:
+    """Vida máxima de un token según JWT_*_TOKEN_EXPIRES (False = no vencen)"""
+    if isinstance(expires, timedelta):
+        return expires
+    if expires is False or expires is None:
+        # Tokens sin vencimiento: la revocación debe durar tanto como se use la clave
+        return timedelta(days=365)
+    return timedelta(seconds=expires)
+
+
+class TokenBlocklist:
+    """Lista de revocación de JWT en ``token_blocklist`` con camino rápido en memoria
+
+    Cada proceso mantiene un filtro de Bloom con los jti revocados y los
+    usuarios con revocaciones, que se actualiza de forma incremental cada
+    ``refresh_interval`` segundos. Un token que el filtro descarta, el caso
+    habitual, se acepta sin E/S; solo los positivos (reales o falsos) se
+    confirman en la base de datos, y el veredicto queda en un LRU pequeño.
+    Las revocaciones de otros workers se ven, como mucho, un intervalo tarde.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, retention: timedelta = timedelta(hours=1),
+                 refresh_interval: float = 5, rebuild_interval: float = 3600,
+                 capacity: int = 100000, error_rate: float = 0.001, cache_size: int = 10000):
+        self.engine = engine
+        self.retention = retention
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.cache_size = cache_size
+        self._bloom: Optional[BloomFilter] = None
+        self._cursor: Optional[datetime] = None
+        self._next_refresh = 0.0
+        self._next_rebuild = 0.0
+        self._verdicts: 'OrderedDict[str, bool]' = OrderedDict()
+        # Revocaciones ya incorporadas: la relectura con margen no las trata como nuevas
+        self._seen: Dict[Tuple[int, str], datetime] = {}
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    def init_app(self, app, broker) -> None:
+        """Configura la lista desde la aplicación y se suscribe a los eventos del broker"""
+        with app.app_context():
+            self.engine = db.engine
+        self.retention = token_lifetime(app.config.get('JWT_ACCESS_TOKEN_EXPIRES'))
+        self.refresh_interval = app.config.get('TOKEN_BLOCKLIST_REFRESH_SECONDS', self.refresh_interval)
+        self.capacity = app.config.get('TOKEN_BLOCKLIST_BLOOM_CAPACITY', self.capacity)
+        self.error_rate = app.config.get('TOKEN_BLOCKLIST_BLOOM_ERROR_RATE', self.error_rate)
+        self.cache_size = app.config.get('TOKEN_BLOCKLIST_CACHE_SIZE', self.cache_size)
+        self._bloom = None
+        self._verdicts.clear()
+        self._seen.clear()
+        broker.add_listener(self.observe)
+        app.extensions['token_blocklist'] = self
+
+    def is_revoked(self, jwt_payload: dict) -> bool:
+        """Indica si el token fue revocado, por su jti o por una revocación de su usuario"""
+        self._refresh_if_due()
+        jti = jwt_payload['jti']
+        user_id = int(jwt_payload['sub'])
+        bloom = self._bloom
+        if jti not in bloom and user_key(user_id) not in bloom:
+            return False
+
+        with self._lock:
+            verdict = self._verdicts.get(jti)
+            if verdict is not None:
+                self._verdicts.move_to_end(jti)
+                return verdict
+        issued_at = datetime.utcfromtimestamp(jwt_payload['iat'])
+        with self.engine.connect() as connection:
+            verdict = connection.execute(
+                select(blocklist_table.c.jti).where(
+                    blocklist_table.c.user_id == user_id,
+                    or_(
+                        blocklist_table.c.jti == jti,
+                        and_(blocklist_table.c.jti == ALL_TOKENS, blocklist_table.c.revoked_at > issued_at)
+                    )
+                ).limit(1)
+            ).first() is not None
+        with self._lock:
+            self._verdicts[jti] = verdict
+            while len(self._verdicts) > self.cache_size:
+                self._verdicts.popitem(last=False)
+        return verdict
+
+    def revoke_token(self, jti: str, user_id: int, expires_at: datetime) -> None:
+        """Revoca un token concreto hasta su vencimiento"""
+        self._store(user_id, jti, datetime.utcnow(), expires_at)
+
+    def revoke_user(self, user_id: int, revoked_at: Optional[datetime] = None) -> None:
+        """Revoca todos los tokens del usuario emitidos antes de ``revoked_at``"""
+        revoked_at = revoked_at or datetime.utcnow()
+        self._store(user_id, ALL_TOKENS, revoked_at, revoked_at + self.retention)
+
+    def observe(self, event: UserEvent) -> None:
+        """Revoca los tokens de los usuarios desactivados o eliminados"""
+        if event.type in (USER_DEACTIVATED, USER_DELETED):
+            try:
+                self.revoke_user(event.user_id, event.occurred_at)
+            except SQLAlchemyError:
+                logger.exception('No se pudieron revocar los tokens del usuario %s', event.user_id)
+
+    def _store(self, user_id: int, jti: str, revoked_at: datetime, expires_at: datetime) -> None:
+        values = {'revoked_at': revoked_at, 'expires_at': expires_at}
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(insert(blocklist_table).values(user_id=user_id, jti=jti, **values))
+        except IntegrityError:
+            # Ya revocado (o el mismo evento llegó por otro worker): se conserva lo más reciente
+            with self.engine.begin() as connection:
+                connection.execute(
+                    update(blocklist_table).where(
+                        blocklist_table.c.user_id == user_id,
+                        blocklist_table.c.jti == jti,
+                        blocklist_table.c.revoked_at < revoked_at
+                    ).values(**values)
+                )
+        self._remember(user_id, jti, revoked_at)
+
+    def _remember(self, user_id: int, jti: str, revoked_at: datetime) -> None:
+        key = (user_id, jti)
+        with self._lock:
+            known = self._seen.get(key)
+            if known is not None and known >= revoked_at:
+                return
+            self._seen[key] = revoked_at
+            if self._bloom is not None:
+                self._bloom.add(user_key(user_id) if jti == ALL_TOKENS else jti)
+            # Un veredicto negativo en caché podría haber dejado de serlo
+            if jti == ALL_TOKENS:
+                # Los veredictos se guardan por jti: no se sabe cuáles son de este usuario
+                self._verdicts.clear()
+            else:
+                self._verdicts.pop(jti, None)
+
+    def warm_up(self) -> None:
+        """Carga el filtro antes de la primera petición, p. ej. al arrancar un worker"""
+        self._refresh_if_due()
+
+    def _refresh_if_due(self) -> None:
+        if self._bloom is not None and time.monotonic() < self._next_refresh:
+            return
+        # Un solo hilo actualiza; el resto sigue con el filtro vigente
+        if not self._refreshing.acquire(blocking=self._bloom is None):
+            return
+        try:
+            if self._bloom is not None and time.monotonic() < self._next_refresh:
+                return
+            try:
+                self.refresh()
+            except SQLAlchemyError:
+                if self._bloom is None:
+                    raise
+                logger.warning('No se pudo actualizar la lista de revocación; se usa la anterior', exc_info=True)
+            self._next_refresh = time.monotonic() + self.refresh_interval
+        finally:
+            self._refreshing.release()
+
+    def refresh(self) -> None:
+        """Incorpora las revocaciones nuevas o reconstruye el filtro si corresponde"""
+        if self._bloom is None or self._bloom.saturated or time.monotonic() >= self._next_rebuild:
+            self.rebuild()
+            return
+        since = self._cursor - REFRESH_OVERLAP
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(blocklist_table.c.user_id, blocklist_table.c.jti, blocklist_table.c.revoked_at)
+                .where(blocklist_table.c.revoked_at >= since)
+            ).all()
+        for row in rows:
+            self._remember(row.user_id, row.jti, row.revoked_at)
+            self._cursor = max(self._cursor, row.revoked_at)
+
+    def rebuild(self) -> None:
+        """Purga las revocaciones vencidas y reconstruye el filtro desde la tabla"""
+        now = datetime.utcnow()
+        with self.engine.begin() as connection:
+            connection.execute(delete(blocklist_table).where(blocklist_table.c.expires_at <= now))
+            rows = connection.execute(
+                select(blocklist_table.c.user_id, blocklist_table.c.jti, blocklist_table.c.revoked_at)
+            ).all()
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        for row in rows:
+            bloom.add(user_key(row.user_id) if row.jti == ALL_TOKENS else row.jti)
+        with self._lock:
+            self._bloom = bloom
+            self._cursor = max((row.revoked_at for row in rows), default=now)
+            self._seen = {(row.user_id, row.jti): row.revoked_at for row in rows}
+            self._verdicts.clear()
+        self._next_rebuild = time.monotonic() + self.rebuild_interval
+
+
+token_blocklist = TokenBlocklist()
@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from flask_jwt_extended import JWTManager
+from flask_jwt_extended import utils as jwt_utils
+from flask_jwt_extended.config import config as jwt_config
+
+# Método privado de JWTManager que se sobrescribe (probado con flask-jwt-extended 4.x)
+DECODE_HOOK = '_decode_jwt_from_config'
+
+
+def check_decode_hook() -> None:
+    """Falla al arrancar si flask_jwt_extended ya no decodifica a través del método sobrescrito
+
+    El gancho es privado: una actualización podría renombrarlo o dejar de
+    llamarlo, y la caché quedaría ignorada sin ningún error.
+    """
+    if not callable(getattr(JWTManager, DECODE_HOOK, None)) \
+            or DECODE_HOOK not in jwt_utils.decode_token.__code__.co_names:
+        raise RuntimeError(
+            f'flask_jwt_extended no usa JWTManager.{DECODE_HOOK}: '
+            'desactive JWT_VERIFIED_TOKEN_CACHE_SIZE o ajuste CachingJWTManager a esta versión'
+        )
+
+
+class VerifiedTokenCache:
+    """LRU de tokens ya verificados → claims decodificados
+
+    La clave es el SHA-256 del token, así la caché no guarda credenciales
+    utilizables. Una entrada deja de servirse al llegar el ``exp`` del token.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[bytes, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(encoded_token: str) -> bytes:
+        return hashlib.sha256(encoded_token.encode('utf-8')).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        """Claims del token, o None si no está o ya venció"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at is not None and time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Copia: flask_jwt_extended guarda los claims en g y el llamador podría modificarlos
+        return dict(claims)
+
+    def put(self, key: bytes, claims: dict, leeway: float = 0) -> None:
+        """Guarda los claims de un token recién verificado"""
+        expires_at = claims['exp'] + leeway if 'exp' in claims else None
+        with self._lock:
+            self._entries[key] = (dict(claims), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager que evita repetir la verificación HMAC de tokens ya vistos
+
+    Se activa con ``JWT_VERIFIED_TOKEN_CACHE_SIZE`` > 0. Solo se cachea la
+    decodificación: flask_jwt_extended consulta ``token_in_blocklist_loader``
+    después de decodificar, así un token revocado se rechaza aunque sus
+    claims estén en caché. Sobrescribe un método privado de JWTManager, por
+    eso requirements.txt fija la versión de flask-jwt-extended y el gancho se verifica al arrancar.
+    """
+
+    def __init__(self, app=None, add_context_processor: bool = False):
+        self.token_cache: Optional[VerifiedTokenCache] = None
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor: bool = False) -> None:
+        super().init_app(app, add_context_processor)
+        size = app.config.get('JWT_VERIFIED_TOKEN_CACHE_SIZE', 0)
+        if size > 0:
+            check_decode_hook()
+        self.token_cache = VerifiedTokenCache(size) if size > 0 else None
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        if self.token_cache is None or csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        key = VerifiedTokenCache.key(encoded_token)
+        claims = self.token_cache.get(key)
+        if claims is None:
+            # Tokens inválidos o vencidos lanzan la excepción habitual y no se cachean
+            claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+            self.token_cache.put(key, claims, jwt_config.leeway)
+        return claims
@@ -0,0 +1,93 @@
+import csv
+import io
+from datetime import datetime
+from typing import Dict, Sequence
+
+from sqlalchemy import text
+
+USER_COLUMNS = ('email', 'password', 'first_name', 'last_name', 'is_active', 'created_at', 'updated_at')
+
+
+class BulkUserLoader:
+    """Carga masiva de usuarios usando la vía más rápida de cada dialecto
+
+    En PostgreSQL los lotes se envían con ``COPY ... FROM STDIN`` a una tabla
+    temporal y se fusionan con ``INSERT ... SELECT ... ON CONFLICT (email)``.
+    En el resto de motores (SQLite) se usa ``executemany`` con ``ON CONFLICT``.
+    """
+
+    STAGING_TABLE = 'users_staging'
+
+    def __init__(self, engine, update_existing: bool = False):
+        self.engine = engine
+        self.update_existing = update_existing
+
+    def load(self, rows: Sequence[Dict]) -> int:
+        """Inserta un lote de filas en una sola transacción y retorna las filas afectadas"""
+        if not rows:
+            return 0
+        # updated_at hace visibles las filas cargadas en el flujo de cambios
+        now = datetime.utcnow()
+        rows = [dict(row, updated_at=now) for row in rows]
+        with self.engine.begin() as connection:
+            if connection.dialect.name == 'postgresql':
+                return self._copy_and_merge(connection, rows)
+            return self._execute_many(connection, rows)
+
+    def _conflict_clause(self) -> str:
+        """Construye la cláusula ON CONFLICT según la política de duplicados"""
+        if not self.update_existing:
+            return 'ON CONFLICT (email) DO NOTHING'
+        return (
+            'ON CONFLICT (email) DO UPDATE SET '
+            'password = excluded.password, '
+            'first_name = excluded.first_name, '
+            'last_name = excluded.last_name, '
+            'is_active = excluded.is_active, '
+            'updated_at = excluded.updated_at, '
+            'version = users.version + 1'
+        )
+
+    def _copy_and_merge(self, connection, rows: Sequence[Dict]) -> int:
+        """Envía el lote con COPY a la tabla temporal y lo fusiona con la tabla users"""
+        columns = ', '.join(USER_COLUMNS)
+        connection.execute(text(
+            f'CREATE TEMP TABLE {self.STAGING_TABLE} ('
+            'email VARCHAR(255), password VARCHAR(255), '
+            'first_name VARCHAR(100), last_name VARCHAR(100), '
+            'is_active BOOLEAN, created_at TIMESTAMP, updated_at TIMESTAMP'
+            ') ON COMMIT DROP'
+        ))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row[column] for column in USER_COLUMNS])
+        buffer.seek(0)
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f'COPY {self.STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)',
+                buffer
+            )
+        finally:
+            cursor.close()
+
+        # DISTINCT ON evita que un email repetido dentro del lote rompa el DO UPDATE
+        result = connection.execute(text(
+            f'INSERT INTO users ({columns}) '
+            f'SELECT DISTINCT ON (email) {columns} FROM {self.STAGING_TABLE} '
+            f'ORDER BY email {self._conflict_clause()}'
+        ))
+        return result.rowcount
+
+    def _execute_many(self, connection, rows: Sequence[Dict]) -> int:
+        """Inserta el lote con executemany para motores sin COPY"""
+        columns = ', '.join(USER_COLUMNS)
+        values = ', '.join(f':{column}' for column in USER_COLUMNS)
+        result = connection.execute(
+            text(f'INSERT INTO users ({columns}) VALUES ({values}) {self._conflict_clause()}'),
+            list(rows)
+        )
+        return result.rowcount
@@ -0,0 +1,109 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+# Instante (time.monotonic) en que vence la operación en curso; None = sin límite
+_deadline: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+
+# Instrucciones de la VM de SQLite entre cada verificación del plazo
+SQLITE_PROGRESS_STEPS = 1000
+# SQLSTATE query_canceled: statement_timeout vencido en PostgreSQL
+POSTGRES_QUERY_CANCELED = '57014'
+# statement_timeout vigente en la transacción, guardado en Connection.info
+STATEMENT_TIMEOUT_KEY = 'deadline_statement_timeout_ms'
+# Holgura antes de volver a fijar statement_timeout: evita un SET por sentencia
+STATEMENT_TIMEOUT_SLACK_MS = 50
+
+
+class DeadlineExceeded(Exception):
+    """El plazo de la operación venció antes de completarla"""
+    pass
+
+
+def set_deadline(deadline: Optional[float]):
+    """Fija el plazo del contexto actual y retorna el token para restaurarlo"""
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token) -> None:
+    """Restaura el plazo anterior al ``set_deadline`` correspondiente"""
+    _deadline.reset(token)
+
+
+def remaining_seconds() -> Optional[float]:
+    """Segundos que quedan hasta el plazo actual, o None si no hay plazo"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def is_timeout_error(error: OperationalError) -> bool:
+    """Indica si el error proviene de un statement_timeout o una interrupción por plazo"""
+    original = getattr(error, 'orig', None)
+    if getattr(original, 'pgcode', None) == POSTGRES_QUERY_CANCELED:
+        return True
+    return 'interrupted' in str(original)
+
+
+def _apply_statement_timeout(connection) -> None:
+    remaining = remaining_seconds()
+    if remaining is None:
+        connection.info.pop(STATEMENT_TIMEOUT_KEY, None)
+        return
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    if connection.dialect.name == 'postgresql':
+        timeout_ms = max(1, int(remaining * 1000))
+        # Se guarda antes del SET para que before_cursor_execute no lo repita
+        connection.info[STATEMENT_TIMEOUT_KEY] = timeout_ms
+        # SET LOCAL solo dura hasta el fin de la transacción: no contamina el pool
+        connection.exec_driver_sql(f'SET LOCAL statement_timeout = {timeout_ms}')
+
+
+def _refresh_statement_timeout(connection, cursor, statement, parameters, context, executemany) -> None:
+    # statement_timeout limita cada sentencia, no la transacción: las siguientes
+    # sentencias necesitan un límite menor a medida que se consume el plazo
+    if connection.dialect.name != 'postgresql':
+        return
+    remaining = remaining_seconds()
+    if remaining is None:
+        return
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    timeout_ms = max(1, int(remaining * 1000))
+    applied_ms = connection.info.get(STATEMENT_TIMEOUT_KEY)
+    if applied_ms is not None and applied_ms - timeout_ms <= STATEMENT_TIMEOUT_SLACK_MS:
+        return
+    connection.info[STATEMENT_TIMEOUT_KEY] = timeout_ms
+    # Directo sobre el cursor DBAPI: no dispara de nuevo los eventos del engine
+    cursor.execute(f'SET LOCAL statement_timeout = {timeout_ms}')
+
+
+def _interrupt_if_expired() -> int:
+    remaining = remaining_seconds()
+    return 1 if remaining is not None and remaining <= 0 else 0
+
+
+def _install_progress_handler(dbapi_connection, connection_record) -> None:
+    if hasattr(dbapi_connection, 'set_progress_handler'):
+        dbapi_connection.set_progress_handler(_interrupt_if_expired, SQLITE_PROGRESS_STEPS)
+
+
+def install_deadline_hooks() -> None:
+    """Traduce el plazo del contexto en límites de tiempo para todas las conexiones
+
+    En PostgreSQL cada transacción arranca con ``SET LOCAL statement_timeout``
+    igual al tiempo restante, y se vuelve a fijar antes de cada sentencia si
+    el plazo bajó desde entonces; en SQLite un progress handler interrumpe la
+    consulta cuando vence el plazo. Sin plazo en el contexto (CLI, hilos en
+    segundo plano) no se aplica ningún límite.
+    """
+    if not event.contains(Engine, 'begin', _apply_statement_timeout):
+        event.listen(Engine, 'begin', _apply_statement_timeout)
+    if not event.contains(Engine, 'before_cursor_execute', _refresh_statement_timeout):
+        event.listen(Engine, 'before_cursor_execute', _refresh_statement_timeout)
+    if not event.contains(Engine, 'connect', _install_progress_handler):
+        event.listen(Engine, 'connect', _install_progress_handler)
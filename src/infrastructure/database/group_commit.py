@@ -0,0 +1,116 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from src.infrastructure.database.models import UserModel
+
+users_table = UserModel.__table__
+
+DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+class GroupCommitTimeoutError(Exception):
+    """El lote no se escribió a tiempo; la fila se descartó sin insertarse"""
+    pass
+
+
+class GroupCommitBatcher:
+    """Agrupa las altas concurrentes de usuarios en una sola transacción
+
+    Un hilo en segundo plano recoge inserciones durante ``max_delay`` segundos
+    o hasta ``max_batch_size`` filas y las escribe con un único
+    ``INSERT ... ON CONFLICT (email) DO NOTHING RETURNING``. Así se paga un solo
+    commit (y un solo fsync del WAL) por lote. Cada llamador recibe un Future
+    que se resuelve con su ID o con el error de email duplicado; si lo cancela
+    antes de que su lote empiece, la fila no se escribe.
+    """
+
+    def __init__(self, engine: Engine, max_batch_size: int = 64, max_delay: float = 0.005):
+        if engine.dialect.name not in DIALECT_INSERTS:
+            raise ValueError(f"Group commit no soporta el dialecto {engine.dialect.name}")
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._insert = DIALECT_INSERTS[engine.dialect.name]
+        self._queue: 'queue.Queue[Tuple[Dict, Future]]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def submit(self, values: Dict) -> Future:
+        """Encola una fila para el próximo lote"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((values, future))
+        return future
+
+    def _ensure_started(self) -> None:
+        # Los hilos no sobreviven a un fork: cada proceso arranca el suyo
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.flush(batch)
+
+    def flush(self, batch: List[Tuple[Dict, Future]]) -> None:
+        """Escribe el lote en una transacción y resuelve el Future de cada fila
+
+        Las filas cuyo Future se canceló (el llamador dejó de esperar) se omiten.
+        """
+        pending = [(values, future) for values, future in batch if future.set_running_or_notify_cancel()]
+        if pending:
+            self._write(pending)
+
+    def _write(self, batch: List[Tuple[Dict, Future]]) -> None:
+        statement = (
+            self._insert(users_table)
+            .values([values for values, _ in batch])
+            .on_conflict_do_nothing(index_elements=['email'])
+            .returning(users_table.c.id, users_table.c.email)
+        )
+        try:
+            with self.engine.begin() as connection:
+                ids = {row.email: row.id for row in connection.execute(statement)}
+        except Exception as error:
+            if len(batch) > 1 and not isinstance(error, OperationalError):
+                # Un dato inválido no debe tumbar a todo el lote: cada fila se reintenta sola
+                for item in batch:
+                    self._write([item])
+                return
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        for values, future in batch:
+            # pop: si el email se repite dentro del lote, solo la primera fila lo obtiene
+            user_id = ids.pop(values['email'], None)
+            if user_id is None:
+                future.set_exception(ValueError(f"Ya existe un usuario con el email {values['email']}"))
+            else:
+                future.set_result(user_id)
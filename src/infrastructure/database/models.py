@@ -9,15 +9,109 @@ class UserModel(db.Model):
     """Modelo SQLAlchemy para la tabla de usuarios"""
     
     __tablename__ = 'users'
+    __table_args__ = (
+        # Índice del flujo de cambios: recorrido por keyset (updated_at, id)
+        db.Index('idx_users_updated_at', 'updated_at', 'id'),
+        # Único índice de email: garantiza la unicidad y, como índice cubriente,
+        # permite al login un index-only scan sin leer la tabla (INCLUDE solo en PostgreSQL)
+        db.Index(
+            'idx_users_email_login', 'email', unique=True,
+            postgresql_include=['id', 'password', 'is_active']
+        ),
+        # Índice parcial: solo los usuarios inactivos, que son la minoría
+        db.Index(
+            'idx_users_inactive', 'id',
+            postgresql_where=db.text('NOT is_active')
+        ).ddl_if(dialect='postgresql'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    email = db.Column(db.String(255), unique=True, nullable=False)
+    email = db.Column(db.String(255), nullable=False)
     password = db.Column(db.String(255), nullable=False)
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False)
 
     def __repr__(self):
-        return f"<User {self.email}>"
\ No newline at end of file
+        return f"<User {self.email}>"
+
+
+class UserTombstoneModel(db.Model):
+    """Registro de usuarios eliminados para el flujo de cambios"""
+
+    __tablename__ = 'user_tombstones'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<UserTombstone {self.user_id}>"
+
+
+class UserEmailDirectoryModel(db.Model):
+    """Índice global email → shard para el repositorio particionado"""
+
+    __tablename__ = 'user_email_directory'
+
+    email = db.Column(db.String(255), primary_key=True)
+    shard = db.Column(db.SmallInteger, nullable=False)
+    # NULL mientras el alta en el shard está en curso
+    user_id = db.Column(db.BigInteger)
+
+    def __repr__(self):
+        return f"<UserEmailDirectory {self.email} -> {self.shard}>"
+
+
+class IdempotencyKeyModel(db.Model):
+    """Respuesta guardada por clave de idempotencia (almacén durable)"""
+
+    __tablename__ = 'idempotency_keys'
+
+    key = db.Column(db.String(512), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    # NULL mientras la petición original está en curso
+    status_code = db.Column(db.Integer)
+    body = db.Column(db.LargeBinary)
+    content_type = db.Column(db.String(100))
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key}>"
+
+
+class TokenBlocklistModel(db.Model):
+    """Revocación de JWT: un token concreto (jti) o todos los de un usuario (jti '*')"""
+
+    __tablename__ = 'token_blocklist'
+
+    user_id = db.Column(db.BigInteger, primary_key=True)
+    jti = db.Column(db.String(64), primary_key=True)
+    # Con jti '*' se revocan los tokens del usuario emitidos antes de este instante
+    revoked_at = db.Column(db.DateTime, nullable=False, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<TokenBlocklist {self.user_id}:{self.jti}>"
+
+
+class RefreshTokenModel(db.Model):
+    """Refresh token rotativo; solo se guarda su HMAC"""
+
+    __tablename__ = 'refresh_tokens'
+
+    token_hash = db.Column(db.String(64), primary_key=True)
+    # Tokens encadenados por rotación desde un mismo login
+    family_id = db.Column(db.String(32), nullable=False, index=True)
+    user_id = db.Column(db.BigInteger, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    # Se marca al rotarlo; un segundo uso revela un token robado
+    used_at = db.Column(db.DateTime)
+    revoked_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<RefreshToken {self.family_id} user={self.user_id}>"
@@ -0,0 +1,17 @@
+from sqlalchemy.engine import Engine
+
+
+def pool_saturation(engine: Engine) -> float:
+    """Fracción de conexiones del pool en uso (0.0 a 1.0)
+
+    Solo los pools con límite (QueuePool) pueden saturarse; para el resto, o
+    con ``max_overflow`` ilimitado, retorna 0.
+    """
+    pool = engine.pool
+    if not hasattr(pool, 'checkedout'):
+        return 0.0
+    max_overflow = getattr(pool, '_max_overflow', -1)
+    if max_overflow < 0:
+        return 0.0
+    capacity = pool.size() + max_overflow
+    return min(1.0, pool.checkedout() / capacity) if capacity else 0.0
@@ -0,0 +1,107 @@
+import gc
+import threading
+import tracemalloc
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.core.entities.user import User
+from src.infrastructure.database.models import UserModel
+
+GROUP_BY = ('lineno', 'filename', 'traceback')
+
+# Las asignaciones del propio tracemalloc y del import system no aportan
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+class MemoryDiagnostics:
+    """Diagnóstico de memoria del proceso con tracemalloc
+
+    Cada ``snapshot_diff`` compara con la instantánea anterior, así dos
+    llamadas alrededor de una operación muestran qué quedó retenido por
+    archivo y línea. ``report`` suma los contadores del recolector, las
+    entidades vivas y el tamaño del identity map de cada sesión SQLAlchemy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        """Activa tracemalloc guardando ``frames`` marcos por asignación"""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            self._baseline = None
+
+    def stop(self) -> None:
+        """Desactiva tracemalloc y libera las trazas"""
+        with self._lock:
+            tracemalloc.stop()
+            self._baseline = None
+
+    def snapshot_diff(self, limit: int = 20, group_by: str = 'lineno') -> List[Dict]:
+        """Toma una instantánea y retorna las ``limit`` mayores diferencias con la anterior"""
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by debe ser uno de {', '.join(GROUP_BY)}")
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError('tracemalloc no está activo')
+            snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+            baseline, self._baseline = self._baseline, snapshot
+        if baseline is None:
+            stats = snapshot.statistics(group_by)
+            return [
+                {'location': _location(stat.traceback), 'size': stat.size, 'size_diff': stat.size,
+                 'count': stat.count, 'count_diff': stat.count}
+                for stat in stats[:limit]
+            ]
+        return [
+            {'location': _location(stat.traceback), 'size': stat.size, 'size_diff': stat.size_diff,
+             'count': stat.count, 'count_diff': stat.count_diff}
+            for stat in snapshot.compare_to(baseline, group_by)[:limit]
+        ]
+
+    def report(self) -> Dict:
+        """Contadores del recolector, objetos vivos relevantes y memoria trazada"""
+        sessions = []
+        live = {'User': 0, 'UserModel': 0}
+        # Recorre el heap completo: es costoso y solo debe usarse para diagnóstico
+        for obj in gc.get_objects():
+            if isinstance(obj, Session):
+                sessions.append(len(obj.identity_map))
+            elif isinstance(obj, User):
+                live['User'] += 1
+            elif isinstance(obj, UserModel):
+                live['UserModel'] += 1
+
+        report = {
+            'gc': {
+                'counts': list(gc.get_count()),
+                'thresholds': list(gc.get_threshold()),
+                'collections': [generation['collections'] for generation in gc.get_stats()]
+            },
+            'live_objects': live,
+            'sessions': {'count': len(sessions), 'identity_map_sizes': sorted(sessions, reverse=True)},
+            'tracemalloc': {'tracing': tracemalloc.is_tracing()}
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report['tracemalloc'].update(current=current, peak=peak)
+        return report
+
+
+def _location(traceback: tracemalloc.Traceback) -> str:
+    return ' <- '.join(f'{frame.filename}:{frame.lineno}' for frame in traceback)
+
+
+memory_diagnostics = MemoryDiagnostics()
@@ -0,0 +1,131 @@
+import itertools
+import queue
+import threading
+from typing import Callable, List, Optional, Set, Tuple
+
+from src.core.entities.user_event import UserEvent
+from src.core.ports.event_publisher import EventPublisher
+
+
+class Subscription:
+    """Suscripción con cola acotada a los eventos del broker"""
+
+    def __init__(self, broker: 'InProcessEventBroker', max_size: int):
+        self._broker = broker
+        self.queue: 'queue.Queue[Tuple[int, UserEvent]]' = queue.Queue(maxsize=max_size)
+        self.dropped = False
+
+    def get(self, timeout: float) -> Optional[Tuple[int, UserEvent]]:
+        """Espera el siguiente evento; retorna None si vence el tiempo de espera"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        """Cancela la suscripción"""
+        self._broker.unsubscribe(self)
+
+
+class InProcessEventBroker(EventPublisher):
+    """Broker pub/sub en memoria para difundir eventos de usuario
+
+    Cada suscriptor tiene una cola acotada; si un consumidor lento la llena,
+    se le desconecta en lugar de bloquear a quien publica o crecer sin límite.
+    Con ``EVENT_BRIDGE = 'postgres'`` los eventos viajan por LISTEN/NOTIFY para
+    llegar también a los suscriptores de otros workers.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.bridge = None
+        self._subscriptions: Set[Subscription] = set()
+        self._listeners: List[Callable[[UserEvent], None]] = []
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def init_app(self, app) -> None:
+        """Configura el broker a partir de la configuración de la aplicación"""
+        self.queue_size = app.config.get('EVENT_SUBSCRIBER_QUEUE_SIZE', self.queue_size)
+        if app.config.get('EVENT_BRIDGE') == 'postgres' and self.bridge is None:
+            from src.infrastructure.events.postgres_bridge import PostgresNotifyBridge
+
+            self.bridge = PostgresNotifyBridge(
+                app.config['SQLALCHEMY_DATABASE_URI'],
+                app.config.get('EVENT_CHANNEL', 'user_events'),
+                self.dispatch
+            )
+            # En un maestro con preload_app el puente se inicia en cada worker (after_fork)
+            if app.config.get('EVENT_BRIDGE_AUTOSTART', True):
+                self.bridge.start()
+        app.extensions['event_broker'] = self
+
+    def after_fork(self) -> None:
+        """Inicia el puente en un worker recién creado, o lo reinicia si el padre ya lo había iniciado"""
+        if self.bridge is None:
+            return
+        if not self.bridge.started:
+            # El maestro no lo inició: no hay hilo ni conexiones heredadas
+            self.bridge.start()
+            return
+        from src.infrastructure.events.postgres_bridge import PostgresNotifyBridge
+
+        # Las conexiones del puente heredado pertenecen al padre: se abandonan sin cerrarlas
+        inherited = self.bridge
+        self.bridge = PostgresNotifyBridge(
+            inherited.dsn, inherited.channel, inherited.on_event, inherited.poll_timeout
+        )
+        self.bridge.start()
+
+    def subscribe(self) -> Subscription:
+        """Registra un nuevo suscriptor"""
+        subscription = Subscription(self, self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Elimina un suscriptor"""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def add_listener(self, listener: Callable[[UserEvent], None]) -> None:
+        """Registra un callback que recibe cada evento de forma síncrona al despacharlo
+
+        Pensado para invalidar cachés locales: debe ser rápido y no bloquear.
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[UserEvent], None]) -> None:
+        """Elimina un callback registrado con ``add_listener``"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, event: UserEvent) -> None:
+        if self.bridge is not None:
+            # El puente entrega el evento a todos los workers, incluido este
+            self.bridge.publish(event)
+        else:
+            self.dispatch(event)
+
+    def dispatch(self, event: UserEvent) -> None:
+        """Entrega el evento a los suscriptores locales sin bloquear"""
+        sequence = next(self._sequence)
+        for listener in list(self._listeners):
+            listener(event)
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait((sequence, event))
+            except queue.Full:
+                subscription.dropped = True
+                self.unsubscribe(subscription)
+
+
+event_broker = InProcessEventBroker()
@@ -0,0 +1,90 @@
+import json
+import logging
+import select
+import threading
+import time
+from typing import Callable
+
+import psycopg2
+from sqlalchemy.engine import make_url
+
+from src.core.entities.user_event import UserEvent
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresNotifyBridge:
+    """Difunde eventos entre workers usando LISTEN/NOTIFY de PostgreSQL"""
+
+    def __init__(self, database_uri: str, channel: str, on_event: Callable[[UserEvent], None],
+                 poll_timeout: float = 5.0):
+        url = make_url(database_uri)
+        self.dsn = url.set(drivername='postgresql').render_as_string(hide_password=False)
+        self.channel = channel
+        self.on_event = on_event
+        self.poll_timeout = poll_timeout
+        self._publish_connection = None
+        self._publish_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._listen_forever, name='pg-notify-bridge', daemon=True)
+
+    @property
+    def started(self) -> bool:
+        """Indica si se inició el hilo de escucha (aunque sea en el proceso padre)"""
+        return self._thread.ident is not None
+
+    def start(self) -> None:
+        """Inicia el hilo que escucha notificaciones"""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo de escucha"""
+        self._stopped.set()
+
+    def publish(self, event: UserEvent) -> None:
+        """Envía el evento con pg_notify en una conexión autocommit dedicada"""
+        payload = json.dumps(event.to_dict(), ensure_ascii=False)
+        with self._publish_lock:
+            try:
+                if self._publish_connection is None or self._publish_connection.closed:
+                    self._publish_connection = self._connect()
+                with self._publish_connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_notify(%s, %s)', (self.channel, payload))
+            except psycopg2.Error:
+                logger.exception('No se pudo publicar el evento %s', event.type)
+                self._publish_connection = None
+
+    def _connect(self):
+        connection = psycopg2.connect(self.dsn)
+        connection.autocommit = True
+        return connection
+
+    def _listen_forever(self) -> None:
+        backoff = 1.0
+        while not self._stopped.is_set():
+            try:
+                connection = self._connect()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                backoff = 1.0
+                self._drain(connection)
+            except psycopg2.Error:
+                logger.exception('Conexión LISTEN perdida; reintentando en %.0fs', backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _drain(self, connection) -> None:
+        try:
+            while not self._stopped.is_set():
+                ready, _, _ = select.select([connection], [], [], self.poll_timeout)
+                if not ready:
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    try:
+                        self.on_event(UserEvent.from_dict(json.loads(notify.payload)))
+                    except (ValueError, KeyError):
+                        logger.warning('Notificación inválida descartada: %s', notify.payload)
+        finally:
+            connection.close()
@@ -0,0 +1,97 @@
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from src.infrastructure.database.models import IdempotencyKeyModel
+from src.infrastructure.idempotency.store import (
+    IdempotencyKeyInUseError, IdempotencyKeyMismatchError, IdempotencyStore, StoredResponse
+)
+
+keys_table = IdempotencyKeyModel.__table__
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """Almacén durable en la tabla ``idempotency_keys``, compartido entre workers
+
+    La clave primaria hace de cerrojo: el primer INSERT gana y los duplicados
+    consultan la fila hasta que tenga respuesta. Una reserva en curso vence a
+    los ``lease_timeout`` segundos, así un worker caído no bloquea la clave
+    hasta el TTL. Usa conexiones propias, fuera de la transacción de la
+    petición, para que la reserva sea visible de inmediato.
+    """
+
+    def __init__(self, engine: Engine, ttl: float = 86400, wait_timeout: float = 10,
+                 lease_timeout: float = 60, poll_interval: float = 0.05):
+        self.engine = engine
+        self.ttl = timedelta(seconds=ttl)
+        self.wait_timeout = wait_timeout
+        self.lease_timeout = timedelta(seconds=lease_timeout)
+        self.poll_interval = poll_interval
+        self._next_purge = 0.0
+
+    def claim(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        self._purge_if_due()
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            now = datetime.utcnow()
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(insert(keys_table).values(
+                        key=key,
+                        fingerprint=fingerprint,
+                        expires_at=now + self.lease_timeout
+                    ))
+                return None
+            except IntegrityError:
+                pass
+
+            with self.engine.begin() as connection:
+                row = connection.execute(select(keys_table).where(keys_table.c.key == key)).first()
+                if row is not None and row.expires_at <= now:
+                    connection.execute(
+                        delete(keys_table).where(keys_table.c.key == key, keys_table.c.expires_at <= now)
+                    )
+                    continue
+            if row is None:
+                continue
+            if row.fingerprint != fingerprint:
+                raise IdempotencyKeyMismatchError(key)
+            if row.status_code is not None:
+                return StoredResponse(status_code=row.status_code, body=row.body, content_type=row.content_type)
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInUseError(key)
+            time.sleep(self.poll_interval)
+
+    def complete(self, key: str, response: StoredResponse) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(keys_table).where(keys_table.c.key == key).values(
+                    status_code=response.status_code,
+                    body=response.body,
+                    content_type=response.content_type,
+                    expires_at=datetime.utcnow() + self.ttl
+                )
+            )
+
+    def release(self, key: str) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(
+                delete(keys_table).where(keys_table.c.key == key, keys_table.c.status_code.is_(None))
+            )
+
+    def purge_expired(self) -> int:
+        """Elimina las claves vencidas y retorna cuántas borró"""
+        with self.engine.begin() as connection:
+            return connection.execute(
+                delete(keys_table).where(keys_table.c.expires_at <= datetime.utcnow())
+            ).rowcount
+
+    def _purge_if_due(self) -> None:
+        # Limpieza perezosa: como mucho una vez por minuto y por proceso
+        if time.monotonic() >= self._next_purge:
+            self._next_purge = time.monotonic() + 60
+            self.purge_expired()
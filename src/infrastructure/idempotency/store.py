@@ -0,0 +1,136 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """Respuesta guardada para repetirla ante reintentos con la misma clave"""
+
+    status_code: int
+    body: bytes
+    content_type: str
+
+
+class IdempotencyKeyInUseError(Exception):
+    """Otra petición con la misma clave sigue en curso"""
+    pass
+
+
+class IdempotencyKeyMismatchError(Exception):
+    """La clave ya se usó con un cuerpo de petición distinto"""
+    pass
+
+
+class IdempotencyStore(ABC):
+    """Almacén de respuestas por clave de idempotencia
+
+    ``claim`` reserva la clave para quien la usa por primera vez (retorna
+    None y el llamador ejecuta la petición); los duplicados concurrentes
+    esperan hasta ``wait_timeout`` el resultado en curso y reciben la
+    respuesta guardada. Si la petición original falla, ``release`` libera la
+    clave para que un reintento la vuelva a ejecutar.
+    """
+
+    @abstractmethod
+    def claim(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """Reserva la clave o retorna la respuesta ya guardada"""
+        pass
+
+    @abstractmethod
+    def complete(self, key: str, response: StoredResponse) -> None:
+        """Guarda la respuesta de una clave reservada y despierta a quienes esperan"""
+        pass
+
+    @abstractmethod
+    def release(self, key: str) -> None:
+        """Libera una clave reservada sin guardar respuesta"""
+        pass
+
+
+@dataclass
+class _InFlight:
+    fingerprint: str
+    done: threading.Event = field(default_factory=threading.Event)
+    response: Optional[StoredResponse] = None
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Almacén en memoria del proceso: LRU acotado con expiración por TTL"""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 86400, wait_timeout: float = 10):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, _InFlight] = {}
+        # clave -> (fingerprint, respuesta, vencimiento), en orden de uso
+        self._completed: 'OrderedDict[str, Tuple[str, StoredResponse, float]]' = OrderedDict()
+
+    def claim(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        while True:
+            with self._lock:
+                completed = self._completed.get(key)
+                if completed is not None:
+                    if completed[2] > time.monotonic():
+                        self._completed.move_to_end(key)
+                        if completed[0] != fingerprint:
+                            raise IdempotencyKeyMismatchError(key)
+                        return completed[1]
+                    del self._completed[key]
+
+                entry = self._in_flight.get(key)
+                if entry is None:
+                    self._in_flight[key] = _InFlight(fingerprint)
+                    return None
+
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyMismatchError(key)
+            if not entry.done.wait(self.wait_timeout):
+                raise IdempotencyKeyInUseError(key)
+            if entry.response is not None:
+                return entry.response
+            # La petición original se liberó sin respuesta: se intenta reservar de nuevo
+
+    def complete(self, key: str, response: StoredResponse) -> None:
+        with self._lock:
+            entry = self._in_flight.pop(key, None)
+            if entry is None:
+                return
+            entry.response = response
+            self._completed[key] = (entry.fingerprint, response, time.monotonic() + self.ttl)
+            self._completed.move_to_end(key)
+            while len(self._completed) > self.max_entries:
+                self._completed.popitem(last=False)
+        entry.done.set()
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            entry = self._in_flight.pop(key, None)
+        if entry is not None:
+            entry.done.set()
+
+
+def build_idempotency_store(app) -> Optional[IdempotencyStore]:
+    """Construye el almacén indicado en ``IDEMPOTENCY_STORE`` ('memory', 'database' o 'none')"""
+    kind = app.config.get('IDEMPOTENCY_STORE', 'memory')
+    ttl = app.config.get('IDEMPOTENCY_TTL_SECONDS', 86400)
+    wait_timeout = app.config.get('IDEMPOTENCY_WAIT_SECONDS', 10)
+    if kind == 'none':
+        return None
+    if kind == 'memory':
+        return InMemoryIdempotencyStore(
+            max_entries=app.config.get('IDEMPOTENCY_MAX_ENTRIES', 10000),
+            ttl=ttl,
+            wait_timeout=wait_timeout
+        )
+    if kind == 'database':
+        from src.infrastructure.database.models import db
+        from src.infrastructure.idempotency.database_store import DatabaseIdempotencyStore
+
+        with app.app_context():
+            return DatabaseIdempotencyStore(db.engine, ttl=ttl, wait_timeout=wait_timeout)
+    raise ValueError(f"Almacén de idempotencia desconocido: {kind}")
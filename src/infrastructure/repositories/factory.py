@@ -0,0 +1,80 @@
+import atexit
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import create_engine
+
+from src.application.unit_of_work import AutocommitUnitOfWork, UnitOfWork
+from src.core.ports.user_repository import UserRepository
+from src.infrastructure.events.broker import event_broker
+from src.infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from src.infrastructure.repositories.sharded_user_repository import ShardedUserRepository
+from src.infrastructure.repositories.sqlalchemy_unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+_default_repository = SQLAlchemyUserRepository()
+
+
+def build_user_repository(config, group_commit=None) -> UserRepository:
+    """Construye el repositorio de usuarios indicado en ``USER_REPOSITORY``"""
+    kind = config.get('USER_REPOSITORY', 'sqlalchemy')
+    if kind == 'sqlalchemy':
+        return SQLAlchemyUserRepository(
+            group_commit=group_commit,
+            group_commit_timeout=config.get('GROUP_COMMIT_TIMEOUT_SECONDS', 5)
+        )
+    if kind == 'memory':
+        snapshot_path = config.get('USER_REPOSITORY_SNAPSHOT_PATH')
+        repository = InMemoryUserRepository(snapshot_path=snapshot_path)
+        if snapshot_path:
+            atexit.register(repository.snapshot)
+        return repository
+    if kind == 'sharded':
+        shard_uris = config.get('SHARD_DATABASE_URIS') or []
+        if not shard_uris:
+            raise ValueError("USER_REPOSITORY='sharded' requiere DATABASE_URL_SHARD_0..n")
+        directory_uri = config.get('SHARD_DIRECTORY_URL') or config['SQLALCHEMY_DATABASE_URI']
+        return ShardedUserRepository(
+            [create_engine(uri) for uri in shard_uris],
+            create_engine(directory_uri)
+        )
+    raise ValueError(f"Repositorio de usuarios desconocido: {kind}")
+
+
+def get_user_repository() -> UserRepository:
+    """Retorna el repositorio configurado en la aplicación actual"""
+    if has_app_context():
+        repository = current_app.extensions.get('user_repository')
+        if repository is not None:
+            return repository
+    return _default_repository
+
+
+def build_unit_of_work() -> UnitOfWork:
+    """Crea una unidad de trabajo sobre el repositorio configurado"""
+    repository = get_user_repository()
+    if isinstance(repository, SQLAlchemyUserRepository):
+        return SQLAlchemyUnitOfWork(
+            repository.session,
+            event_publisher=event_broker,
+            group_commit=repository.group_commit,
+            group_commit_timeout=repository.group_commit_timeout
+        )
+    return AutocommitUnitOfWork(repository, event_publisher=event_broker)
+
+
+def get_unit_of_work() -> UnitOfWork:
+    """Retorna la unidad de trabajo de la petición actual, creándola al primer uso"""
+    if 'unit_of_work' not in g:
+        g.unit_of_work = build_unit_of_work()
+    return g.unit_of_work
+
+
+def finish_unit_of_work(commit: bool) -> None:
+    """Confirma o revierte la unidad de trabajo de la petición, si se abrió una"""
+    unit_of_work = g.pop('unit_of_work', None)
+    if unit_of_work is None:
+        return
+    if commit:
+        unit_of_work.commit()
+    else:
+        unit_of_work.rollback()
@@ -0,0 +1,186 @@
+import bisect
+import json
+import os
+import threading
+from dataclasses import asdict, replace
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor, UserChanges
+from src.core.entities.user_credentials import UserCredentials
+from src.core.exceptions import ConcurrencyConflictError
+from src.core.ports.user_repository import UserRepository
+
+
+class InMemoryUserRepository(UserRepository):
+    """Implementación en memoria del repositorio de usuarios
+
+    Mantiene índices hash por ID y por email, una lista ordenada de IDs para
+    la paginación y otra de claves (updated_at, id) para el flujo de cambios.
+    Todas las operaciones se serializan con un lock, y si se indica
+    ``snapshot_path`` el contenido puede persistirse y recargarse como JSON.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        self.snapshot_path = snapshot_path
+        self._lock = threading.RLock()
+        self._users: Dict[int, User] = {}
+        self._ids_by_email: Dict[str, int] = {}
+        self._sorted_ids: List[int] = []
+        self._change_keys: List[Tuple[datetime, int]] = []
+        self._tombstones: List[Tuple[int, int, datetime]] = []
+        self._next_id = 1
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load_snapshot()
+
+    def _insert(self, user: User) -> None:
+        """Registra el usuario en todos los índices"""
+        self._users[user.id] = user
+        self._ids_by_email[user.email] = user.id
+        bisect.insort(self._sorted_ids, user.id)
+        bisect.insort(self._change_keys, (user.updated_at, user.id))
+        self._next_id = max(self._next_id, user.id + 1)
+
+    def _remove_change_key(self, user: User) -> None:
+        key = (user.updated_at, user.id)
+        index = bisect.bisect_left(self._change_keys, key)
+        if index < len(self._change_keys) and self._change_keys[index] == key:
+            del self._change_keys[index]
+
+    def save(self, user: User) -> User:
+        with self._lock:
+            if user.email in self._ids_by_email:
+                raise ValueError(f"Ya existe un usuario con el email {user.email}")
+            if user.id is not None and user.id in self._users:
+                raise ValueError(f"Ya existe un usuario con el ID {user.id}")
+            stored = replace(user, id=user.id or self._next_id, updated_at=datetime.utcnow(), version=1)
+            self._insert(stored)
+            return replace(stored)
+
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        with self._lock:
+            user = self._users.get(user_id)
+            return replace(user) if user else None
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        with self._lock:
+            user_id = self._ids_by_email.get(email)
+            return replace(self._users[user_id]) if user_id is not None else None
+
+    def get_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        with self._lock:
+            user_id = self._ids_by_email.get(email)
+            if user_id is None:
+                return None
+            user = self._users[user_id]
+            return UserCredentials(id=user.id, password=user.password, is_active=user.is_active)
+
+    def get_all(self) -> List[User]:
+        with self._lock:
+            return [replace(self._users[user_id]) for user_id in self._sorted_ids]
+
+    def get_page(self, after_id: Optional[int], limit: int) -> List[User]:
+        with self._lock:
+            start = bisect.bisect_right(self._sorted_ids, after_id) if after_id is not None else 0
+            return [replace(self._users[user_id]) for user_id in self._sorted_ids[start:start + limit]]
+
+    def update(self, user: User) -> User:
+        with self._lock:
+            current = self._users.get(user.id)
+            if not current:
+                return None
+            if current.version != user.version:
+                raise ConcurrencyConflictError(f"El usuario {user.id} fue modificado por otra operación")
+            owner = self._ids_by_email.get(user.email)
+            if owner is not None and owner != user.id:
+                raise ValueError(f"Ya existe un usuario con el email {user.email}")
+
+            self._remove_change_key(current)
+            del self._ids_by_email[current.email]
+            stored = replace(user, updated_at=datetime.utcnow(), version=current.version + 1)
+            self._users[user.id] = stored
+            self._ids_by_email[stored.email] = stored.id
+            bisect.insort(self._change_keys, (stored.updated_at, stored.id))
+            return replace(stored)
+
+    def delete(self, user_id: int) -> bool:
+        with self._lock:
+            user = self._users.pop(user_id, None)
+            if not user:
+                return False
+            del self._ids_by_email[user.email]
+            del self._sorted_ids[bisect.bisect_left(self._sorted_ids, user_id)]
+            self._remove_change_key(user)
+            tombstone_id = self._tombstones[-1][0] + 1 if self._tombstones else 1
+            self._tombstones.append((tombstone_id, user_id, datetime.utcnow()))
+            return True
+
+    def exists_by_email(self, email: str) -> bool:
+        with self._lock:
+            return email in self._ids_by_email
+
+    def get_changes(self, cursor: ChangeCursor, limit: int, until: datetime) -> UserChanges:
+        with self._lock:
+            start = 0
+            if cursor.updated_at is not None:
+                start = bisect.bisect_right(self._change_keys, (cursor.updated_at, cursor.user_id))
+            keys = [key for key in self._change_keys[start:start + limit + 1] if key[0] <= until]
+
+            # Los tombstones se agregan en orden de ID, así que basta una búsqueda binaria
+            first = bisect.bisect_right(self._tombstones, (cursor.tombstone_id, float('inf')))
+            tombstones = [
+                tombstone for tombstone in self._tombstones[first:first + limit + 1]
+                if tombstone[2] <= until
+            ]
+
+            has_more = len(keys) > limit or len(tombstones) > limit
+            keys, tombstones = keys[:limit], tombstones[:limit]
+            return UserChanges(
+                cursor=ChangeCursor(
+                    updated_at=keys[-1][0] if keys else cursor.updated_at,
+                    user_id=keys[-1][1] if keys else cursor.user_id,
+                    tombstone_id=tombstones[-1][0] if tombstones else cursor.tombstone_id
+                ),
+                updated=[replace(self._users[user_id]) for _, user_id in keys],
+                deleted_ids=[user_id for _, user_id, _ in tombstones],
+                has_more=has_more
+            )
+
+    def snapshot(self) -> None:
+        """Guarda el contenido del repositorio en ``snapshot_path`` de forma atómica"""
+        with self._lock:
+            payload = {
+                'next_id': self._next_id,
+                'users': [
+                    {**asdict(user),
+                     'created_at': user.created_at.isoformat(),
+                     'updated_at': user.updated_at.isoformat() if user.updated_at else None}
+                    for user in self._users.values()
+                ],
+                'tombstones': [
+                    [tombstone_id, user_id, deleted_at.isoformat()]
+                    for tombstone_id, user_id, deleted_at in self._tombstones
+                ]
+            }
+        tmp_path = f'{self.snapshot_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def load_snapshot(self) -> None:
+        """Carga el contenido guardado previamente en ``snapshot_path``"""
+        with open(self.snapshot_path, encoding='utf-8') as handle:
+            payload = json.load(handle)
+        with self._lock:
+            for data in payload['users']:
+                data['created_at'] = datetime.fromisoformat(data['created_at'])
+                updated_at = data['updated_at']
+                data['updated_at'] = datetime.fromisoformat(updated_at) if updated_at else data['created_at']
+                self._insert(User(**data))
+            # Los IDs de usuarios eliminados no se reutilizan
+            self._next_id = max(self._next_id, payload.get('next_id', 1))
+            self._tombstones = [
+                (tombstone_id, user_id, datetime.fromisoformat(deleted_at))
+                for tombstone_id, user_id, deleted_at in payload['tombstones']
+            ]
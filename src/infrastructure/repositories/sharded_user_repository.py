@@ -0,0 +1,293 @@
+import hashlib
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor, UserChanges
+from src.core.entities.user_credentials import UserCredentials
+from src.core.exceptions import ConcurrencyConflictError
+from src.core.ports.user_repository import UserRepository
+from src.infrastructure.database.models import UserEmailDirectoryModel, UserModel, UserTombstoneModel
+
+T = TypeVar('T')
+
+users_table = UserModel.__table__
+directory_table = UserEmailDirectoryModel.__table__
+tombstones_table = UserTombstoneModel.__table__
+
+# Los 8 bits bajos del ID global identifican el shard (hasta 256 shards).
+# Los IDs globales superan 2^31 a partir de ~8M usuarios por shard: las
+# columnas que los referencian en otras tablas deben ser BIGINT a esa escala.
+SHARD_BITS = 8
+SHARD_SLOTS = 1 << SHARD_BITS
+
+
+def encode_user_id(shard: int, local_id: int) -> int:
+    """Combina el ID local del shard y el número de shard en un ID global"""
+    return (local_id << SHARD_BITS) | shard
+
+
+def decode_user_id(user_id: int) -> tuple:
+    """Separa un ID global en (shard, ID local)"""
+    return user_id & (SHARD_SLOTS - 1), user_id >> SHARD_BITS
+
+
+class ShardedUserRepository(UserRepository):
+    """Repositorio de usuarios particionado por hash entre varias bases de datos
+
+    Cada usuario vive en el shard ``hash(email) % n`` y su ID global codifica
+    el shard, así que las lecturas por ID van directo a un único shard. La base
+    de directorio guarda el índice global email → shard (que además garantiza la
+    unicidad del email) y los tombstones, para que el cursor del flujo de
+    cambios siga siendo monotónico. Los listados consultan todos los shards en
+    paralelo y combinan los resultados ordenados con un merge k-way.
+    """
+
+    def __init__(self, shard_engines: Sequence[Engine], directory_engine: Engine):
+        if not 0 < len(shard_engines) <= SHARD_SLOTS:
+            raise ValueError(f"Se requieren entre 1 y {SHARD_SLOTS} shards")
+        self.shards = list(shard_engines)
+        self.directory = directory_engine
+        self._executor = ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix='shard')
+
+    def create_schema(self) -> None:
+        """Crea las tablas en los shards y en la base de directorio si no existen"""
+        for engine in self.shards:
+            users_table.create(engine, checkfirst=True)
+        directory_table.create(self.directory, checkfirst=True)
+        tombstones_table.create(self.directory, checkfirst=True)
+
+    def shard_for_email(self, email: str) -> int:
+        """Elige el shard de un usuario nuevo con un hash estable del email"""
+        digest = hashlib.blake2b(email.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') % len(self.shards)
+
+    def _to_entity(self, row, shard: int) -> User:
+        return User(
+            id=encode_user_id(shard, row.id),
+            email=row.email,
+            password=row.password,
+            first_name=row.first_name,
+            last_name=row.last_name,
+            is_active=row.is_active,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            version=row.version
+        )
+
+    def _scatter(self, query: Callable[[int, Engine], T]) -> List[T]:
+        """Ejecuta la consulta en todos los shards en paralelo"""
+        futures = [
+            self._executor.submit(query, shard, engine)
+            for shard, engine in enumerate(self.shards)
+        ]
+        return [future.result() for future in futures]
+
+    def _fetch(self, shard: int, statement) -> List[User]:
+        with self.shards[shard].connect() as connection:
+            return [self._to_entity(row, shard) for row in connection.execute(statement)]
+
+    def save(self, user: User) -> User:
+        shard = self.shard_for_email(user.email)
+        # La fila del directorio reserva el email antes de escribir en el shard
+        try:
+            with self.directory.begin() as connection:
+                connection.execute(insert(directory_table).values(email=user.email, shard=shard))
+        except IntegrityError as error:
+            raise ValueError(f"Ya existe un usuario con el email {user.email}") from error
+
+        values = {
+            'email': user.email,
+            'password': user.password,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_active': user.is_active,
+            'created_at': user.created_at,
+            'updated_at': datetime.utcnow()
+        }
+        try:
+            with self.shards[shard].begin() as connection:
+                local_id = connection.execute(insert(users_table).values(**values)).inserted_primary_key[0]
+        except Exception:
+            with self.directory.begin() as connection:
+                connection.execute(delete(directory_table).where(directory_table.c.email == user.email))
+            raise
+
+        user_id = encode_user_id(shard, local_id)
+        with self.directory.begin() as connection:
+            connection.execute(
+                update(directory_table).where(directory_table.c.email == user.email).values(user_id=user_id)
+            )
+        return User(id=user_id, version=1, **values)
+
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        shard, local_id = decode_user_id(user_id)
+        if shard >= len(self.shards):
+            return None
+        users = self._fetch(shard, select(users_table).where(users_table.c.id == local_id))
+        return users[0] if users else None
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        with self.directory.connect() as connection:
+            entry = connection.execute(
+                select(directory_table.c.shard, directory_table.c.user_id)
+                .where(directory_table.c.email == email)
+            ).first()
+        if entry is None:
+            return None
+        if entry.user_id is not None:
+            return self.get_by_id(entry.user_id)
+        users = self._fetch(entry.shard, select(users_table).where(users_table.c.email == email))
+        return users[0] if users else None
+
+    def get_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        with self.directory.connect() as connection:
+            shard = connection.execute(
+                select(directory_table.c.shard).where(directory_table.c.email == email)
+            ).scalar()
+        if shard is None:
+            return None
+        with self.shards[shard].connect() as connection:
+            row = connection.execute(
+                select(users_table.c.id, users_table.c.password, users_table.c.is_active)
+                .where(users_table.c.email == email)
+            ).first()
+        if row is None:
+            return None
+        return UserCredentials(id=encode_user_id(shard, row.id), password=row.password, is_active=row.is_active)
+
+    def get_all(self) -> List[User]:
+        results = self._scatter(
+            lambda shard, _: self._fetch(shard, select(users_table).order_by(users_table.c.id))
+        )
+        return list(heapq.merge(*results, key=lambda user: user.id))
+
+    def get_page(self, after_id: Optional[int], limit: int) -> List[User]:
+        def query(shard: int, _) -> List[User]:
+            statement = select(users_table).order_by(users_table.c.id).limit(limit)
+            if after_id is not None:
+                # Mayor ID local del shard cuyo ID global no supera after_id
+                statement = statement.where(users_table.c.id > (after_id - shard) // SHARD_SLOTS)
+            return self._fetch(shard, statement)
+
+        merged = heapq.merge(*self._scatter(query), key=lambda user: user.id)
+        return [user for _, user in zip(range(limit), merged)]
+
+    def update(self, user: User) -> User:
+        shard, local_id = decode_user_id(user.id)
+        current = self.get_by_id(user.id)
+        if current is None:
+            return None
+        if current.version != user.version:
+            raise ConcurrencyConflictError(f"El usuario {user.id} fue modificado por otra operación")
+
+        email_changed = current.email != user.email
+        if email_changed:
+            try:
+                with self.directory.begin() as connection:
+                    connection.execute(
+                        insert(directory_table).values(email=user.email, shard=shard, user_id=user.id)
+                    )
+            except IntegrityError as error:
+                raise ValueError(f"Ya existe un usuario con el email {user.email}") from error
+
+        updated_at = datetime.utcnow()
+        with self.shards[shard].begin() as connection:
+            updated = connection.execute(
+                update(users_table)
+                .where(users_table.c.id == local_id, users_table.c.version == user.version)
+                .values(
+                    email=user.email,
+                    password=user.password,
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    is_active=user.is_active,
+                    updated_at=updated_at,
+                    version=users_table.c.version + 1
+                )
+            ).rowcount
+
+        if not updated:
+            # Otra operación ganó la carrera entre la lectura y el UPDATE
+            if email_changed:
+                with self.directory.begin() as connection:
+                    connection.execute(delete(directory_table).where(directory_table.c.email == user.email))
+            raise ConcurrencyConflictError(f"El usuario {user.id} fue modificado por otra operación")
+
+        if email_changed:
+            with self.directory.begin() as connection:
+                connection.execute(delete(directory_table).where(directory_table.c.email == current.email))
+        return User(
+            id=user.id,
+            email=user.email,
+            password=user.password,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            is_active=user.is_active,
+            created_at=current.created_at,
+            updated_at=updated_at,
+            version=user.version + 1
+        )
+
+    def delete(self, user_id: int) -> bool:
+        user = self.get_by_id(user_id)
+        if user is None:
+            return False
+        shard, local_id = decode_user_id(user_id)
+        with self.shards[shard].begin() as connection:
+            connection.execute(delete(users_table).where(users_table.c.id == local_id))
+        with self.directory.begin() as connection:
+            connection.execute(delete(directory_table).where(directory_table.c.email == user.email))
+            connection.execute(insert(tombstones_table).values(user_id=user_id, deleted_at=datetime.utcnow()))
+        return True
+
+    def exists_by_email(self, email: str) -> bool:
+        with self.directory.connect() as connection:
+            return connection.execute(
+                select(directory_table.c.email).where(directory_table.c.email == email)
+            ).first() is not None
+
+    def get_changes(self, cursor: ChangeCursor, limit: int, until: datetime) -> UserChanges:
+        def query(shard: int, _) -> List[User]:
+            statement = (
+                select(users_table)
+                .where(users_table.c.updated_at <= until)
+                .order_by(users_table.c.updated_at, users_table.c.id)
+                .limit(limit + 1)
+            )
+            if cursor.updated_at is not None:
+                last_local_id = (cursor.user_id - shard) // SHARD_SLOTS
+                statement = statement.where(
+                    tuple_(users_table.c.updated_at, users_table.c.id) > tuple_(cursor.updated_at, last_local_id)
+                )
+            return self._fetch(shard, statement)
+
+        merged = heapq.merge(*self._scatter(query), key=lambda user: (user.updated_at, user.id))
+        users = [user for _, user in zip(range(limit + 1), merged)]
+
+        with self.directory.connect() as connection:
+            tombstones = connection.execute(
+                select(tombstones_table.c.id, tombstones_table.c.user_id)
+                .where(tombstones_table.c.id > cursor.tombstone_id, tombstones_table.c.deleted_at <= until)
+                .order_by(tombstones_table.c.id)
+                .limit(limit + 1)
+            ).all()
+
+        has_more = len(users) > limit or len(tombstones) > limit
+        users, tombstones = users[:limit], tombstones[:limit]
+        return UserChanges(
+            cursor=ChangeCursor(
+                updated_at=users[-1].updated_at if users else cursor.updated_at,
+                user_id=users[-1].id if users else cursor.user_id,
+                tombstone_id=tombstones[-1].id if tombstones else cursor.tombstone_id
+            ),
+            updated=users,
+            deleted_ids=[tombstone.user_id for tombstone in tombstones],
+            has_more=has_more
+        )
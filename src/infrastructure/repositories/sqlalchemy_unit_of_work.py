@@ -0,0 +1,35 @@
+from typing import Optional
+
+from src.application.unit_of_work import UnitOfWork
+from src.core.ports.event_publisher import EventPublisher
+from src.infrastructure.database.models import db
+from src.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    """Unidad de trabajo sobre una sesión SQLAlchemy
+
+    El repositorio solo hace ``flush`` (para obtener IDs y detectar
+    conflictos), y la unidad confirma una vez con ``session.commit()``. Los
+    puntos de reversión usan ``SAVEPOINT`` mediante ``begin_nested``.
+    """
+
+    def __init__(self, session=None, event_publisher: Optional[EventPublisher] = None,
+                 group_commit=None, group_commit_timeout: float = 5.0):
+        super().__init__(event_publisher)
+        self.session = session or db.session
+        self.users = SQLAlchemyUserRepository(
+            self.session,
+            group_commit=group_commit,
+            group_commit_timeout=group_commit_timeout,
+            autocommit=False
+        )
+
+    def _commit(self) -> None:
+        self.session.commit()
+
+    def _rollback(self) -> None:
+        self.session.rollback()
+
+    def _savepoint(self):
+        return self.session.begin_nested()
@@ -1,16 +1,83 @@
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import replace
+from datetime import datetime
 from typing import List, Optional
 
+from sqlalchemy import bindparam, delete, exists, insert, select, tuple_, update
+
 from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor, UserChanges
+from src.core.entities.user_credentials import UserCredentials
+from src.core.exceptions import ConcurrencyConflictError
 from src.core.ports.user_repository import UserRepository
-from src.infrastructure.database.models import UserModel, db
+from src.infrastructure.database.group_commit import GroupCommitTimeoutError
+from src.infrastructure.database.models import UserModel, UserTombstoneModel, db
+
+# Sentencias construidas una sola vez: su clave de caché queda memorizada, así que
+# cada llamada solo enlaza parámetros y reutiliza el SQL compilado del engine.
+# (lambda_stmt no sirve aquí: con entidades ORM reconstruye la sentencia en cada llamada.)
+INSERT_USER = insert(UserModel).returning(UserModel)
+USER_BY_ID = select(UserModel).where(UserModel.id == bindparam('user_id'))
+USER_BY_EMAIL = select(UserModel).where(UserModel.email == bindparam('email')).limit(1)
+# Solo columnas del índice cubriente idx_users_email_login: index-only scan
+CREDENTIALS_BY_EMAIL = (
+    select(UserModel.id, UserModel.password, UserModel.is_active)
+    .where(UserModel.email == bindparam('email'))
+    .limit(1)
+)
+EMAIL_EXISTS = select(exists().where(UserModel.email == bindparam('email')))
+FIRST_PAGE = select(UserModel).order_by(UserModel.id).limit(bindparam('limit'))
+PAGE_AFTER_ID = (
+    select(UserModel)
+    .where(UserModel.id > bindparam('after_id'))
+    .order_by(UserModel.id)
+    .limit(bindparam('limit'))
+)
+CHANGES = (
+    select(UserModel)
+    .where(UserModel.updated_at <= bindparam('until'))
+    .order_by(UserModel.updated_at, UserModel.id)
+    .limit(bindparam('limit'))
+)
+CHANGES_AFTER_CURSOR = CHANGES.where(
+    tuple_(UserModel.updated_at, UserModel.id)
+    > tuple_(bindparam('updated_at', type_=UserModel.updated_at.type), bindparam('user_id', type_=UserModel.id.type))
+)
+TOMBSTONES_AFTER = (
+    select(UserTombstoneModel)
+    .where(UserTombstoneModel.id > bindparam('tombstone_id'), UserTombstoneModel.deleted_at <= bindparam('until'))
+    .order_by(UserTombstoneModel.id)
+    .limit(bindparam('limit'))
+)
 
 
 class SQLAlchemyUserRepository(UserRepository):
     """Implementación SQLAlchemy del repositorio de usuarios"""
 
-    def __init__(self, session=None):
-        """Inicializa el repositorio con una sesión de base de datos opcional"""
+    def __init__(self, session=None, group_commit=None, group_commit_timeout: float = 5.0,
+                 autocommit: bool = True):
+        """Inicializa el repositorio con una sesión de base de datos opcional
+
+        Con ``group_commit`` (un GroupCommitBatcher) las altas se agrupan con las
+        de otras peticiones concurrentes en lugar de hacer un commit cada una.
+        Con ``autocommit=False`` los métodos solo hacen flush y la confirmación
+        queda a cargo de la unidad de trabajo. Un alta agrupada se confirma en
+        la transacción del lote, no en la de la unidad: por eso solo se agrupa
+        si la unidad aún no escribió nada, y un rollback posterior no la deshace.
+        """
         self.session = session or db.session
+        self.group_commit = group_commit
+        self.group_commit_timeout = group_commit_timeout
+        self.autocommit = autocommit
+        self._wrote = False
+
+    def _flush(self) -> None:
+        """Confirma la operación o, dentro de una unidad de trabajo, solo la envía"""
+        if self.autocommit:
+            self.session.commit()
+        else:
+            self.session.flush()
+            self._wrote = True
 
     def _to_entity(self, model: UserModel) -> User:
         """Convierte un modelo SQLAlchemy a una entidad de dominio"""
@@ -22,59 +89,129 @@ class SQLAlchemyUserRepository(UserRepository):
             last_name=model.last_name,
             is_active=model.is_active,
             created_at=model.created_at,
-            updated_at=model.updated_at
+            updated_at=model.updated_at,
+            version=model.version
         )
 
-    def _to_model(self, entity: User) -> UserModel:
-        """Convierte una entidad de dominio a un modelo SQLAlchemy"""
-        return UserModel(
-            id=entity.id,
-            email=entity.email,
-            password=entity.password,
-            first_name=entity.first_name,
-            last_name=entity.last_name,
-            is_active=entity.is_active,
-            created_at=entity.created_at,
-            updated_at=entity.updated_at
-        )
+    def _insert_values(self, user: User) -> dict:
+        """Columnas de un alta; updated_at marca su posición en el flujo de cambios"""
+        return {
+            'email': user.email,
+            'password': user.password,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_active': user.is_active,
+            'created_at': user.created_at,
+            'updated_at': datetime.utcnow()
+        }
 
     def save(self, user: User) -> User:
-        user_model = self._to_model(user)
-        self.session.add(user_model)
-        self.session.commit()
-        return self._to_entity(user_model)
+        if self.group_commit is not None and (self.autocommit or not self._wrote):
+            return self._save_batched(user)
+        values = self._insert_values(user)
+        if user.id is not None:
+            values['id'] = user.id
+        user_model = self.session.scalars(INSERT_USER, [values]).one()
+        # Se convierte antes del commit, que expira el modelo y obligaría a releerlo
+        saved = self._to_entity(user_model)
+        self._flush()
+        return saved
+
+    def _save_batched(self, user: User) -> User:
+        values = self._insert_values(user)
+        future = self.group_commit.submit(values)
+        try:
+            user_id = future.result(timeout=self.group_commit_timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                # Cancelada antes de que su lote empezara: el batcher la omite
+                raise GroupCommitTimeoutError('El alta no se escribió a tiempo')
+            # Su lote ya se está escribiendo: se espera el resultado para no dejar un alta fantasma
+            user_id = future.result()
+        return User(id=user_id, **values)
 
     def get_by_id(self, user_id: int) -> Optional[User]:
-        user_model = UserModel.query.get(user_id)
+        user_model = self.session.scalars(USER_BY_ID, {'user_id': user_id}).first()
         return self._to_entity(user_model) if user_model else None
 
     def get_by_email(self, email: str) -> Optional[User]:
-        user_model = UserModel.query.filter_by(email=email).first()
+        user_model = self.session.scalars(USER_BY_EMAIL, {'email': email}).first()
         return self._to_entity(user_model) if user_model else None
 
+    def get_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        row = self.session.execute(CREDENTIALS_BY_EMAIL, {'email': email}).first()
+        return UserCredentials(id=row.id, password=row.password, is_active=row.is_active) if row else None
+
     def get_all(self) -> List[User]:
-        return [self._to_entity(user) for user in UserModel.query.all()]
+        return [self._to_entity(user) for user in self.session.scalars(select(UserModel))]
+
+    def get_page(self, after_id: Optional[int], limit: int) -> List[User]:
+        if after_id is None:
+            user_models = self.session.scalars(FIRST_PAGE, {'limit': limit})
+        else:
+            user_models = self.session.scalars(PAGE_AFTER_ID, {'after_id': after_id, 'limit': limit})
+        return [self._to_entity(user) for user in user_models]
 
     def update(self, user: User) -> User:
-        user_model = UserModel.query.get(user.id)
-        if user_model:
-            user_model.email = user.email
-            user_model.password = user.password
-            user_model.first_name = user.first_name
-            user_model.last_name = user.last_name
-            user_model.is_active = user.is_active
-            user_model.updated_at = user.updated_at
-            self.session.commit()
-            return self._to_entity(user_model)
-        return None
+        updated_at = datetime.utcnow()
+        # UPDATE condicional: solo se aplica si nadie modificó la fila desde que
+        # se leyó en la versión ``user.version``. No bloquea filas.
+        result = self.session.execute(
+            update(UserModel)
+            .where(UserModel.id == user.id, UserModel.version == user.version)
+            .values(
+                email=user.email,
+                password=user.password,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                is_active=user.is_active,
+                updated_at=updated_at,
+                version=UserModel.version + 1
+            )
+        )
+        if result.rowcount == 0:
+            if self.session.get(UserModel, user.id) is None:
+                return None
+            raise ConcurrencyConflictError(f"El usuario {user.id} fue modificado por otra operación")
+        self._flush()
+        return replace(user, updated_at=updated_at, version=user.version + 1)
 
     def delete(self, user_id: int) -> bool:
-        user_model = UserModel.query.get(user_id)
-        if user_model:
-            self.session.delete(user_model)
-            self.session.commit()
-            return True
-        return False
+        # DELETE directo, sin cargar antes la fila; los modelos ya cargados en la
+        # sesión se marcan como borrados al evaluar el criterio
+        result = self.session.execute(delete(UserModel).where(UserModel.id == user_id))
+        if result.rowcount == 0:
+            return False
+        self.session.execute(insert(UserTombstoneModel).values(user_id=user_id))
+        self._flush()
+        return True
 
     def exists_by_email(self, email: str) -> bool:
-        return self.session.query(UserModel.query.filter_by(email=email).exists()).scalar()
\ No newline at end of file
+        return self.session.scalar(EMAIL_EXISTS, {'email': email})
+
+    def get_changes(self, cursor: ChangeCursor, limit: int, until: datetime) -> UserChanges:
+        if cursor.updated_at is None:
+            user_models = self.session.scalars(CHANGES, {'until': until, 'limit': limit + 1}).all()
+        else:
+            user_models = self.session.scalars(CHANGES_AFTER_CURSOR, {
+                'until': until, 'updated_at': cursor.updated_at, 'user_id': cursor.user_id, 'limit': limit + 1
+            }).all()
+
+        tombstones = self.session.scalars(TOMBSTONES_AFTER, {
+            'tombstone_id': cursor.tombstone_id, 'until': until, 'limit': limit + 1
+        }).all()
+
+        has_more = len(user_models) > limit or len(tombstones) > limit
+        user_models, tombstones = user_models[:limit], tombstones[:limit]
+
+        next_cursor = ChangeCursor(
+            updated_at=user_models[-1].updated_at if user_models else cursor.updated_at,
+            user_id=user_models[-1].id if user_models else cursor.user_id,
+            tombstone_id=tombstones[-1].id if tombstones else cursor.tombstone_id
+        )
+        return UserChanges(
+            cursor=next_cursor,
+            updated=[self._to_entity(model) for model in user_models],
+            deleted_ids=[tombstone.user_id for tombstone in tombstones],
+            has_more=has_more
+        )
@@ -0,0 +1,99 @@
+from typing import Dict, List
+
+import click
+from flask_migrate.cli import db as db_cli
+from sqlalchemy import text
+
+from src.infrastructure.database.models import db
+
+INDEX_USAGE_QUERY = text("""
+    SELECT s.relname AS table_name,
+           s.indexrelname AS index_name,
+           s.idx_scan,
+           s.idx_tup_read,
+           pg_relation_size(s.indexrelid) AS size_bytes,
+           i.indisunique AS is_unique,
+           i.indisprimary AS is_primary,
+           i.indpred IS NOT NULL AS is_partial,
+           (string_to_array(i.indkey::text, ' '))[1:i.indnkeyatts] AS key_columns,
+           (string_to_array(i.indkey::text, ' '))[i.indnkeyatts + 1:i.indnatts] AS include_columns
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    ORDER BY s.relname, s.indexrelname
+""")
+
+INDEX_DENSITY_QUERY = text('SELECT avg_leaf_density FROM pgstatindex(CAST(:index_name AS regclass))')
+
+# Densidad de hojas esperada para un B-tree recién construido (fillfactor 90)
+BTREE_FILLFACTOR = 90
+
+
+def find_redundant_indexes(indexes: List[Dict]) -> Dict[str, str]:
+    """Detecta índices cuyas columnas clave son prefijo de otro índice de la misma tabla
+
+    Un índice con columnas INCLUDE solo es redundante si el otro también las
+    contiene (como clave o INCLUDE): si no, se perdería su index-only scan.
+    """
+    redundant = {}
+    for index in indexes:
+        if index['is_unique'] or index['is_primary'] or index['is_partial']:
+            continue
+        keys = list(index['key_columns'])
+        included = set(index.get('include_columns') or ())
+        for other in indexes:
+            if other is index or other['table_name'] != index['table_name'] or other['is_partial']:
+                continue
+            covered = set(other['key_columns']) | set(other.get('include_columns') or ())
+            if list(other['key_columns'][:len(keys)]) == keys and included <= covered:
+                redundant[index['index_name']] = other['index_name']
+                break
+    return redundant
+
+
+def _format_size(size_bytes: int) -> str:
+    for unit in ('B', 'kB', 'MB', 'GB'):
+        if size_bytes < 1024 or unit == 'GB':
+            return f'{size_bytes:.0f} {unit}' if unit == 'B' else f'{size_bytes:.1f} {unit}'
+        size_bytes /= 1024
+
+
+@db_cli.command('index-report')
+def index_report():
+    """Muestra el uso, tamaño y bloat de los índices (PostgreSQL)"""
+    if db.engine.dialect.name != 'postgresql':
+        raise click.ClickException('index-report requiere PostgreSQL (pg_stat_user_indexes)')
+
+    with db.engine.connect() as connection:
+        indexes = [dict(row._mapping) for row in connection.execute(INDEX_USAGE_QUERY)]
+        has_pgstattuple = connection.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pgstattuple'")
+        ).first() is not None
+
+        densities = {}
+        if has_pgstattuple:
+            for index in indexes:
+                try:
+                    densities[index['index_name']] = connection.execute(
+                        INDEX_DENSITY_QUERY, {'index_name': index['index_name']}
+                    ).scalar()
+                except Exception:
+                    # pgstatindex solo admite B-tree; el resto queda sin dato
+                    connection.rollback()
+
+    redundant = find_redundant_indexes(indexes)
+    click.echo(f"{'tabla':<24}{'índice':<32}{'scans':>12}{'tuplas':>14}{'tamaño':>12}{'bloat':>8}  notas")
+    for index in indexes:
+        notes = []
+        if index['index_name'] in redundant:
+            notes.append(f"redundante con {redundant[index['index_name']]}")
+        if index['idx_scan'] == 0 and not (index['is_unique'] or index['is_primary']):
+            notes.append('sin uso')
+        density = densities.get(index['index_name'])
+        bloat = f'{max(0.0, BTREE_FILLFACTOR - density):.0f}%' if density is not None else '-'
+        click.echo(
+            f"{index['table_name']:<24}{index['index_name']:<32}{index['idx_scan']:>12}"
+            f"{index['idx_tup_read']:>14}{_format_size(index['size_bytes']):>12}{bloat:>8}  {', '.join(notes)}"
+        )
+
+    if not has_pgstattuple:
+        click.echo('Instale la extensión pgstattuple para estimar el bloat de los índices')
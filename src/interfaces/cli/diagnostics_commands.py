@@ -0,0 +1,61 @@
+import gc
+import json
+
+import click
+from flask.cli import AppGroup
+
+from src.infrastructure.diagnostics.memory import MemoryDiagnostics
+from src.infrastructure.repositories.factory import get_unit_of_work
+
+diagnostics_cli = AppGroup('diagnostics')
+
+
+def _format_size(size: int) -> str:
+    sign = '-' if size < 0 else '+'
+    size = abs(size)
+    for unit in ('B', 'kB', 'MB'):
+        if size < 1024 or unit == 'MB':
+            return f'{sign}{size:.0f} {unit}' if unit == 'B' else f'{sign}{size:.1f} {unit}'
+        size /= 1024
+
+
+@diagnostics_cli.command('memory-users')
+@click.option('--top', default=15, show_default=True, help='Diferencias a mostrar')
+@click.option('--group-by', type=click.Choice(['lineno', 'filename']), default='lineno', show_default=True)
+@click.option('--frames', default=1, show_default=True, help='Marcos guardados por asignación')
+def memory_users(top, group_by, frames):
+    """Mide la memoria de listar y serializar todos los usuarios (como GET /users)"""
+    diagnostics = MemoryDiagnostics()
+    diagnostics.start(frames)
+    try:
+        diagnostics.snapshot_diff(limit=0)
+        unit_of_work = get_unit_of_work()
+        users = unit_of_work.users.get_all()
+        payload = json.dumps([
+            {
+                'id': user.id,
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'is_active': user.is_active
+            }
+            for user in users
+        ], ensure_ascii=False)
+        peak = diagnostics.report()['tracemalloc']['peak']
+        click.echo(f'{len(users)} usuarios, {len(payload.encode("utf-8")):,} bytes de JSON, pico {peak:,} bytes')
+
+        # Lo que sigue asignado tras soltar las referencias es retención
+        del users, payload
+        gc.collect()
+        retained = diagnostics.snapshot_diff(limit=top, group_by=group_by)
+        report = diagnostics.report()
+        unit_of_work.rollback()
+    finally:
+        diagnostics.stop()
+
+    click.echo(f'\nMemoria retenida (top {top} por {group_by}):')
+    for stat in retained:
+        click.echo(f"{_format_size(stat['size_diff']):>12} {stat['count_diff']:>+8}  {stat['location']}")
+    click.echo(f"\nObjetos vivos: {report['live_objects']}")
+    click.echo(f"Identity maps: {report['sessions']['identity_map_sizes']}")
+    click.echo(f"GC: conteos {report['gc']['counts']}, colecciones {report['gc']['collections']}")
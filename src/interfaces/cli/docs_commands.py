@@ -0,0 +1,18 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+docs_cli = AppGroup('docs')
+
+
+@docs_cli.command('export')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+def export_spec(path):
+    """Genera la especificación OpenAPI y la guarda para cargarla con SWAGGER_SPEC_PATH"""
+    docs = current_app.extensions.get('api_docs')
+    if docs is None:
+        raise click.ClickException('La documentación está deshabilitada (SWAGGER_ENABLED=false)')
+    body, etag = docs.document()
+    with open(path, 'wb') as spec_file:
+        spec_file.write(body)
+    click.echo(f'Especificación guardada en {path} ({len(body)} bytes, ETag {etag[:12]})')
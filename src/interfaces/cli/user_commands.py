@@ -0,0 +1,192 @@
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Tuple, Union
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from src.infrastructure.database.bulk_loader import BulkUserLoader
+from src.infrastructure.database.models import db
+from src.infrastructure.database.synthetic_users import generate_users
+from src.infrastructure.repositories.sharded_user_repository import ShardedUserRepository
+from src.interfaces.rest.schemas import CREATE_USER_SCHEMA
+from src.interfaces.rest.validation import USER_FIELD_LIMITS, compile_schema
+
+users_cli = AppGroup('users', help='Comandos de administración de usuarios')
+
+# Mismo esquema compilado que valida POST /users, con los límites de las columnas
+validate_user_record = compile_schema(CREATE_USER_SCHEMA, USER_FIELD_LIMITS)
+IMPORT_FIELDS = tuple(CREATE_USER_SCHEMA['properties'])
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y', 'si', 'sí'}
+FALSE_VALUES = {'0', 'false', 'f', 'no', 'n'}
+
+
+@dataclass(frozen=True)
+class MalformedLine:
+    """Línea NDJSON que no es JSON válido; se rechaza como cualquier fila inválida"""
+    line_number: int
+    error: str
+
+
+def iter_records(path: str, file_format: str) -> Iterator[Union[Dict, MalformedLine]]:
+    """Lee el archivo fila a fila sin cargarlo completo en memoria"""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if file_format == 'csv':
+            yield from csv.DictReader(handle)
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as error:
+                    yield MalformedLine(line_number, error.msg)
+
+
+def parse_record(record: Union[Dict, MalformedLine], now: datetime) -> Dict:
+    """Valida y normaliza una fila del archivo de importación"""
+    if isinstance(record, MalformedLine):
+        raise ValueError(f'JSON inválido en la línea {record.line_number}: {record.error}')
+    row = {}
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        row[field] = value.strip() if isinstance(value, str) else value
+    if isinstance(row['email'], str):
+        row['email'] = row['email'].lower()
+    errors = validate_user_record(row)
+    if errors:
+        field, error = next(iter(errors.items()))
+        raise ValueError(f'el campo {field} {error}')
+
+    is_active = record.get('is_active', True)
+    if isinstance(is_active, str):
+        normalized = is_active.strip().lower()
+        if normalized in TRUE_VALUES or normalized == '':
+            is_active = True
+        elif normalized in FALSE_VALUES:
+            is_active = False
+        else:
+            raise ValueError(f'is_active inválido: {is_active}')
+    row['is_active'] = bool(is_active)
+
+    created_at = record.get('created_at')
+    row['created_at'] = datetime.fromisoformat(created_at) if created_at else now
+    return row
+
+
+def read_checkpoint(path: str) -> Dict:
+    """Lee el checkpoint de una importación previa si existe"""
+    if not os.path.exists(path):
+        return {'records': 0, 'loaded': 0, 'rejected': 0}
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def write_checkpoint(path: str, state: Dict) -> None:
+    """Escribe el checkpoint de forma atómica para que un corte no lo corrompa"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as handle:
+        json.dump(state, handle)
+    os.replace(tmp_path, path)
+
+
+def chunked(records: Iterable[Dict], size: int) -> Iterator[Tuple[Dict, ...]]:
+    """Agrupa un iterable en tuplas de tamaño fijo"""
+    iterator = iter(records)
+    while True:
+        chunk = tuple(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@users_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'ndjson']),
+              help='Formato del archivo; por defecto se deduce de la extensión')
+@click.option('--chunk-size', default=5000, show_default=True, help='Filas por transacción')
+@click.option('--checkpoint', 'checkpoint_path', type=click.Path(dir_okay=False),
+              help='Archivo de checkpoint; por defecto <archivo>.checkpoint.json')
+@click.option('--restart', is_flag=True, help='Ignora el checkpoint y empieza desde el inicio')
+@click.option('--update-existing', is_flag=True,
+              help='Actualiza los usuarios cuyo email ya existe en lugar de omitirlos')
+def import_users(path, file_format, chunk_size, checkpoint_path, restart, update_existing):
+    """Importa usuarios desde un archivo CSV o NDJSON"""
+    if file_format is None:
+        file_format = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+    checkpoint_path = checkpoint_path or f'{path}.checkpoint.json'
+
+    state = {'records': 0, 'loaded': 0, 'rejected': 0}
+    if not restart:
+        state = read_checkpoint(checkpoint_path)
+        if state['records']:
+            click.echo(f"Reanudando desde la fila {state['records']}")
+
+    loader = BulkUserLoader(db.engine, update_existing=update_existing)
+    records = islice(iter_records(path, file_format), state['records'], None)
+    started = time.perf_counter()
+    processed = 0
+
+    for chunk in chunked(records, chunk_size):
+        now = datetime.utcnow()
+        rows = []
+        for offset, record in enumerate(chunk, start=state['records'] + 1):
+            try:
+                rows.append(parse_record(record, now))
+            except (ValueError, TypeError, AttributeError) as error:
+                state['rejected'] += 1
+                click.echo(f'Fila {offset} rechazada: {error}', err=True)
+
+        state['loaded'] += loader.load(rows)
+        state['records'] += len(chunk)
+        processed += len(chunk)
+        write_checkpoint(checkpoint_path, state)
+
+        elapsed = time.perf_counter() - started
+        click.echo(f"{state['records']} filas procesadas ({processed / elapsed:,.0f} filas/s)")
+
+    # La importación terminó: el checkpoint ya no es necesario
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    click.echo(
+        f"Importación completada: {state['loaded']} cargadas, "
+        f"{state['records'] - state['loaded'] - state['rejected']} omitidas, "
+        f"{state['rejected']} rechazadas"
+    )
+
+
+@users_cli.command('seed')
+@click.option('--count', default=1000, show_default=True, help='Cantidad de usuarios a generar')
+@click.option('--seed', default=42, show_default=True, help='Semilla para datos reproducibles')
+@click.option('--start-index', default=0, show_default=True,
+              help='Índice inicial; permite ampliar una tabla ya sembrada sin repetir emails')
+@click.option('--batch-size', default=10000, show_default=True, help='Filas por transacción')
+def seed_users(count, seed, start_index, batch_size):
+    """Genera usuarios sintéticos para pruebas de rendimiento"""
+    loader = BulkUserLoader(db.engine)
+    started = time.perf_counter()
+    loaded = 0
+
+    for chunk in chunked(generate_users(count, seed=seed, start=start_index), batch_size):
+        loaded += loader.load(chunk)
+        elapsed = time.perf_counter() - started
+        click.echo(f'{loaded} usuarios generados ({loaded / elapsed:,.0f} filas/s)')
+
+    click.echo(f'Generación completada: {loaded} usuarios en {time.perf_counter() - started:.1f}s')
+
+
+@users_cli.command('init-shards')
+def init_shards():
+    """Crea las tablas de usuarios en cada shard y la tabla de directorio"""
+    repository = current_app.extensions.get('user_repository')
+    if not isinstance(repository, ShardedUserRepository):
+        raise click.ClickException("USER_REPOSITORY no es 'sharded'")
+    repository.create_schema()
+    click.echo(f'{len(repository.shards)} shards inicializados')
@@ -0,0 +1,57 @@
+import hmac
+
+from flask import Blueprint, abort, current_app, jsonify, request
+
+from src.infrastructure.diagnostics.memory import memory_diagnostics
+
+admin_api = Blueprint('admin', __name__)
+
+ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+
+
+@admin_api.before_request
+def require_admin_token():
+    """Exige el ADMIN_TOKEN; sin token configurado los endpoints no existen"""
+    token = current_app.config.get('ADMIN_TOKEN')
+    if not token:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get(ADMIN_TOKEN_HEADER, ''), token):
+        return jsonify({'error': 'No autorizado'}), 401
+    return None
+
+
+@admin_api.route('/memory', methods=['GET'])
+def memory_report():
+    """Contadores del GC, objetos vivos e identity maps de las sesiones"""
+    return jsonify(memory_diagnostics.report())
+
+
+@admin_api.route('/memory/tracemalloc', methods=['POST'])
+def start_tracemalloc():
+    """Activa tracemalloc (?frames= marcos por asignación)"""
+    frames = request.args.get('frames', 1, type=int)
+    if not 1 <= frames <= 100:
+        return jsonify({'error': 'frames debe estar entre 1 y 100'}), 400
+    memory_diagnostics.start(frames)
+    return jsonify({'tracing': True, 'frames': frames})
+
+
+@admin_api.route('/memory/tracemalloc', methods=['DELETE'])
+def stop_tracemalloc():
+    """Desactiva tracemalloc"""
+    memory_diagnostics.stop()
+    return jsonify({'tracing': False})
+
+
+@admin_api.route('/memory/snapshots', methods=['POST'])
+def take_snapshot():
+    """Toma una instantánea y retorna el top-N de diferencias con la anterior"""
+    limit = request.args.get('limit', 20, type=int)
+    group_by = request.args.get('group_by', 'lineno')
+    try:
+        stats = memory_diagnostics.snapshot_diff(limit=limit, group_by=group_by)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    return jsonify({'group_by': group_by, 'stats': stats})
@@ -0,0 +1,161 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from flask import g, jsonify, request
+
+from src.infrastructure.database.models import db
+from src.infrastructure.database.pool_stats import pool_saturation
+
+READ = 'read'
+WRITE = 'write'
+AUTH = 'auth'
+ROUTE_CLASSES = (READ, WRITE, AUTH)
+
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+# Sin control de admisión: salud, documentación, diagnóstico y streams de larga duración
+EXEMPT_ENDPOINTS = frozenset({'health_check', 'static', 'api.stream_user_events'})
+
+
+class AdaptiveLimiter:
+    """Límite de concurrencia AIMD
+
+    Cada petición que termina por debajo de la latencia objetivo suma
+    ``1 / límite`` (aproximadamente +1 por ventana completa); una lenta o
+    fallida, o una señal de saturación externa, multiplica el límite por
+    ``backoff``. La reducción se aplica como mucho una vez por ventana
+    (``latency_target``): una ráfaga de peticiones lentas es una sola señal de
+    congestión. Así el límite converge a la concurrencia que el backend
+    sostiene sin encolar.
+    """
+
+    def __init__(self, initial: int, min_limit: int = 1, max_limit: int = 1000,
+                 latency_target: float = 0.5, backoff: float = 0.9):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.in_flight = 0
+        self._last_decrease: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Ocupa un lugar si hay capacidad; nunca bloquea"""
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float, failed: bool = False, latency_target: Optional[float] = None) -> None:
+        """Libera el lugar y ajusta el límite según el resultado
+
+        ``latency_target`` reemplaza el objetivo de la clase para rutas con
+        un presupuesto propio más largo.
+        """
+        target = self.latency_target if latency_target is None else latency_target
+        with self._lock:
+            self.in_flight -= 1
+            if failed or latency > target:
+                self._decrease()
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def congestion(self) -> None:
+        """Reduce el límite ante una señal de saturación externa"""
+        with self._lock:
+            self._decrease()
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if self._last_decrease is not None and now - self._last_decrease < self.latency_target:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+
+def classify_request() -> str:
+    """Clase de ruta de la petición actual: lectura, escritura o autenticación"""
+    if '/auth/' in request.path:
+        return AUTH
+    return READ if request.method in SAFE_METHODS else WRITE
+
+
+class AdmissionController:
+    """Control de admisión y descarte de carga por clase de ruta
+
+    Rechaza con 503 y ``Retry-After`` en lugar de dejar que las peticiones se
+    acumulen esperando una conexión del pool: cuando el límite de la clase
+    está completo o el pool de la base de datos está saturado, falla rápido.
+    """
+
+    def __init__(self, app=None, saturation: Optional[Callable[[], float]] = None):
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+        self.route_latency_targets: Dict[str, float] = {}
+        self.saturation = saturation or (lambda: pool_saturation(db.engine))
+        self.pool_saturation_threshold = 1.0
+        self.retry_after = 1
+        self.shedding_window = 5.0
+        self._last_shed: Optional[float] = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Crea los limitadores a partir de la configuración y registra los hooks"""
+        initial = app.config.get('ADMISSION_LIMITS', {})
+        maximum = app.config.get('ADMISSION_MAX_LIMITS', {})
+        default_target = app.config.get('ADMISSION_LATENCY_TARGET_MS', 500)
+        targets = app.config.get('ADMISSION_LATENCY_TARGETS_MS', {})
+        self.limiters = {
+            route_class: AdaptiveLimiter(
+                initial=initial.get(route_class, 32),
+                min_limit=app.config.get('ADMISSION_MIN_LIMIT', 1),
+                max_limit=maximum.get(route_class, 256),
+                latency_target=targets.get(route_class, default_target) / 1000
+            )
+            for route_class in ROUTE_CLASSES
+        }
+        # Una ruta con plazo propio (p. ej. el listado completo) solo es lenta pasada la mitad de su plazo
+        self.route_latency_targets = {
+            endpoint: budget / 2000
+            for endpoint, budget in app.config.get('ROUTE_DEADLINES_MS', {}).items()
+        }
+        self.pool_saturation_threshold = app.config.get('ADMISSION_POOL_SATURATION', 1.0)
+        self.retry_after = app.config.get('ADMISSION_RETRY_AFTER_SECONDS', 1)
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions['admission_control'] = self
+
+    @property
+    def shedding(self) -> bool:
+        """Indica si se rechazaron peticiones en los últimos segundos"""
+        return self._last_shed is not None and time.monotonic() - self._last_shed < self.shedding_window
+
+    def _reject(self):
+        self._last_shed = time.monotonic()
+        response = jsonify({'error': 'Servicio sobrecargado, reintente más tarde'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(self.retry_after)
+        return response
+
+    def _before_request(self):
+        endpoint = request.endpoint
+        if endpoint is None or endpoint in EXEMPT_ENDPOINTS or endpoint.startswith(('flasgger.', 'admin.')):
+            return None
+
+        limiter = self.limiters[classify_request()]
+        if self.saturation() >= self.pool_saturation_threshold:
+            limiter.congestion()
+            return self._reject()
+        if not limiter.try_acquire():
+            return self._reject()
+        g.admission = (limiter, time.monotonic(), self.route_latency_targets.get(endpoint))
+        return None
+
+    def _teardown_request(self, error=None) -> None:
+        admission = g.pop('admission', None)
+        if admission is not None:
+            limiter, started, route_target = admission
+            latency_target = None if route_target is None else max(route_target, limiter.latency_target)
+            limiter.release(time.monotonic() - started, failed=error is not None, latency_target=latency_target)
@@ -0,0 +1,121 @@
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependencia opcional
+    zstandard = None
+
+DEFAULT_LEVELS = {'br': 4, 'zstd': 3, 'gzip': 6}
+DEFAULT_MIMETYPES = frozenset({
+    'application/json', 'application/msgpack', 'application/x-msgpack',
+    'text/html', 'text/plain', 'text/css', 'application/javascript'
+})
+
+
+class _BrotliCompressor:
+    """Adapta brotli.Compressor a la interfaz compress/flush de zlib"""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encoders() -> Dict[str, Callable[[int], object]]:
+    """Codificaciones soportadas en este entorno, en orden de preferencia del servidor"""
+    encoders = {}
+    if brotli is not None:
+        encoders['br'] = _BrotliCompressor
+    if zstandard is not None:
+        encoders['zstd'] = lambda level: zstandard.ZstdCompressor(level=level).compressobj()
+    # wbits=31: contenedor gzip en lugar de zlib crudo
+    encoders['gzip'] = lambda level: zlib.compressobj(level, zlib.DEFLATED, 31)
+    return encoders
+
+
+def _compress_stream(chunks: Iterable, compressor) -> Iterator[bytes]:
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+class ResponseCompression:
+    """Compresión de respuestas negociada con Accept-Encoding
+
+    Usa brotli o zstd si están instalados y gzip en cualquier caso. Las
+    respuestas con cuerpo completo se comprimen solo si superan
+    ``COMPRESSION_MIN_SIZE``; las emitidas por bloques se comprimen a medida
+    que se generan. No se tocan los 304, los Server-Sent Events (que deben
+    llegar sin buffer), las respuestas con ETag fuerte ni los tipos que no
+    están en ``COMPRESSION_MIMETYPES``.
+    """
+
+    def __init__(self, app=None):
+        self.min_size = 1024
+        self.levels = dict(DEFAULT_LEVELS)
+        self.mimetypes = DEFAULT_MIMETYPES
+        self.encoders = available_encoders()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Lee los umbrales y niveles de la configuración y registra el hook"""
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', self.min_size)
+        self.levels.update(app.config.get('COMPRESSION_LEVELS', {}))
+        self.mimetypes = frozenset(app.config.get('COMPRESSION_MIMETYPES', self.mimetypes))
+        app.after_request(self._after_request)
+        app.extensions['response_compression'] = self
+
+    def _encoding(self) -> Optional[str]:
+        encoding = request.accept_encodings.best_match(list(self.encoders))
+        return encoding if encoding in self.encoders else None
+
+    def _after_request(self, response):
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in self.mimetypes):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if not response.is_streamed and response.content_length is not None \
+                and response.content_length < self.min_size:
+            return response
+        # Un ETag fuerte identifica los bytes exactos y se usa con If-Match
+        # (comparación fuerte): esas respuestas, siempre pequeñas, van sin comprimir
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            return response
+        encoding = self._encoding()
+        if encoding is None:
+            return response
+
+        compressor = self.encoders[encoding](self.levels[encoding])
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(compressor.compress(response.get_data()) + compressor.flush())
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -1,32 +1,104 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from flasgger import swag_from
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt, get_jwt_identity
 
 from src.application.use_cases.user_use_cases import CreateUserDTO, UpdateUserDTO, UserUseCases
-from src.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor
+from src.core.exceptions import ConcurrencyConflictError
+from src.infrastructure.auth.profile_claims import profile_claims, profile_from_claims
+from src.infrastructure.auth.refresh_tokens import InvalidRefreshTokenError
+from src.infrastructure.events.broker import event_broker
+from src.infrastructure.repositories.factory import finish_unit_of_work, get_unit_of_work
+from src.interfaces.rest.docs import swag_from
+from src.interfaces.rest.idempotency import idempotent
+from src.interfaces.rest.schemas import CREATE_USER_SCHEMA, LOGIN_SCHEMA, UPDATE_USER_SCHEMA
+from src.interfaces.rest.serializers import get_request_data, render, render_list, serialize_user
+from src.interfaces.rest.transactions import transactional
+from src.interfaces.rest.validation import validate_body
 
 api = Blueprint('api', __name__)
-user_repository = SQLAlchemyUserRepository()
-user_use_cases = UserUseCases(user_repository)
+
+
+@api.teardown_request
+def discard_unit_of_work(error=None):
+    """Revierte la transacción que la vista no confirmó (lecturas o peticiones fallidas)
+
+    Las vistas que escriben confirman con ``transactional`` o ``idempotent``
+    antes de responder, así un fallo del commit no llega como 2xx.
+    """
+    finish_unit_of_work(commit=False)
+
+
+def get_user_use_cases() -> UserUseCases:
+    """Casos de uso ligados a la unidad de trabajo de la petición actual"""
+    unit_of_work = get_unit_of_work()
+    return UserUseCases(unit_of_work.users, unit_of_work)
+
+
+def encode_cursor(cursor: ChangeCursor) -> str:
+    """Serializa el cursor del flujo de cambios como un token opaco"""
+    payload = {
+        't': cursor.updated_at.isoformat() if cursor.updated_at else None,
+        'u': cursor.user_id,
+        'd': cursor.tombstone_id
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> ChangeCursor:
+    """Reconstruye un cursor a partir del token recibido en ?since="""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        return ChangeCursor(
+            updated_at=datetime.fromisoformat(payload['t']) if payload['t'] else None,
+            user_id=int(payload['u']),
+            tombstone_id=int(payload['d'])
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError) as error:
+        raise ValueError('Cursor inválido') from error
+
+
+def parse_if_match():
+    """Versión esperada según If-Match; None si no se envió o es '*'
+
+    Lanza ValueError si el header no contiene exactamente una versión válida.
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    tags = if_match.as_set()
+    if len(tags) != 1:
+        raise ValueError('If-Match debe indicar una única versión')
+    tag = tags.pop()
+    if not tag.isdigit():
+        raise ValueError('If-Match inválido')
+    return int(tag)
+
 
 @api.route('/users', methods=['POST'])
+@validate_body
 @swag_from({
     'tags': ['Users'],
     'summary': 'Crear un nuevo usuario',
     'parameters': [
+        {
+            'in': 'header',
+            'name': 'Idempotency-Key',
+            'type': 'string',
+            'required': False,
+            'description': 'Clave única por operación; los reintentos con la misma clave repiten la primera respuesta'
+        },
         {
             'in': 'body',
             'name': 'body',
-            'schema': {
-                'type': 'object',
-                'properties': {
-                    'email': {'type': 'string'},
-                    'password': {'type': 'string'},
-                    'first_name': {'type': 'string'},
-                    'last_name': {'type': 'string'}
-                },
-                'required': ['email', 'password', 'first_name', 'last_name']
-            }
+            'schema': CREATE_USER_SCHEMA
         }
     ],
     'responses': {
@@ -35,12 +107,19 @@ user_use_cases = UserUseCases(user_repository)
         },
         400: {
             'description': 'Datos inválidos'
+        },
+        409: {
+            'description': 'Una petición con el mismo Idempotency-Key sigue en curso'
+        },
+        422: {
+            'description': 'Idempotency-Key reutilizado con otra petición'
         }
     }
 })
+@idempotent
 def create_user():
     """Crea un nuevo usuario"""
-    data = request.get_json()
+    data = get_request_data()
     try:
         user_dto = CreateUserDTO(
             email=data['email'],
@@ -48,14 +127,8 @@ def create_user():
             first_name=data['first_name'],
             last_name=data['last_name']
         )
-        user = user_use_cases.create_user(user_dto)
-        return jsonify({
-            'id': user.id,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'is_active': user.is_active
-        }), 201
+        user = get_user_use_cases().create_user(user_dto)
+        return render(serialize_user(user), 201)
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
     except KeyError:
@@ -66,6 +139,22 @@ def create_user():
 @swag_from({
     'tags': ['Users'],
     'summary': 'Obtener todos los usuarios',
+    'parameters': [
+        {
+            'in': 'query',
+            'name': 'limit',
+            'type': 'integer',
+            'required': False,
+            'description': 'Tamaño de página; sin este parámetro se devuelven todos los usuarios'
+        },
+        {
+            'in': 'query',
+            'name': 'after_id',
+            'type': 'integer',
+            'required': False,
+            'description': 'Último ID de la página anterior'
+        }
+    ],
     'responses': {
         200: {
             'description': 'Lista de usuarios'
@@ -78,17 +167,156 @@ def create_user():
 })
 def get_users():
     """Obtiene todos los usuarios"""
-    print("Obteniendo todos los usuarios")
-    print("Token JWT:", get_jwt_identity())
-    users = user_use_cases.get_all_users()
-    print("Usuarios:", users)
-    return jsonify([{
-        'id': user.id,
-        'email': user.email,
-        'first_name': user.first_name,
-        'last_name': user.last_name,
-        'is_active': user.is_active
-    } for user in users])
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        if limit < 1:
+            return jsonify({'error': 'Datos inválidos'}), 400
+        limit = min(limit, current_app.config.get('USERS_MAX_PAGE_SIZE', 1000))
+        users = get_user_use_cases().list_users(request.args.get('after_id', type=int), limit)
+    else:
+        users = get_user_use_cases().get_all_users()
+    return render_list(users, serialize_user)
+
+@api.route('/users/changes', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['Users'],
+    'summary': 'Obtener los cambios de usuarios desde un cursor',
+    'parameters': [
+        {
+            'in': 'query',
+            'name': 'since',
+            'type': 'string',
+            'required': False,
+            'description': 'Cursor devuelto por la llamada anterior; vacío para la sincronización inicial'
+        },
+        {
+            'in': 'query',
+            'name': 'limit',
+            'type': 'integer',
+            'required': False
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Usuarios creados o actualizados, IDs eliminados y el siguiente cursor'
+        },
+        400: {
+            'description': 'Cursor inválido'
+        }
+    },
+    'security': [{'Bearer': []}]
+})
+def get_user_changes():
+    """Obtiene los usuarios creados, actualizados o eliminados desde un cursor"""
+    config = current_app.config
+    try:
+        since = request.args.get('since')
+        cursor = decode_cursor(since) if since else ChangeCursor()
+        limit = min(
+            request.args.get('limit', config.get('CHANGE_FEED_PAGE_SIZE', 500), type=int),
+            config.get('CHANGE_FEED_MAX_PAGE_SIZE', 5000)
+        )
+        if limit < 1:
+            raise ValueError('Datos inválidos')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    until = datetime.utcnow() - timedelta(seconds=config.get('CHANGE_FEED_SETTLE_SECONDS', 1))
+    changes = get_user_use_cases().get_user_changes(cursor, limit, until)
+    return jsonify({
+        'changes': [{
+            'id': user.id,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_active': user.is_active,
+            'updated_at': user.updated_at.isoformat() if user.updated_at else None
+        } for user in changes.updated],
+        'deleted': changes.deleted_ids,
+        'cursor': encode_cursor(changes.cursor),
+        'has_more': changes.has_more
+    })
+
+@api.route('/users/stream', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['Users'],
+    'summary': 'Suscribirse a los eventos de usuarios (Server-Sent Events)',
+    'produces': ['text/event-stream'],
+    'responses': {
+        200: {
+            'description': 'Flujo de eventos user.created, user.updated, user.activated, user.deactivated y user.deleted'
+        },
+        401: {
+            'description': 'No autorizado - Token JWT inválido o expirado'
+        }
+    },
+    'security': [{'Bearer': []}]
+})
+def stream_user_events():
+    """Envía los eventos de usuarios a medida que ocurren"""
+    heartbeat = current_app.config.get('SSE_HEARTBEAT_SECONDS', 15)
+
+    def generate():
+        subscription = event_broker.subscribe()
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                message = subscription.get(timeout=heartbeat)
+                if subscription.dropped:
+                    # El cliente no consumió a tiempo: se le desconecta para que reconecte
+                    yield 'event: dropped\ndata: {}\n\n'
+                    return
+                if message is None:
+                    yield ': keep-alive\n\n'
+                    continue
+                sequence, event = message
+                data = json.dumps(event.to_dict(), ensure_ascii=False)
+                yield f'id: {sequence}\nevent: {event.type}\ndata: {data}\n\n'
+        finally:
+            subscription.close()
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@api.route('/users/me', methods=['GET'])
+@jwt_required()
+@swag_from({
+    'tags': ['Users'],
+    'summary': 'Obtener el perfil del usuario autenticado',
+    'description': 'Se responde desde los claims del token salvo que el perfil haya cambiado desde su emisión',
+    'responses': {
+        200: {
+            'description': 'Perfil del usuario autenticado'
+        },
+        404: {
+            'description': 'Usuario no encontrado'
+        }
+    },
+    'security': [{'Bearer': []}]
+})
+def get_current_user():
+    """Obtiene el perfil del usuario autenticado"""
+    user_id = int(get_jwt_identity())
+    claims = get_jwt()
+    profile = profile_from_claims(user_id, claims)
+    versions = current_app.extensions.get('profile_versions')
+    if profile is not None and versions is not None and not versions.is_current(
+            user_id, profile['version'], claims['iat']):
+        profile = None
+    if profile is None:
+        try:
+            user = get_user_use_cases().get_user(user_id)
+        except ValueError:
+            return jsonify({'error': 'Usuario no encontrado'}), 404
+        profile = dict(serialize_user(user), version=user.version)
+    version = profile.pop('version')
+    response = render(profile)
+    response.set_etag(str(version))
+    return response
 
 @api.route('/users/<int:user_id>', methods=['GET'])
 @jwt_required()
@@ -116,19 +344,17 @@ def get_users():
 def get_user(user_id):
     """Obtiene un usuario por su ID"""
     try:
-        user = user_use_cases.get_user(user_id)
-        return jsonify({
-            'id': user.id,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'is_active': user.is_active
-        })
+        user = get_user_use_cases().get_user(user_id)
+        response = render(serialize_user(user))
+        # La versión de la fila identifica la representación: se usa como ETag
+        response.set_etag(str(user.version))
+        return response
     except ValueError:
         return jsonify({'error': 'Usuario no encontrado'}), 404
 
 @api.route('/users/<int:user_id>', methods=['PUT'])
 @jwt_required()
+@validate_body
 @swag_from({
     'tags': ['Users'],
     'summary': 'Actualizar un usuario',
@@ -139,17 +365,17 @@ def get_user(user_id):
             'type': 'integer',
             'required': True
         },
+        {
+            'in': 'header',
+            'name': 'If-Match',
+            'type': 'string',
+            'required': False,
+            'description': 'ETag obtenido en la lectura; la actualización solo se aplica si el usuario no cambió'
+        },
         {
             'in': 'body',
             'name': 'body',
-            'schema': {
-                'type': 'object',
-                'properties': {
-                    'first_name': {'type': 'string', 'example': 'John'},
-                    'last_name': {'type': 'string', 'example': 'Doe'}
-                },
-                'required': ['first_name', 'last_name']
-            }
+            'schema': UPDATE_USER_SCHEMA
         }
     ],
     'responses': {
@@ -158,26 +384,32 @@ def get_user(user_id):
         },
         404: {
             'description': 'Usuario no encontrado'
+        },
+        412: {
+            'description': 'El usuario fue modificado desde la lectura (If-Match no coincide)'
         }
     },
     'security': [{'Bearer': []}]
 })
+@transactional
 def update_user(user_id):
     """Actualiza un usuario"""
     try:
-        data = request.get_json()
+        expected_version = parse_if_match()
+    except ValueError:
+        return jsonify({'error': 'El usuario fue modificado por otra petición'}), 412
+    try:
+        data = get_request_data()
         user_dto = UpdateUserDTO(
             first_name=data['first_name'],
             last_name=data['last_name']
         )
-        user = user_use_cases.update_user(user_id, user_dto)
-        return jsonify({
-            'id': user.id,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'is_active': user.is_active
-        })
+        user = get_user_use_cases().update_user(user_id, user_dto, expected_version)
+        response = render(serialize_user(user))
+        response.set_etag(str(user.version))
+        return response
+    except ConcurrencyConflictError:
+        return jsonify({'error': 'El usuario fue modificado por otra petición'}), 412
     except ValueError:
         return jsonify({'error': 'Usuario no encontrado'}), 404
     except KeyError:
@@ -206,15 +438,17 @@ def update_user(user_id):
     },
     'security': [{'Bearer': []}]
 })
+@transactional
 def delete_user(user_id):
     """Elimina un usuario"""
     try:
-        user_use_cases.delete_user(user_id)
+        get_user_use_cases().delete_user(user_id)
         return '', 204
     except ValueError:
         return jsonify({'error': 'Usuario no encontrado'}), 404
 
 @api.route('/auth/login', methods=['POST'])
+@validate_body
 @swag_from({
     'tags': ['Auth'],
     'summary': 'Iniciar sesión y obtener token JWT',
@@ -222,14 +456,7 @@ def delete_user(user_id):
         {
             'in': 'body',
             'name': 'body',
-            'schema': {
-                'type': 'object',
-                'properties': {
-                    'email': {'type': 'string', 'example': 'test@example.com'},
-                    'password': {'type': 'string', 'example': 'test123'}
-                },
-                'required': ['email', 'password']
-            }
+            'schema': LOGIN_SCHEMA
         }
     ],
     'responses': {
@@ -241,23 +468,138 @@ def delete_user(user_id):
                     'access_token': {
                         'type': 'string',
                         'description': 'Token JWT para usar en el header Authorization con formato: Bearer {token}'
+                    },
+                    'refresh_token': {
+                        'type': 'string',
+                        'description': 'Token opaco de un solo uso para obtener un nuevo access token en /auth/refresh'
                     }
                 }
             }
         },
         401: {
-            'description': 'Credenciales inválidas'
+            'description': 'Credenciales inválidas o usuario inactivo'
         }
     }
 })
 def login():
     """Inicia sesión y retorna un token JWT"""
-    data = request.get_json()
+    data = get_request_data()
     try:
-        user = user_repository.get_by_email(data['email'])
-        if user and user.password == data['password']:  # En una implementación real, verificar hash
-            access_token = create_access_token(identity=str(user.id))
-            return jsonify({'access_token': f'{access_token}'})
+        users = get_unit_of_work().users
+        # Con claims de perfil se lee la fila completa; sin ellos basta el índice cubriente
+        if current_app.config.get('JWT_PROFILE_CLAIMS'):
+            credentials = users.get_by_email(data['email'])
+        else:
+            credentials = users.get_credentials_by_email(data['email'])
+        if credentials and credentials.password == data['password']:  # En una implementación real, verificar hash
+            if not credentials.is_active:
+                return jsonify({'error': 'Usuario inactivo'}), 401
+            additional_claims = profile_claims(credentials) if isinstance(credentials, User) else None
+            access_token = create_access_token(identity=str(credentials.id), additional_claims=additional_claims)
+            tokens = {'access_token': f'{access_token}'}
+            refresh_tokens = current_app.extensions.get('refresh_tokens')
+            if refresh_tokens is not None:
+                tokens['refresh_token'] = refresh_tokens.issue(credentials.id)
+            return jsonify(tokens)
         return jsonify({'error': 'Credenciales inválidas'}), 401
     except KeyError:
-        return jsonify({'error': 'Datos inválidos'}), 400
\ No newline at end of file
+        return jsonify({'error': 'Datos inválidos'}), 400
+
+@api.route('/auth/refresh', methods=['POST'])
+@swag_from({
+    'tags': ['Auth'],
+    'summary': 'Renovar el access token con un refresh token',
+    'description': (
+        'El refresh token se rota: cada uso entrega uno nuevo y el anterior deja de ser válido. '
+        'Reintentar con el mismo token pocos segundos después entrega otro sin revocar la sesión'
+    ),
+    'parameters': [
+        {
+            'in': 'body',
+            'name': 'body',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'refresh_token': {'type': 'string'}
+                },
+                'required': ['refresh_token']
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Nuevo access token y nuevo refresh token'
+        },
+        400: {
+            'description': 'Datos inválidos'
+        },
+        401: {
+            'description': 'Refresh token inválido, vencido, revocado o reutilizado'
+        },
+        501: {
+            'description': 'Los refresh tokens están deshabilitados'
+        }
+    }
+})
+def refresh():
+    """Rota el refresh token y emite un nuevo access token sin verificar credenciales"""
+    refresh_tokens = current_app.extensions.get('refresh_tokens')
+    if refresh_tokens is None:
+        return jsonify({'error': 'Los refresh tokens están deshabilitados'}), 501
+    token = (request.get_json(silent=True) or {}).get('refresh_token')
+    if not isinstance(token, str) or not token:
+        return jsonify({'error': 'Datos inválidos'}), 400
+    try:
+        user_id, new_token = refresh_tokens.rotate(token)
+    except InvalidRefreshTokenError:
+        return jsonify({'error': 'Refresh token inválido'}), 401
+
+    # El usuario pudo eliminarse o desactivarse sin que llegara el evento: lectura por clave primaria
+    user = get_unit_of_work().users.get_by_id(user_id)
+    if user is None or not user.is_active:
+        return jsonify({'error': 'Refresh token inválido'}), 401
+    additional_claims = profile_claims(user) if current_app.config.get('JWT_PROFILE_CLAIMS') else None
+    access_token = create_access_token(identity=str(user_id), additional_claims=additional_claims)
+    return jsonify({'access_token': access_token, 'refresh_token': new_token})
+
+@api.route('/auth/logout', methods=['POST'])
+@jwt_required()
+@swag_from({
+    'tags': ['Auth'],
+    'summary': 'Cerrar sesión revocando el token actual',
+    'parameters': [
+        {
+            'in': 'body',
+            'name': 'body',
+            'required': False,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'refresh_token': {'type': 'string', 'description': 'Se revoca junto con los que derivan del mismo login'}
+                }
+            }
+        }
+    ],
+    'responses': {
+        204: {
+            'description': 'Token revocado'
+        },
+        501: {
+            'description': 'La revocación de tokens está deshabilitada'
+        }
+    },
+    'security': [{'Bearer': []}]
+})
+def logout():
+    """Revoca el access token con el que se hace la petición"""
+    blocklist = current_app.extensions.get('token_blocklist')
+    if blocklist is None:
+        return jsonify({'error': 'La revocación de tokens está deshabilitada'}), 501
+    claims = get_jwt()
+    expires_at = datetime.utcfromtimestamp(claims['exp']) if 'exp' in claims else datetime.utcnow() + blocklist.retention
+    blocklist.revoke_token(claims['jti'], int(claims['sub']), expires_at)
+    refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+    refresh_tokens = current_app.extensions.get('refresh_tokens')
+    if isinstance(refresh_token, str) and refresh_tokens is not None:
+        refresh_tokens.revoke(refresh_token)
+    return '', 204
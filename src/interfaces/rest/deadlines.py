@@ -0,0 +1,93 @@
+import time
+from typing import Optional
+
+from flask import g, jsonify, request
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from src.infrastructure.database.deadlines import (
+    DeadlineExceeded, install_deadline_hooks, is_timeout_error, reset_deadline, set_deadline
+)
+from src.infrastructure.database.group_commit import GroupCommitTimeoutError
+
+DEADLINE_HEADER = 'X-Request-Deadline'
+# Sin plazo: salud, documentación, diagnóstico y streams de larga duración
+EXEMPT_ENDPOINTS = frozenset({'health_check', 'static', 'api.stream_user_events'})
+
+
+def header_deadline() -> Optional[float]:
+    """Plazo enviado por el cliente (epoch en milisegundos) convertido a time.monotonic"""
+    value = request.headers.get(DEADLINE_HEADER)
+    if not value:
+        return None
+    try:
+        remaining = int(value) / 1000 - time.time()
+    except ValueError:
+        return None
+    return time.monotonic() + remaining
+
+
+class RequestDeadlines:
+    """Plazo por petición propagado a la base de datos
+
+    Cada endpoint tiene un presupuesto (``ROUTE_DEADLINES_MS`` o
+    ``REQUEST_DEADLINE_MS``), que el cliente puede acortar con
+    ``X-Request-Deadline``. El tiempo restante limita cada consulta, y los
+    plazos vencidos responden 504; una espera agotada por una conexión del
+    pool o por el lote del group commit responde 503.
+    """
+
+    def __init__(self, app=None):
+        self.default_budget = 5.0
+        self.route_budgets = {}
+        self.retry_after = 1
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Lee los presupuestos de la configuración y registra hooks y manejadores de error"""
+        self.default_budget = app.config.get('REQUEST_DEADLINE_MS', 5000) / 1000
+        self.route_budgets = {
+            endpoint: budget / 1000
+            for endpoint, budget in app.config.get('ROUTE_DEADLINES_MS', {}).items()
+        }
+        self.retry_after = app.config.get('ADMISSION_RETRY_AFTER_SECONDS', 1)
+        install_deadline_hooks()
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+        app.register_error_handler(DeadlineExceeded, self._deadline_exceeded)
+        app.register_error_handler(OperationalError, self._operational_error)
+        app.register_error_handler(PoolTimeoutError, self._pool_timeout)
+        app.register_error_handler(GroupCommitTimeoutError, self._pool_timeout)
+        app.extensions['request_deadlines'] = self
+
+    def _before_request(self):
+        endpoint = request.endpoint
+        if endpoint is None or endpoint in EXEMPT_ENDPOINTS or endpoint.startswith(('flasgger.', 'admin.')):
+            return None
+        deadline = time.monotonic() + self.route_budgets.get(endpoint, self.default_budget)
+        client_deadline = header_deadline()
+        if client_deadline is not None:
+            deadline = min(deadline, client_deadline)
+        if deadline <= time.monotonic():
+            return self._deadline_exceeded(None)
+        g.deadline_token = set_deadline(deadline)
+        return None
+
+    def _teardown_request(self, error=None) -> None:
+        token = g.pop('deadline_token', None)
+        if token is not None:
+            reset_deadline(token)
+
+    def _deadline_exceeded(self, error):
+        return jsonify({'error': 'Tiempo de respuesta agotado'}), 504
+
+    def _operational_error(self, error):
+        if is_timeout_error(error):
+            return self._deadline_exceeded(error)
+        raise error
+
+    def _pool_timeout(self, error):
+        response = jsonify({'error': 'Servicio sobrecargado, reintente más tarde'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(self.retry_after)
+        return response
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import threading
+from typing import Dict, Tuple
+
+from flask import Response, current_app, request
+
+
+def swag_from(specs: Dict):
+    """Adjunta la especificación OpenAPI a la vista sin importar flasgger
+
+    Equivale a ``flasgger.swag_from`` con un diccionario: flasgger lee el
+    mismo atributo ``specs_dict`` al generar la especificación.
+    """
+    def decorator(view):
+        view.specs_dict = specs
+        return view
+    return decorator
+
+
+class ApiDocs:
+    """Documentación Swagger opcional con la especificación generada una sola vez
+
+    Con ``SWAGGER_ENABLED`` desactivado no se importa flasgger ni se registran
+    rutas. Si no, la especificación se genera en la primera petición a
+    ``/apispec_1.json`` (o se lee al arrancar desde ``SWAGGER_SPEC_PATH``,
+    exportado con ``flask docs export``) y se sirve desde memoria con un ETag
+    débil, respondiendo 304 a los clientes que ya la tienen. El ETag es débil
+    para que la compresión pueda aplicarse: identifica la especificación, no
+    los bytes de cada codificación.
+    """
+
+    def __init__(self, app=None):
+        self.swagger = None
+        self._documents: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Registra Swagger UI y reemplaza las vistas de la especificación por la versión cacheada"""
+        if not app.config.get('SWAGGER_ENABLED', True):
+            return
+        # flasgger arrastra jsonschema, yaml y mistune: solo se carga si hay documentación
+        from flasgger import Swagger
+
+        self.swagger = Swagger(app)
+        blueprint = self.swagger.config.get('endpoint', 'flasgger')
+        for spec in self.swagger.config['specs']:
+            endpoint = spec['endpoint']
+            app.view_functions[f'{blueprint}.{endpoint}'] = self._view(endpoint)
+        spec_path = app.config.get('SWAGGER_SPEC_PATH')
+        if spec_path:
+            self._documents[self.swagger.config['specs'][0]['endpoint']] = self._load(spec_path)
+        app.extensions['api_docs'] = self
+
+    @staticmethod
+    def _load(path: str) -> Tuple[bytes, str]:
+        with open(path, 'rb') as spec_file:
+            body = spec_file.read()
+        # Un archivo corrupto debe fallar al arrancar, no en la primera visita a /docs/
+        json.loads(body)
+        return body, hashlib.sha256(body).hexdigest()
+
+    def document(self, endpoint: str = 'apispec_1') -> Tuple[bytes, str]:
+        """Especificación serializada y su ETag, generándola la primera vez"""
+        document = self._documents.get(endpoint)
+        if document is None:
+            with self._lock:
+                document = self._documents.get(endpoint)
+                if document is None:
+                    body = current_app.json.dumps(self.swagger.get_apispecs(endpoint)).encode('utf-8')
+                    document = self._documents[endpoint] = (body, hashlib.sha256(body).hexdigest())
+        return document
+
+    def _view(self, endpoint: str):
+        def apispec():
+            body, etag = self.document(endpoint)
+            response = Response(body, mimetype='application/json')
+            response.set_etag(etag, weak=True)
+            # El cliente revalida siempre; con el ETag vigente recibe 304 sin cuerpo
+            response.cache_control.no_cache = True
+            return response.make_conditional(request)
+        apispec.__name__ = endpoint
+        return apispec
+
@@ -0,0 +1,72 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, jsonify, make_response, request
+
+from src.infrastructure.idempotency.store import (
+    IdempotencyKeyInUseError, IdempotencyKeyMismatchError, StoredResponse
+)
+from src.interfaces.rest.transactions import commit_response
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(view):
+    """Repite la primera respuesta ante reintentos con el mismo ``Idempotency-Key``
+
+    La clave se asocia al método y la ruta, y el cuerpo de la petición se
+    compara por hash: reutilizarla con otro cuerpo responde 422. Solo se
+    guardan respuestas confirmadas; los errores 5xx y las confirmaciones
+    fallidas liberan la clave para que el cliente pueda reintentar. Con o sin
+    clave, la transacción de la petición se confirma antes de responder.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        store = current_app.extensions.get('idempotency_store')
+        if not key or store is None:
+            return commit_response(make_response(view(*args, **kwargs)))
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'{IDEMPOTENCY_HEADER} admite hasta {MAX_KEY_LENGTH} caracteres'}), 400
+
+        scoped_key = f'{request.method} {request.path} {key}'
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        try:
+            stored = store.claim(scoped_key, fingerprint)
+        except IdempotencyKeyMismatchError:
+            return jsonify({'error': f'{IDEMPOTENCY_HEADER} ya se usó con otra petición'}), 422
+        except IdempotencyKeyInUseError:
+            response = jsonify({'error': 'Una petición con la misma clave sigue en curso'})
+            response.headers['Retry-After'] = '1'
+            return response, 409
+
+        if stored is not None:
+            response = current_app.response_class(
+                stored.body, status=stored.status_code, content_type=stored.content_type
+            )
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        try:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code >= 500:
+                store.release(scoped_key)
+                return response
+            # Confirmar antes de guardar: nunca se repite una respuesta cuya transacción falló
+            committed = commit_response(response)
+            if committed is not response:
+                store.release(scoped_key)
+                return committed
+        except Exception:
+            store.release(scoped_key)
+            raise
+        store.complete(scoped_key, StoredResponse(
+            status_code=response.status_code,
+            body=response.get_data(),
+            content_type=response.content_type
+        ))
+        return response
+
+    return wrapper
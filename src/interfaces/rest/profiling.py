@@ -0,0 +1,108 @@
+import cProfile
+import hmac
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+from flask import g, request
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+PROFILE_SUFFIX = '.prof'
+EXEMPT_ENDPOINTS = frozenset({'health_check', 'static', 'api.stream_user_events'})
+
+
+def rotate_profiles(directory: str, max_files: int, max_bytes: int) -> None:
+    """Borra los perfiles más antiguos hasta respetar los límites de cantidad y tamaño"""
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(PROFILE_SUFFIX):
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    while entries and (len(entries) > max_files or total > max_bytes):
+        _, size, path = entries.pop(0)
+        os.remove(path)
+        total -= size
+
+
+class RequestProfiler:
+    """Perfilado bajo demanda de peticiones individuales con cProfile
+
+    Se activa con ``PROFILING_ENABLED``; sin él no registra ningún hook. Una
+    petición se perfila si trae ``X-Profile`` con el ``ADMIN_TOKEN`` o si cae
+    en el muestreo ``PROFILING_SAMPLE_RATE``. El resultado se guarda en formato
+    pstats (legible con ``pstats``, snakeviz o flameprof para flamegraphs) en
+    ``PROFILING_DIR``, rotando por cantidad y tamaño. Como mucho se perfila
+    una petición a la vez por proceso, lo que acota el sobrecosto.
+    """
+
+    def __init__(self, app=None):
+        self.directory = 'profiles'
+        self.token: Optional[str] = None
+        self.sample_rate = 0.0
+        self.max_files = 100
+        self.max_bytes = 100 * 1024 * 1024
+        self._busy = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Registra los hooks si el perfilado está habilitado"""
+        if not app.config.get('PROFILING_ENABLED'):
+            return
+        self.directory = app.config.get('PROFILING_DIR', self.directory)
+        self.token = app.config.get('ADMIN_TOKEN')
+        self.sample_rate = app.config.get('PROFILING_SAMPLE_RATE', self.sample_rate)
+        self.max_files = app.config.get('PROFILING_MAX_FILES', self.max_files)
+        self.max_bytes = app.config.get('PROFILING_MAX_BYTES', self.max_bytes)
+        os.makedirs(self.directory, exist_ok=True)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions['request_profiler'] = self
+
+    def _requested(self) -> bool:
+        header = request.headers.get(PROFILE_HEADER)
+        if header is not None and self.token:
+            return hmac.compare_digest(header, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _before_request(self):
+        if request.endpoint in EXEMPT_ENDPOINTS or not self._requested():
+            return None
+        # cProfile no admite perfiles simultáneos en el mismo intérprete
+        if not self._busy.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        g.profiler = (profiler, time.perf_counter())
+        profiler.enable()
+        return None
+
+    def _after_request(self, response):
+        active = g.pop('profiler', None)
+        if active is None:
+            return response
+        profiler, started = active
+        profiler.disable()
+        try:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            endpoint = (request.endpoint or 'unknown').replace('.', '_')
+            name = f'{time.strftime("%Y%m%dT%H%M%S")}-{request.method}-{endpoint}-{elapsed_ms:.0f}ms-{os.getpid()}'
+            profiler.dump_stats(os.path.join(self.directory, name + PROFILE_SUFFIX))
+            rotate_profiles(self.directory, self.max_files, self.max_bytes)
+            response.headers[PROFILE_ID_HEADER] = name
+        finally:
+            self._busy.release()
+        return response
+
+    def _teardown_request(self, error=None) -> None:
+        # Si la petición falló antes de after_request, se descarta el perfil
+        active = g.pop('profiler', None)
+        if active is not None:
+            active[0].disable()
+            self._busy.release()
@@ -0,0 +1,30 @@
+"""Esquemas de los cuerpos de petición, compartidos por Swagger y la validación"""
+
+CREATE_USER_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'email': {'type': 'string', 'format': 'email', 'minLength': 1},
+        'password': {'type': 'string', 'minLength': 1},
+        'first_name': {'type': 'string', 'minLength': 1},
+        'last_name': {'type': 'string', 'minLength': 1}
+    },
+    'required': ['email', 'password', 'first_name', 'last_name']
+}
+
+UPDATE_USER_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'first_name': {'type': 'string', 'minLength': 1, 'example': 'John'},
+        'last_name': {'type': 'string', 'minLength': 1, 'example': 'Doe'}
+    },
+    'required': ['first_name', 'last_name']
+}
+
+LOGIN_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'email': {'type': 'string', 'minLength': 1, 'example': 'test@example.com'},
+        'password': {'type': 'string', 'minLength': 1, 'example': 'test123'}
+    },
+    'required': ['email', 'password']
+}
@@ -0,0 +1,98 @@
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from flask import current_app, g, jsonify, request
+from werkzeug.exceptions import BadRequest, UnsupportedMediaType
+
+from src.core.entities.user import User
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+MSGPACK_TYPES = (MSGPACK, 'application/x-msgpack')
+
+
+def serialize_user(user: User) -> Dict[str, Any]:
+    """Representación pública de un usuario, común a todos los formatos"""
+    return {
+        'id': user.id,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'is_active': user.is_active
+    }
+
+
+def negotiate() -> str:
+    """Formato de respuesta según Accept; JSON salvo que se pida MessagePack y esté disponible"""
+    offered = (JSON,) + (MSGPACK_TYPES if msgpack is not None else ())
+    best = request.accept_mimetypes.best_match(offered, default=JSON)
+    return MSGPACK if best in MSGPACK_TYPES else JSON
+
+
+def get_request_data() -> Optional[Any]:
+    """Cuerpo de la petición decodificado según su Content-Type (JSON o MessagePack)
+
+    El resultado se guarda en ``g``: la validación y la vista lo decodifican una sola vez.
+    """
+    if 'request_data' not in g:
+        g.request_data = _decode_request_data()
+    return g.request_data
+
+
+def _decode_request_data() -> Optional[Any]:
+    if request.mimetype in MSGPACK_TYPES:
+        if msgpack is None:
+            raise UnsupportedMediaType('MessagePack no está disponible en este servidor')
+        try:
+            return msgpack.unpackb(request.get_data(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as error:
+            raise BadRequest('Cuerpo MessagePack inválido') from error
+    return request.get_json()
+
+
+def render(payload: Any, status: int = 200):
+    """Respuesta en el formato negociado"""
+    mimetype = negotiate()
+    if mimetype == JSON:
+        response = jsonify(payload)
+    else:
+        response = current_app.response_class(msgpack.packb(payload, use_bin_type=True), mimetype=mimetype)
+    response.status_code = status
+    response.vary.add('Accept')
+    return response
+
+
+def render_list(items: Sequence, serialize: Callable[[Any], Dict[str, Any]]):
+    """Lista en el formato negociado; las grandes se emiten por bloques sin armar el cuerpo completo"""
+    chunk_size = current_app.config.get('SERIALIZER_CHUNK_SIZE', 500)
+    if len(items) <= chunk_size:
+        return render([serialize(item) for item in items])
+
+    mimetype = negotiate()
+    if mimetype == JSON:
+        body = _json_chunks(items, serialize, chunk_size, current_app.json.dumps)
+    else:
+        body = _msgpack_chunks(items, serialize, chunk_size)
+    response = current_app.response_class(body, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
+def _json_chunks(items: Sequence, serialize, chunk_size: int, dumps) -> Iterator[bytes]:
+    separator = '['
+    for start in range(0, len(items), chunk_size):
+        chunk = ','.join(dumps(serialize(item)) for item in items[start:start + chunk_size])
+        yield (separator + chunk).encode('utf-8')
+        separator = ','
+    yield b']'
+
+
+def _msgpack_chunks(items: Sequence, serialize, chunk_size: int) -> Iterator[bytes]:
+    packer = msgpack.Packer(use_bin_type=True)
+    yield packer.pack_array_header(len(items))
+    for start in range(0, len(items), chunk_size):
+        yield b''.join(packer.pack(serialize(item)) for item in items[start:start + chunk_size])
@@ -0,0 +1,39 @@
+from functools import wraps
+
+from flask import current_app, jsonify, make_response
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.core.exceptions import ConcurrencyConflictError
+from src.infrastructure.database.deadlines import is_timeout_error
+from src.infrastructure.repositories.factory import finish_unit_of_work
+
+
+def commit_response(response):
+    """Confirma la unidad de trabajo de la petición antes de enviar la respuesta
+
+    Se confirma solo si la respuesta no es un error. Si la confirmación falla,
+    la respuesta se reemplaza por 409 (conflicto con otra escritura) o 503
+    (base de datos no disponible): nunca se envía un 2xx de un cambio que no
+    quedó guardado. Un plazo vencido sigue su curso hasta el manejador de 504.
+    """
+    try:
+        finish_unit_of_work(commit=response.status_code < 400)
+    except (IntegrityError, ConcurrencyConflictError):
+        return make_response(jsonify({'error': 'El cambio entra en conflicto con otra petición'}), 409)
+    except OperationalError as error:
+        if is_timeout_error(error):
+            raise
+        failure = make_response(jsonify({'error': 'No se pudo guardar el cambio, reintente más tarde'}), 503)
+        failure.headers['Retry-After'] = str(current_app.config.get('ADMISSION_RETRY_AFTER_SECONDS', 1))
+        return failure
+    return response
+
+
+def transactional(view):
+    """Confirma la transacción de la petición dentro de la vista, antes de responder"""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        return commit_response(make_response(view(*args, **kwargs)))
+
+    return wrapper
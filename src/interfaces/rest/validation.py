@@ -0,0 +1,122 @@
+import re
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import current_app, jsonify, request
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge, UnsupportedMediaType
+
+from src.infrastructure.database.models import UserModel
+from src.interfaces.rest.serializers import get_request_data
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Tipos JSON → tipos Python aceptados (bool no cuenta como número)
+TYPES = {
+    'string': (str,),
+    'integer': (int,),
+    'number': (int, float),
+    'boolean': (bool,),
+    'object': (dict,),
+    'array': (list,)
+}
+FORMATS = {'email': EMAIL_PATTERN}
+
+Validator = Callable[[Any], Dict[str, str]]
+
+
+def column_limits(model) -> Dict[str, int]:
+    """Longitud máxima de cada columna String del modelo"""
+    return {
+        column.name: column.type.length
+        for column in model.__table__.columns
+        if getattr(column.type, 'length', None)
+    }
+
+
+USER_FIELD_LIMITS = column_limits(UserModel)
+
+
+def compile_schema(schema: Dict, limits: Optional[Dict[str, int]] = None) -> Validator:
+    """Compila un esquema de objeto (subconjunto de JSON Schema) en una función de validación
+
+    Soporta ``type``, ``required``, ``minLength``, ``maxLength`` y
+    ``format: email`` por propiedad. Las cadenas sin ``maxLength`` toman el
+    límite de ``limits`` (por ejemplo, el tamaño de la columna). La función
+    retorna un diccionario campo → error, vacío si el objeto es válido.
+    """
+    if schema.get('type', 'object') != 'object':
+        raise ValueError('Solo se admiten esquemas de tipo object')
+    limits = limits or {}
+    required = set(schema.get('required', ()))
+    fields: List[Tuple] = []
+    for name, spec in schema.get('properties', {}).items():
+        kind = spec.get('type', 'string')
+        if kind not in TYPES:
+            raise ValueError(f'Tipo no soportado en {name}: {kind}')
+        if 'format' in spec and spec['format'] not in FORMATS:
+            raise ValueError(f"Formato no soportado en {name}: {spec['format']}")
+        max_length = spec.get('maxLength', limits.get(name)) if kind == 'string' else None
+        fields.append((
+            name, name in required, TYPES[kind], kind,
+            spec.get('minLength'), max_length, FORMATS.get(spec.get('format'))
+        ))
+
+    def validate(data: Any) -> Dict[str, str]:
+        if not isinstance(data, dict):
+            return {'body': 'se esperaba un objeto'}
+        errors = {}
+        for name, is_required, types, kind, min_length, max_length, pattern in fields:
+            if name not in data or data[name] is None:
+                if is_required:
+                    errors[name] = 'es obligatorio'
+                continue
+            value = data[name]
+            if not isinstance(value, types) or (isinstance(value, bool) and kind != 'boolean'):
+                errors[name] = f'debe ser de tipo {kind}'
+            elif min_length is not None and len(value) < min_length:
+                errors[name] = f'debe tener al menos {min_length} caracteres'
+            elif max_length is not None and len(value) > max_length:
+                errors[name] = f'supera {max_length} caracteres'
+            elif pattern is not None and not pattern.match(value):
+                errors[name] = 'formato inválido'
+        return errors
+
+    return validate
+
+
+def body_schema(specs: Dict) -> Optional[Dict]:
+    """Esquema del parámetro ``in: body`` de una especificación de swag_from"""
+    for parameter in specs.get('parameters', ()):
+        if parameter.get('in') == 'body':
+            return parameter.get('schema')
+    return None
+
+
+def validate_body(view):
+    """Valida el cuerpo contra el esquema de ``@swag_from`` antes de ejecutar la vista
+
+    Se aplica encima de ``@swag_from``: el esquema se compila una sola vez al
+    importar el módulo. Cuerpos que superan ``REQUEST_MAX_BODY_SIZE``
+    responden 413; los que no se pueden decodificar o no cumplen el esquema,
+    400 con el detalle por campo. Nada llega al caso de uso ni a la base.
+    """
+    schema = body_schema(getattr(view, 'specs_dict', {}))
+    if schema is None:
+        raise ValueError(f'{view.__name__} no declara un parámetro body en @swag_from')
+    validator = compile_schema(schema, USER_FIELD_LIMITS)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        request.max_content_length = current_app.config.get('REQUEST_MAX_BODY_SIZE', 16 * 1024)
+        try:
+            data = get_request_data()
+        except RequestEntityTooLarge:
+            return jsonify({'error': 'Cuerpo de la petición demasiado grande'}), 413
+        except (BadRequest, UnsupportedMediaType):
+            return jsonify({'error': 'Datos inválidos', 'fields': {'body': 'no se pudo decodificar'}}), 400
+        errors = validator(data)
+        if errors:
+            return jsonify({'error': 'Datos inválidos', 'fields': errors}), 400
+        return view(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,79 @@
+import logging
+import time
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
+
+from src.infrastructure.database.models import db
+from src.infrastructure.events.broker import event_broker
+from src.infrastructure.repositories.sharded_user_repository import ShardedUserRepository
+
+logger = logging.getLogger(__name__)
+
+
+def app_engines(app) -> List[Engine]:
+    """Engines de la aplicación: los de Flask-SQLAlchemy y los del repositorio particionado"""
+    with app.app_context():
+        engines = list(db.engines.values())
+    repository = app.extensions.get('user_repository')
+    if isinstance(repository, ShardedUserRepository):
+        engines += [*repository.shards, repository.directory]
+    return engines
+
+
+def after_fork(app) -> None:
+    """Descarta el estado heredado del proceso padre en un worker recién creado
+
+    Las conexiones de un pool no pueden compartirse entre procesos:
+    ``dispose(close=False)`` las olvida sin cerrarlas, así las del padre
+    siguen siendo válidas y el worker abre las suyas. El puente de eventos se
+    reinicia porque su hilo de escucha no sobrevive al fork.
+    """
+    for engine in app_engines(app):
+        engine.dispose(close=False)
+    event_broker.after_fork()
+
+
+def warm_pool(engine: Engine, connections: int) -> int:
+    """Abre hasta ``connections`` conexiones a la vez y las deja en el pool; retorna cuántas"""
+    if not isinstance(engine.pool, QueuePool):
+        # Con NullPool o SingletonThreadPool las conexiones no quedan disponibles para otras peticiones
+        return 0
+    opened = []
+    try:
+        for _ in range(min(connections, engine.pool.size())):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.execute(text('SELECT 1'))
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def warm_up(app) -> float:
+    """Prepara el worker antes de que acepte tráfico y retorna los segundos empleados
+
+    Abre ``WORKER_WARMUP_CONNECTIONS`` conexiones por engine, carga el filtro
+    de la lista de revocación y genera la especificación OpenAPI. Un fallo de
+    la base de datos no impide arrancar: se registra y las peticiones
+    conectarán por su cuenta.
+    """
+    started = time.perf_counter()
+    connections = app.config.get('WORKER_WARMUP_CONNECTIONS', 0)
+    try:
+        for engine in app_engines(app):
+            warm_pool(engine, connections)
+        blocklist = app.extensions.get('token_blocklist')
+        if blocklist is not None:
+            blocklist.warm_up()
+    except SQLAlchemyError:
+        logger.warning('No se pudo precalentar la conexión a la base de datos', exc_info=True)
+    docs = app.extensions.get('api_docs')
+    if docs is not None:
+        with app.app_context():
+            docs.document()
+    return time.perf_counter() - started
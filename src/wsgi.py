@@ -0,0 +1,12 @@
+"""Punto de entrada WSGI de producción
+
+    FLASK_ENV=production gunicorn -c gunicorn.conf.py src.wsgi:app
+
+La aplicación se crea al importar el módulo. Con ``preload_app`` eso ocurre
+una sola vez en el proceso maestro y los workers la heredan por fork; los
+hooks de ``gunicorn.conf.py`` llaman a ``src.worker`` para descartar las
+conexiones heredadas y precalentar cada worker.
+"""
+from src.app import create_app
+
+app = create_app()
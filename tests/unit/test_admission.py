@@ -0,0 +1,137 @@
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask
+
+from src.interfaces.rest.admission import AdaptiveLimiter, AdmissionController
+
+
+class TestAdaptiveLimiter:
+    def test_rejects_over_limit(self):
+        """Test no admite más peticiones concurrentes que el límite"""
+        limiter = AdaptiveLimiter(initial=2)
+
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is False
+
+    def test_additive_increase_on_fast_requests(self):
+        """Test las peticiones rápidas aumentan el límite gradualmente"""
+        limiter = AdaptiveLimiter(initial=4, latency_target=0.5)
+        for _ in range(4):
+            limiter.try_acquire()
+            limiter.release(0.01)
+
+        assert 4.9 < limiter.limit < 5.1
+
+    @pytest.mark.parametrize('latency, failed', [(1.0, False), (0.01, True)])
+    def test_multiplicative_decrease_on_slow_or_failed_requests(self, latency, failed):
+        """Test una petición lenta o fallida reduce el límite"""
+        limiter = AdaptiveLimiter(initial=10, latency_target=0.5, backoff=0.5)
+        limiter.try_acquire()
+        limiter.release(latency, failed=failed)
+
+        assert limiter.limit == 5
+
+    def test_slow_requests_decrease_once_per_window(self):
+        """Test una ráfaga de peticiones lentas reduce el límite una sola vez"""
+        limiter = AdaptiveLimiter(initial=10, latency_target=60, backoff=0.5)
+        for _ in range(5):
+            limiter.try_acquire()
+            limiter.release(120)
+
+        assert limiter.limit == 5
+
+    def test_route_latency_target_overrides_class_target(self):
+        """Test una ruta con plazo largo no cuenta como lenta con el objetivo de su clase"""
+        limiter = AdaptiveLimiter(initial=10, latency_target=0.5)
+        limiter.try_acquire()
+        limiter.release(3.0, latency_target=7.5)
+
+        assert limiter.limit > 10
+
+    def test_limit_stays_within_bounds(self):
+        """Test el límite no baja del mínimo ni supera el máximo"""
+        limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=2, backoff=0.1)
+        limiter.congestion()
+        assert limiter.limit == 1
+        for _ in range(10):
+            limiter.try_acquire()
+            limiter.release(0.0)
+        assert limiter.limit == 2
+
+    def test_congestion_decreases_once_per_window(self):
+        """Test una ráfaga de rechazos por saturación reduce el límite una sola vez"""
+        limiter = AdaptiveLimiter(initial=100, latency_target=60, backoff=0.5)
+        for _ in range(50):
+            limiter.congestion()
+
+        assert limiter.limit == 50
+
+
+def make_app(saturation=0.0, limits=None):
+    app = Flask(__name__)
+    app.config['ADMISSION_LIMITS'] = limits or {'read': 1, 'write': 1, 'auth': 1}
+    app.gate = threading.Event()
+    controller = AdmissionController(app, saturation=lambda: app.saturation)
+    app.saturation = saturation
+
+    @app.route('/users')
+    def list_users():
+        app.gate.wait(2)
+        return {'users': []}
+
+    @app.route('/health')
+    def health_check():
+        return {'status': 'healthy', 'shedding': controller.shedding}
+
+    return app
+
+
+class TestAdmissionController:
+    def test_admits_requests_within_limit(self):
+        """Test las peticiones dentro del límite pasan normalmente"""
+        app = make_app()
+        app.gate.set()
+
+        response = app.test_client().get('/users')
+
+        assert response.status_code == 200
+        assert app.extensions['admission_control'].limiters['read'].in_flight == 0
+
+    def test_sheds_when_class_limit_is_full(self):
+        """Test con el límite completo se responde 503 con Retry-After sin esperar"""
+        app = make_app()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            blocked = executor.submit(app.test_client().get, '/users')
+            limiter = app.extensions['admission_control'].limiters['read']
+            while limiter.in_flight == 0:
+                pass
+
+            response = app.test_client().get('/users')
+            health = app.test_client().get('/health')
+            app.gate.set()
+
+            assert blocked.result().status_code == 200
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert health.status_code == 200
+        assert health.get_json()['shedding'] is True
+
+    def test_sheds_when_pool_is_saturated(self):
+        """Test con el pool saturado se rechaza antes de esperar una conexión"""
+        app = make_app(saturation=1.0, limits={'read': 10, 'write': 10, 'auth': 10})
+
+        response = app.test_client().get('/users')
+
+        assert response.status_code == 503
+        assert app.extensions['admission_control'].limiters['read'].limit < 10
+
+    def test_health_is_exempt(self):
+        """Test /health responde aunque el servicio esté descartando carga"""
+        app = make_app(saturation=1.0)
+
+        response = app.test_client().get('/health')
+
+        assert response.status_code == 200
+        assert response.get_json()['shedding'] is False
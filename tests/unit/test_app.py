@@ -7,7 +7,9 @@ from flask_cors import CORS
 from flasgger import Swagger
 
 from src.app import create_app
+from src.config import TestingConfig
 from src.infrastructure.database.models import db
+from src.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
 
 
 @pytest.fixture
@@ -80,6 +82,11 @@ class TestApp:
         # Test Swagger initialization
         assert hasattr(app, 'swag')  # Flasgger añade el atributo 'swag' a la app
 
+    def test_user_repository_registration(self):
+        """Test the configured user repository is registered on the app"""
+        app = create_app('testing')
+        assert isinstance(app.extensions['user_repository'], SQLAlchemyUserRepository)
+
     def test_blueprint_registration(self):
         """Test API blueprint is registered"""
         app = create_app('testing')
@@ -98,11 +105,31 @@ class TestApp:
         app = create_app('testing')
         assert app.config['JWT_TOKEN_LOCATION'] == ['headers']
 
+    def test_create_app_in_memory_sqlite(self, monkeypatch):
+        """Test create_app funciona con SQLite en memoria (StaticPool no admite pool_timeout)"""
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', 'sqlite:///:memory:')
+
+        app = create_app('testing')
+
+        assert 'pool_timeout' not in app.config['SQLALCHEMY_ENGINE_OPTIONS']
+        with app.app_context():
+            db.create_all()
+            assert app.test_client().get('/api/v1/users').status_code == 401
+
+    def test_pool_timeout_applies_to_pooled_engines(self, monkeypatch, tmp_path):
+        """Test con un engine con QueuePool se configura DB_POOL_TIMEOUT"""
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'users.db'}")
+
+        app = create_app('testing')
+
+        with app.app_context():
+            assert db.engine.pool.timeout() == app.config['DB_POOL_TIMEOUT']
+
     def test_health_check_endpoint(self, client):
         """Test health check endpoint"""
         response = client.get('/health')
         assert response.status_code == 200
-        assert response.json == {'status': 'healthy'}
+        assert response.json == {'status': 'healthy', 'shedding': False}
 
     def test_database_uri_config(self):
         """Test database URI configuration"""
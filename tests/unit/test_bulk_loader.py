@@ -0,0 +1,65 @@
+import pytest
+from datetime import datetime
+from flask import Flask
+
+from src.infrastructure.database.bulk_loader import BulkUserLoader
+from src.infrastructure.database.models import UserModel, db
+
+
+@pytest.fixture
+def app():
+    """Create test Flask app"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def make_row(email, first_name="Test"):
+    return {
+        'email': email,
+        'password': 'secret',
+        'first_name': first_name,
+        'last_name': 'User',
+        'is_active': True,
+        'created_at': datetime.utcnow()
+    }
+
+
+class TestBulkUserLoader:
+    def test_load_inserts_rows(self, app):
+        """Test cargar un lote de filas nuevas"""
+        loader = BulkUserLoader(db.engine)
+
+        loaded = loader.load([make_row('a@example.com'), make_row('b@example.com')])
+
+        assert loaded == 2
+        assert UserModel.query.count() == 2
+
+    def test_load_skips_existing_emails(self, app):
+        """Test los emails duplicados se omiten por defecto"""
+        loader = BulkUserLoader(db.engine)
+        loader.load([make_row('a@example.com')])
+
+        loaded = loader.load([make_row('a@example.com', 'Other'), make_row('b@example.com')])
+
+        assert loaded == 1
+        assert UserModel.query.filter_by(email='a@example.com').one().first_name == 'Test'
+
+    def test_load_updates_existing_emails(self, app):
+        """Test fusionar filas existentes con update_existing"""
+        BulkUserLoader(db.engine).load([make_row('a@example.com')])
+
+        BulkUserLoader(db.engine, update_existing=True).load([make_row('a@example.com', 'José')])
+
+        db.session.expire_all()
+        assert UserModel.query.filter_by(email='a@example.com').one().first_name == 'José'
+
+    def test_load_empty_chunk(self, app):
+        """Test un lote vacío no abre transacción"""
+        assert BulkUserLoader(db.engine).load([]) == 0
@@ -0,0 +1,112 @@
+import gzip
+import json
+
+import pytest
+from flask import Flask, Response, jsonify, request
+
+from src.interfaces.rest.compression import ResponseCompression, available_encoders
+
+PAYLOAD = [{'id': i, 'email': f'user{i}@example.com', 'first_name': 'José'} for i in range(200)]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['COMPRESSION_MIN_SIZE'] = 500
+    ResponseCompression(app)
+
+    @app.route('/users')
+    def users():
+        return jsonify(PAYLOAD)
+
+    @app.route('/tiny')
+    def tiny():
+        return jsonify({'ok': True})
+
+    @app.route('/stream')
+    def stream():
+        def generate():
+            yield '['
+            for i, item in enumerate(PAYLOAD):
+                yield (',' if i else '') + json.dumps(item)
+            yield ']'
+        return Response(generate(), mimetype='application/json')
+
+    @app.route('/events')
+    def events():
+        return Response(iter(['data: x\n\n'] * 200), mimetype='text/event-stream')
+
+    @app.route('/versioned')
+    def versioned():
+        response = jsonify(PAYLOAD)
+        response.set_etag('3')
+        return response.make_conditional(request)
+
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+GZIP = {'Accept-Encoding': 'gzip'}
+
+
+class TestResponseCompression:
+    def test_gzip_large_body(self, client):
+        """Test un cuerpo grande se comprime con gzip y conserva el contenido"""
+        response = client.get('/users', headers=GZIP)
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert int(response.headers['Content-Length']) == len(response.data)
+        assert json.loads(gzip.decompress(response.data)) == PAYLOAD
+
+    def test_tiny_body_is_not_compressed(self, client):
+        """Test un cuerpo menor al umbral se envía sin comprimir"""
+        response = client.get('/tiny', headers=GZIP)
+
+        assert 'Content-Encoding' not in response.headers
+
+    def test_no_accept_encoding(self, client):
+        """Test sin Accept-Encoding no se comprime"""
+        response = client.get('/users')
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json() == PAYLOAD
+
+    def test_streamed_response_is_compressed_incrementally(self, client):
+        """Test una respuesta por bloques se comprime sin Content-Length"""
+        response = client.get('/stream', headers=GZIP)
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        assert json.loads(gzip.decompress(response.data)) == PAYLOAD
+
+    def test_event_stream_is_skipped(self, client):
+        """Test los Server-Sent Events no se comprimen"""
+        response = client.get('/events', headers=GZIP)
+
+        assert 'Content-Encoding' not in response.headers
+
+    def test_not_modified_is_skipped(self, client):
+        """Test un 304 no se comprime"""
+        response = client.get('/versioned', headers={**GZIP, 'If-None-Match': '"3"'})
+
+        assert response.status_code == 304
+        assert 'Content-Encoding' not in response.headers
+
+    def test_strong_etag_is_skipped(self, client):
+        """Test las respuestas con ETag fuerte se envían sin comprimir"""
+        response = client.get('/versioned', headers=GZIP)
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.headers['ETag'] == '"3"'
+
+    def test_preferred_encoding(self, client):
+        """Test se elige la mejor codificación disponible según Accept-Encoding"""
+        response = client.get('/users', headers={'Accept-Encoding': 'gzip;q=0.5, br, zstd'})
+
+        expected = next(name for name in ('br', 'zstd', 'gzip') if name in available_encoders())
+        assert response.headers['Content-Encoding'] == expected
@@ -1,11 +1,18 @@
 import pytest
 from unittest.mock import Mock, patch
-from datetime import datetime
+from datetime import datetime, timedelta
 from flask import Flask
 from flask_jwt_extended import JWTManager, create_access_token
 
 from src.core.entities.user import User
-from src.interfaces.rest.controllers import api
+from src.core.entities.user_changes import ChangeCursor, UserChanges
+from src.core.entities.user_credentials import UserCredentials
+from src.core.entities.user_event import USER_DELETED, USER_UPDATED, UserEvent
+from src.core.exceptions import ConcurrencyConflictError
+from src.infrastructure.auth.profile_claims import ProfileVersionCache, profile_claims
+from src.infrastructure.auth.refresh_tokens import InvalidRefreshTokenError
+from src.infrastructure.events.broker import event_broker
+from src.interfaces.rest.controllers import api, decode_cursor, encode_cursor
 from src.application.use_cases.user_use_cases import CreateUserDTO, UpdateUserDTO
 
 @pytest.fixture
@@ -54,7 +61,8 @@ def sample_user():
 class TestUserControllers:
     def test_create_user_success(self, client, sample_user):
         # Arrange
-        with patch('src.interfaces.rest.controllers.user_use_cases') as mock_use_cases:
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
             mock_use_cases.create_user.return_value = sample_user
             user_data = {
                 "email": "test@example.com",
@@ -93,7 +101,8 @@ class TestUserControllers:
 
     def test_get_users_success(self, client, sample_user, auth_headers):
         # Arrange
-        with patch('src.interfaces.rest.controllers.user_use_cases') as mock_use_cases:
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
             mock_use_cases.get_all_users.return_value = [sample_user]
 
             # Act
@@ -106,9 +115,87 @@ class TestUserControllers:
             assert data[0]['email'] == sample_user.email
             mock_use_cases.get_all_users.assert_called_once()
 
+    def test_get_users_paginated(self, client, sample_user, auth_headers):
+        # Arrange
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
+            mock_use_cases.list_users.return_value = [sample_user]
+
+            # Act
+            response = client.get('/users?limit=50&after_id=10', headers=auth_headers)
+
+            # Assert
+            assert response.status_code == 200
+            assert response.get_json()[0]['id'] == sample_user.id
+            mock_use_cases.list_users.assert_called_once_with(10, 50)
+            mock_use_cases.get_all_users.assert_not_called()
+
+    def test_get_user_changes_initial_sync(self, client, sample_user, auth_headers):
+        # Arrange
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
+            next_cursor = ChangeCursor(updated_at=datetime(2024, 1, 1), user_id=1, tombstone_id=3)
+            mock_use_cases.get_user_changes.return_value = UserChanges(
+                cursor=next_cursor, updated=[sample_user], deleted_ids=[7]
+            )
+
+            # Act
+            response = client.get('/users/changes', headers=auth_headers)
+            data = response.get_json()
+
+            # Assert
+            assert response.status_code == 200
+            assert data['changes'][0]['email'] == sample_user.email
+            assert data['deleted'] == [7]
+            assert data['has_more'] is False
+            assert decode_cursor(data['cursor']) == next_cursor
+            assert mock_use_cases.get_user_changes.call_args[0][0] == ChangeCursor()
+
+    def test_get_user_changes_since_cursor(self, client, auth_headers):
+        # Arrange
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
+            cursor = ChangeCursor(updated_at=datetime(2024, 1, 1, 12, 30), user_id=5, tombstone_id=2)
+            mock_use_cases.get_user_changes.return_value = UserChanges(cursor=cursor)
+
+            # Act
+            response = client.get(f'/users/changes?since={encode_cursor(cursor)}&limit=10',
+                                  headers=auth_headers)
+
+            # Assert
+            assert response.status_code == 200
+            args = mock_use_cases.get_user_changes.call_args[0]
+            assert args[0] == cursor
+            assert args[1] == 10
+
+    def test_get_user_changes_invalid_cursor(self, client, auth_headers):
+        # Act
+        response = client.get('/users/changes?since=not-a-cursor', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Cursor inválido'
+
+    def test_stream_user_events(self, client, auth_headers):
+        # Act
+        response = client.get('/users/stream', headers=auth_headers)
+        chunks = iter(response.response)
+        assert next(chunks) == b'retry: 3000\n\n'
+        event_broker.publish(UserEvent(type=USER_UPDATED, user_id=1, data={'first_name': 'José'}))
+        message = next(chunks).decode('utf-8')
+        response.close()
+
+        # Assert
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert 'event: user.updated' in message
+        assert 'José' in message
+        assert event_broker.subscriber_count == 0
+
     def test_get_user_by_id_success(self, client, sample_user, auth_headers):
         # Arrange
-        with patch('src.interfaces.rest.controllers.user_use_cases') as mock_use_cases:
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
             mock_use_cases.get_user.return_value = sample_user
 
             # Act
@@ -120,9 +207,21 @@ class TestUserControllers:
             assert data['email'] == sample_user.email
             mock_use_cases.get_user.assert_called_once_with(1)
 
+    def test_get_user_as_msgpack(self, client, sample_user, auth_headers):
+        msgpack = pytest.importorskip('msgpack')
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            get_use_cases.return_value.get_user.return_value = sample_user
+
+            response = client.get('/users/1', headers={**auth_headers, 'Accept': 'application/msgpack'})
+
+            assert response.mimetype == 'application/msgpack'
+            assert msgpack.unpackb(response.get_data())['email'] == sample_user.email
+            assert response.headers['ETag'] == '"1"'
+
     def test_get_user_not_found(self, client, auth_headers):
         # Arrange
-        with patch('src.interfaces.rest.controllers.user_use_cases') as mock_use_cases:
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
             mock_use_cases.get_user.side_effect = ValueError("Usuario no encontrado")
 
             # Act
@@ -136,7 +235,8 @@ class TestUserControllers:
 
     def test_update_user_success(self, client, sample_user, auth_headers):
         # Arrange
-        with patch('src.interfaces.rest.controllers.user_use_cases') as mock_use_cases:
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
             mock_use_cases.update_user.return_value = sample_user
             update_data = {
                 "first_name": "Updated",
@@ -150,11 +250,55 @@ class TestUserControllers:
             # Assert
             assert response.status_code == 200
             assert data['email'] == sample_user.email
+            assert response.headers['ETag'] == '"1"'
             mock_use_cases.update_user.assert_called_once()
 
+    def test_update_user_with_if_match(self, client, sample_user, auth_headers):
+        # Arrange
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
+            sample_user.version = 4
+            mock_use_cases.update_user.return_value = sample_user
+            headers = dict(auth_headers, **{'If-Match': '"3"'})
+
+            # Act
+            response = client.put('/users/1', json={"first_name": "A", "last_name": "B"}, headers=headers)
+
+            # Assert
+            assert response.status_code == 200
+            assert response.headers['ETag'] == '"4"'
+            assert mock_use_cases.update_user.call_args.args[2] == 3
+
+    def test_update_user_version_conflict(self, client, auth_headers):
+        # Arrange
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
+            mock_use_cases.update_user.side_effect = ConcurrencyConflictError("modificado")
+            headers = dict(auth_headers, **{'If-Match': '"3"'})
+
+            # Act
+            response = client.put('/users/1', json={"first_name": "A", "last_name": "B"}, headers=headers)
+
+            # Assert
+            assert response.status_code == 412
+            assert response.get_json()['error'] == 'El usuario fue modificado por otra petición'
+
+    def test_update_user_invalid_if_match(self, client, auth_headers):
+        # Arrange
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            headers = dict(auth_headers, **{'If-Match': 'W/"3"'})
+
+            # Act
+            response = client.put('/users/1', json={"first_name": "A", "last_name": "B"}, headers=headers)
+
+            # Assert
+            assert response.status_code == 412
+            get_use_cases.return_value.update_user.assert_not_called()
+
     def test_delete_user_success(self, client, auth_headers):
         # Arrange
-        with patch('src.interfaces.rest.controllers.user_use_cases') as mock_use_cases:
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            mock_use_cases = get_use_cases.return_value
             mock_use_cases.delete_user.return_value = True
 
             # Act
@@ -166,9 +310,12 @@ class TestUserControllers:
 
     def test_login_success(self, client, sample_user):
         # Arrange
-        with patch('src.interfaces.rest.controllers.user_repository') as mock_repository, \
+        with patch('src.interfaces.rest.controllers.get_unit_of_work') as get_unit_of_work, \
              patch('src.interfaces.rest.controllers.create_access_token') as mock_create_token:
-            mock_repository.get_by_email.return_value = sample_user
+            mock_repository = get_unit_of_work.return_value.users
+            mock_repository.get_credentials_by_email.return_value = UserCredentials(
+                id=sample_user.id, password=sample_user.password, is_active=True
+            )
             mock_create_token.return_value = "test-token"
             login_data = {
                 "email": "test@example.com",
@@ -183,12 +330,14 @@ class TestUserControllers:
             assert response.status_code == 200
             assert 'access_token' in data
             assert data['access_token'] == 'test-token'
-            mock_repository.get_by_email.assert_called_once_with(login_data['email'])
+            mock_repository.get_credentials_by_email.assert_called_once_with(login_data['email'])
+            mock_repository.get_by_email.assert_not_called()
 
     def test_login_invalid_credentials(self, client):
         # Arrange
-        with patch('src.interfaces.rest.controllers.user_repository') as mock_repository:
-            mock_repository.get_by_email.return_value = None
+        with patch('src.interfaces.rest.controllers.get_unit_of_work') as get_unit_of_work:
+            mock_repository = get_unit_of_work.return_value.users
+            mock_repository.get_credentials_by_email.return_value = None
             login_data = {
                 "email": "wrong@example.com",
                 "password": "wrongpass"
@@ -201,4 +350,202 @@ class TestUserControllers:
             # Assert
             assert response.status_code == 401
             assert 'error' in data
-            assert data['error'] == 'Credenciales inválidas'
\ No newline at end of file
+            assert data['error'] == 'Credenciales inválidas'
+
+    def test_login_inactive_user(self, client):
+        # Arrange
+        with patch('src.interfaces.rest.controllers.get_unit_of_work') as get_unit_of_work:
+            mock_repository = get_unit_of_work.return_value.users
+            mock_repository.get_credentials_by_email.return_value = UserCredentials(
+                id=1, password="password123", is_active=False
+            )
+
+            # Act
+            response = client.post('/auth/login', json={"email": "test@example.com", "password": "password123"})
+
+            # Assert
+            assert response.status_code == 401
+            assert response.get_json()['error'] == 'Usuario inactivo'
+
+    def test_login_with_profile_claims(self, app, client, sample_user):
+        # Arrange
+        app.config['JWT_PROFILE_CLAIMS'] = True
+        with patch('src.interfaces.rest.controllers.get_unit_of_work') as get_unit_of_work, \
+             patch('src.interfaces.rest.controllers.create_access_token') as mock_create_token:
+            mock_repository = get_unit_of_work.return_value.users
+            mock_repository.get_by_email.return_value = sample_user
+            mock_create_token.return_value = "test-token"
+
+            # Act
+            response = client.post('/auth/login', json={"email": "test@example.com", "password": "password123"})
+
+            # Assert
+            assert response.status_code == 200
+            mock_repository.get_credentials_by_email.assert_not_called()
+            mock_create_token.assert_called_once_with(identity='1', additional_claims=profile_claims(sample_user))
+
+
+    def test_logout_revokes_current_token(self, app, client, auth_headers):
+        # Arrange
+        blocklist = Mock(retention=timedelta(hours=1))
+        app.extensions['token_blocklist'] = blocklist
+
+        # Act
+        response = client.post('/auth/logout', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 204
+        jti, user_id, _ = blocklist.revoke_token.call_args.args
+        assert user_id == 1 and jti
+
+    def test_logout_without_blocklist(self, client, auth_headers):
+        response = client.post('/auth/logout', headers=auth_headers)
+
+        assert response.status_code == 501
+
+
+    def test_login_issues_refresh_token(self, app, client):
+        # Arrange
+        refresh_tokens = Mock()
+        refresh_tokens.issue.return_value = 'refresh-1'
+        app.extensions['refresh_tokens'] = refresh_tokens
+        with patch('src.interfaces.rest.controllers.get_unit_of_work') as get_unit_of_work:
+            get_unit_of_work.return_value.users.get_credentials_by_email.return_value = UserCredentials(
+                id=1, password="password123", is_active=True
+            )
+
+            # Act
+            response = client.post('/auth/login', json={"email": "test@example.com", "password": "password123"})
+
+            # Assert
+            assert response.get_json()['refresh_token'] == 'refresh-1'
+            refresh_tokens.issue.assert_called_once_with(1)
+
+    def test_refresh_rotates_token(self, app, client, sample_user):
+        # Arrange
+        refresh_tokens = Mock()
+        refresh_tokens.rotate.return_value = (1, 'refresh-2')
+        app.extensions['refresh_tokens'] = refresh_tokens
+        with patch('src.interfaces.rest.controllers.get_unit_of_work') as get_unit_of_work:
+            get_unit_of_work.return_value.users.get_by_id.return_value = sample_user
+
+            # Act
+            response = client.post('/auth/refresh', json={'refresh_token': 'refresh-1'})
+            data = response.get_json()
+
+            # Assert
+            assert response.status_code == 200
+            assert data['refresh_token'] == 'refresh-2'
+            assert data['access_token']
+            refresh_tokens.rotate.assert_called_once_with('refresh-1')
+            get_unit_of_work.return_value.users.get_by_id.assert_called_once_with(1)
+
+    @pytest.mark.parametrize('found', [None, 'inactive'])
+    def test_refresh_rejects_missing_or_inactive_user(self, app, client, sample_user, found):
+        # Arrange
+        sample_user.is_active = False
+        refresh_tokens = Mock()
+        refresh_tokens.rotate.return_value = (1, 'refresh-2')
+        app.extensions['refresh_tokens'] = refresh_tokens
+        with patch('src.interfaces.rest.controllers.get_unit_of_work') as get_unit_of_work:
+            get_unit_of_work.return_value.users.get_by_id.return_value = sample_user if found else None
+
+            # Act
+            response = client.post('/auth/refresh', json={'refresh_token': 'refresh-1'})
+
+            # Assert
+            assert response.status_code == 401
+
+    def test_refresh_with_profile_claims_reads_user(self, app, client, sample_user):
+        # Arrange
+        app.config['JWT_PROFILE_CLAIMS'] = True
+        refresh_tokens = Mock()
+        refresh_tokens.rotate.return_value = (1, 'refresh-2')
+        app.extensions['refresh_tokens'] = refresh_tokens
+        with patch('src.interfaces.rest.controllers.get_unit_of_work') as get_unit_of_work:
+            get_unit_of_work.return_value.users.get_by_id.return_value = sample_user
+
+            # Act
+            response = client.post('/auth/refresh', json={'refresh_token': 'refresh-1'})
+
+            # Assert
+            assert response.status_code == 200
+            get_unit_of_work.return_value.users.get_by_id.assert_called_once_with(1)
+
+    def test_refresh_invalid_token(self, app, client):
+        # Arrange
+        refresh_tokens = Mock()
+        refresh_tokens.rotate.side_effect = InvalidRefreshTokenError()
+        app.extensions['refresh_tokens'] = refresh_tokens
+
+        # Act
+        response = client.post('/auth/refresh', json={'refresh_token': 'robado'})
+
+        # Assert
+        assert response.status_code == 401
+
+    def test_refresh_missing_token(self, app, client):
+        app.extensions['refresh_tokens'] = Mock()
+
+        response = client.post('/auth/refresh', json={})
+
+        assert response.status_code == 400
+
+
+class TestCurrentUser:
+    @pytest.fixture
+    def claims_headers(self, app, sample_user):
+        with app.app_context():
+            access_token = create_access_token(identity="1", additional_claims=profile_claims(sample_user))
+            return {'Authorization': f'Bearer {access_token}'}
+
+    def test_served_from_claims(self, client, sample_user, claims_headers):
+        """Test /users/me responde desde los claims sin consultar el repositorio"""
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            response = client.get('/users/me', headers=claims_headers)
+
+            assert response.status_code == 200
+            assert response.get_json() == {
+                'id': 1, 'email': sample_user.email, 'first_name': 'Test', 'last_name': 'User', 'is_active': True
+            }
+            assert response.headers['ETag'] == '"1"'
+            get_use_cases.assert_not_called()
+
+    def test_token_without_claims_falls_back(self, client, sample_user, auth_headers):
+        """Test un token sin claims de perfil consulta el repositorio"""
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            get_use_cases.return_value.get_user.return_value = sample_user
+
+            response = client.get('/users/me', headers=auth_headers)
+
+            assert response.get_json()['email'] == sample_user.email
+            get_use_cases.return_value.get_user.assert_called_once_with(1)
+
+    def test_stale_claims_fall_back(self, app, client, sample_user, claims_headers):
+        """Test si un evento reporta una versión más nueva se lee el perfil actual"""
+        versions = ProfileVersionCache()
+        versions._horizon = 0
+        app.extensions['profile_versions'] = versions
+        versions.observe(UserEvent(type=USER_UPDATED, user_id=1, data={'version': 2}))
+        updated = User(id=1, email=sample_user.email, password='x', first_name='José',
+                       last_name='User', version=2)
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            get_use_cases.return_value.get_user.return_value = updated
+
+            response = client.get('/users/me', headers=claims_headers)
+
+            assert response.get_json()['first_name'] == 'José'
+            assert response.headers['ETag'] == '"2"'
+
+    def test_deleted_user_returns_404(self, app, client, claims_headers):
+        """Test un usuario eliminado tras emitir el token responde 404"""
+        versions = ProfileVersionCache()
+        versions._horizon = 0
+        app.extensions['profile_versions'] = versions
+        versions.observe(UserEvent(type=USER_DELETED, user_id=1))
+        with patch('src.interfaces.rest.controllers.get_user_use_cases') as get_use_cases:
+            get_use_cases.return_value.get_user.side_effect = ValueError('Usuario no encontrado')
+
+            response = client.get('/users/me', headers=claims_headers)
+
+            assert response.status_code == 404
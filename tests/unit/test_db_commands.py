@@ -0,0 +1,80 @@
+import pytest
+from flask import Flask
+from flask_migrate import Migrate
+
+from src.infrastructure.database.models import db
+from src.interfaces.cli.db_commands import find_redundant_indexes
+
+
+def make_index(name, keys, table='users', unique=False, primary=False, partial=False, include=()):
+    return {
+        'table_name': table,
+        'index_name': name,
+        'key_columns': keys,
+        'include_columns': list(include),
+        'is_unique': unique,
+        'is_primary': primary,
+        'is_partial': partial
+    }
+
+
+class TestFindRedundantIndexes:
+    def test_duplicate_of_unique_constraint(self):
+        """Test un índice igual a la restricción UNIQUE es redundante"""
+        indexes = [
+            make_index('users_email_key', ['2'], unique=True),
+            make_index('idx_users_email', ['2'])
+        ]
+
+        assert find_redundant_indexes(indexes) == {'idx_users_email': 'users_email_key'}
+
+    def test_covering_index_is_not_redundant_with_plain_index(self):
+        """Test un índice con columnas INCLUDE no es redundante con uno que no las tiene"""
+        indexes = [
+            make_index('users_email_key', ['2'], unique=True),
+            make_index('idx_users_email_login', ['2'], include=['3', '5'])
+        ]
+
+        assert find_redundant_indexes(indexes) == {}
+
+    def test_covering_index_redundant_when_other_covers_includes(self):
+        """Test un índice con INCLUDE es redundante si el otro ya contiene esas columnas"""
+        indexes = [
+            make_index('idx_users_email_full', ['2', '3'], include=['5']),
+            make_index('idx_users_email_login', ['2'], include=['3', '5'])
+        ]
+
+        assert find_redundant_indexes(indexes) == {'idx_users_email_login': 'idx_users_email_full'}
+
+    def test_prefix_of_composite_index(self):
+        """Test un índice prefijo de otro compuesto es redundante"""
+        indexes = [
+            make_index('idx_users_updated_at', ['9', '1']),
+            make_index('idx_users_updated', ['9'])
+        ]
+
+        assert find_redundant_indexes(indexes) == {'idx_users_updated': 'idx_users_updated_at'}
+
+    def test_partial_and_other_tables_are_ignored(self):
+        """Test índices parciales o de otras tablas no se consideran redundantes"""
+        indexes = [
+            make_index('users_pkey', ['1'], primary=True),
+            make_index('idx_users_inactive', ['1'], partial=True),
+            make_index('idx_tombstones_id', ['1'], table='user_tombstones')
+        ]
+
+        assert find_redundant_indexes(indexes) == {}
+
+
+class TestIndexReportCommand:
+    def test_requires_postgresql(self):
+        """Test el reporte falla con un mensaje claro fuera de PostgreSQL"""
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        db.init_app(app)
+        Migrate(app, db)
+
+        result = app.test_cli_runner().invoke(args=['db', 'index-report'])
+
+        assert result.exit_code != 0
+        assert 'requiere PostgreSQL' in result.output
@@ -0,0 +1,184 @@
+import time
+import pytest
+from unittest.mock import Mock
+from flask import Flask
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from src.infrastructure.database.deadlines import (
+    DeadlineExceeded, _apply_statement_timeout, _refresh_statement_timeout, install_deadline_hooks,
+    is_timeout_error, remaining_seconds, reset_deadline, set_deadline
+)
+from src.infrastructure.database.group_commit import GroupCommitTimeoutError
+from src.interfaces.rest.deadlines import RequestDeadlines
+
+# Consulta que recorre cien millones de filas: tarda varios segundos en SQLite
+SLOW_QUERY = text(
+    'WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) '
+    'SELECT count(*) FROM n'
+)
+
+
+@pytest.fixture
+def engine():
+    install_deadline_hooks()
+    engine = create_engine('sqlite://')
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def deadline():
+    """Permite fijar un plazo y lo restaura al terminar"""
+    tokens = []
+    yield lambda seconds: tokens.append(set_deadline(time.monotonic() + seconds))
+    for token in reversed(tokens):
+        reset_deadline(token)
+
+
+class TestDatabaseDeadlines:
+    def test_no_deadline_by_default(self):
+        """Test fuera de una petición no hay plazo"""
+        assert remaining_seconds() is None
+
+    def test_sqlite_query_is_interrupted(self, engine, deadline):
+        """Test una consulta SQLite se interrumpe al vencer el plazo"""
+        deadline(0.1)
+        started = time.monotonic()
+
+        with pytest.raises(OperationalError) as exc_info:
+            with engine.connect() as connection:
+                connection.execute(SLOW_QUERY)
+
+        assert time.monotonic() - started < 2
+        assert is_timeout_error(exc_info.value)
+
+    def test_expired_deadline_fails_before_querying(self, engine, deadline):
+        """Test con el plazo vencido no se inicia la transacción"""
+        deadline(-1)
+
+        with pytest.raises(DeadlineExceeded):
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+
+    def test_postgres_statement_timeout_uses_remaining_budget(self, deadline):
+        """Test en PostgreSQL el tiempo restante se aplica con SET LOCAL"""
+        connection = Mock(info={})
+        connection.dialect.name = 'postgresql'
+        deadline(2)
+
+        _apply_statement_timeout(connection)
+
+        statement = connection.exec_driver_sql.call_args.args[0]
+        assert statement.startswith('SET LOCAL statement_timeout = ')
+        assert 1900 <= int(statement.rsplit(' ', 1)[1]) <= 2000
+
+    def test_postgres_statement_timeout_shrinks_before_each_statement(self, deadline):
+        """Test una sentencia posterior recibe el tiempo que queda, no el del BEGIN"""
+        connection = Mock(info={'deadline_statement_timeout_ms': 5000})
+        connection.dialect.name = 'postgresql'
+        cursor = Mock()
+        deadline(2)
+
+        _refresh_statement_timeout(connection, cursor, 'SELECT 1', {}, None, False)
+        _refresh_statement_timeout(connection, cursor, 'SELECT 2', {}, None, False)
+
+        cursor.execute.assert_called_once()
+        statement = cursor.execute.call_args.args[0]
+        assert statement.startswith('SET LOCAL statement_timeout = ')
+        assert 1900 <= int(statement.rsplit(' ', 1)[1]) <= 2000
+
+    def test_is_timeout_error_for_postgres_query_canceled(self):
+        """Test el SQLSTATE 57014 se reconoce como timeout"""
+        error = OperationalError('SELECT 1', {}, Mock(pgcode='57014'))
+
+        assert is_timeout_error(error)
+        assert not is_timeout_error(OperationalError('SELECT 1', {}, Exception('disk I/O error')))
+
+
+@pytest.fixture
+def app(engine):
+    app = Flask(__name__)
+    app.config['REQUEST_DEADLINE_MS'] = 5000
+    app.config['ROUTE_DEADLINES_MS'] = {'slow': 100}
+    RequestDeadlines(app)
+
+    @app.route('/slow')
+    def slow():
+        with engine.connect() as connection:
+            connection.execute(SLOW_QUERY)
+        return {'ok': True}
+
+    @app.route('/budget')
+    def budget():
+        return {'remaining': remaining_seconds()}
+
+    @app.route('/pool')
+    def pool():
+        raise PoolTimeoutError('QueuePool limit reached')
+
+    @app.route('/batch')
+    def batch():
+        raise GroupCommitTimeoutError()
+
+    @app.route('/health')
+    def health_check():
+        return {'remaining': remaining_seconds()}
+
+    return app
+
+
+class TestRequestDeadlines:
+    def test_slow_query_returns_504(self, app):
+        """Test una consulta que agota el presupuesto de la ruta responde 504"""
+        started = time.monotonic()
+
+        response = app.test_client().get('/slow')
+
+        assert response.status_code == 504
+        assert time.monotonic() - started < 2
+
+    def test_default_budget_applies(self, app):
+        """Test las rutas sin presupuesto propio usan REQUEST_DEADLINE_MS"""
+        remaining = app.test_client().get('/budget').get_json()['remaining']
+
+        assert 4.5 < remaining <= 5
+
+    def test_client_deadline_shortens_budget(self, app):
+        """Test X-Request-Deadline acorta el plazo de la petición"""
+        deadline_ms = int((time.time() + 1) * 1000)
+
+        response = app.test_client().get('/budget', headers={'X-Request-Deadline': str(deadline_ms)})
+
+        assert response.get_json()['remaining'] <= 1
+
+    def test_expired_client_deadline_is_rejected(self, app):
+        """Test una petición que llega con el plazo vencido no se ejecuta"""
+        deadline_ms = int((time.time() - 1) * 1000)
+
+        response = app.test_client().get('/slow', headers={'X-Request-Deadline': str(deadline_ms)})
+
+        assert response.status_code == 504
+
+    def test_pool_timeout_returns_503(self, app):
+        """Test agotar la espera por una conexión responde 503 con Retry-After"""
+        response = app.test_client().get('/pool')
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+
+    def test_group_commit_timeout_returns_503(self, app):
+        """Test un alta cuyo lote no se escribió a tiempo responde 503"""
+        response = app.test_client().get('/batch')
+
+        assert response.status_code == 503
+
+    def test_deadline_is_cleared_after_request(self, app):
+        """Test el plazo no se filtra a lo que se ejecute después de la petición"""
+        app.test_client().get('/budget')
+
+        assert remaining_seconds() is None
+
+    def test_health_is_exempt(self, app):
+        """Test /health no tiene plazo"""
+        assert app.test_client().get('/health').get_json()['remaining'] is None
@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from flask import Flask
+
+from src.config import Config
+from src.interfaces.cli.docs_commands import docs_cli
+from src.interfaces.rest.compression import ResponseCompression
+from src.interfaces.rest.docs import ApiDocs, swag_from
+
+SPEC = {'parameters': [{'in': 'body', 'name': 'body', 'schema': {'type': 'object'}}]}
+
+
+def build_app(**config) -> Flask:
+    app = Flask(__name__)
+    app.config['SWAGGER'] = Config.SWAGGER
+    app.config.update(config)
+    ApiDocs(app)
+    app.cli.add_command(docs_cli)
+
+    @app.route('/users', methods=['POST'])
+    @swag_from(SPEC)
+    def create_user():
+        """Crear usuario"""
+        return {}, 201
+
+    return app
+
+
+class TestApiDocs:
+    def test_swag_from_sets_specs_dict(self):
+        """Test swag_from deja la especificación donde flasgger la busca"""
+        @swag_from(SPEC)
+        def view():
+            pass
+
+        assert view.specs_dict is SPEC
+
+    def test_spec_is_generated_once(self, monkeypatch):
+        """Test la especificación se genera en la primera petición y luego se sirve desde memoria"""
+        app = build_app()
+        calls = []
+        original = app.swag.get_apispecs
+        monkeypatch.setattr(app.swag, 'get_apispecs', lambda endpoint: calls.append(endpoint) or original(endpoint))
+        client = app.test_client()
+
+        first = client.get('/apispec_1.json')
+        second = client.get('/apispec_1.json')
+
+        assert first.status_code == second.status_code == 200
+        assert '/users' in first.get_json()['paths']
+        assert first.data == second.data
+        assert calls == ['apispec_1']
+
+    def test_spec_etag_returns_304(self):
+        """Test un cliente con el ETag vigente recibe 304 sin cuerpo"""
+        client = build_app().test_client()
+        etag = client.get('/apispec_1.json').headers['ETag']
+
+        response = client.get('/apispec_1.json', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_spec_is_compressed(self):
+        """Test la especificación, con ETag débil, se comprime y sigue respondiendo 304"""
+        app = build_app(COMPRESSION_MIN_SIZE=0)
+        ResponseCompression(app)
+        client = app.test_client()
+
+        response = client.get('/apispec_1.json', headers={'Accept-Encoding': 'gzip'})
+        revalidated = client.get(
+            '/apispec_1.json', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']}
+        )
+
+        assert response.headers['ETag'].startswith('W/')
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert revalidated.status_code == 304
+
+    def test_disabled_registers_no_routes(self):
+        """Test con SWAGGER_ENABLED desactivado no hay rutas de documentación"""
+        app = build_app(SWAGGER_ENABLED=False)
+        client = app.test_client()
+
+        assert client.get('/docs/').status_code == 404
+        assert client.get('/apispec_1.json').status_code == 404
+        assert 'api_docs' not in app.extensions
+
+    def test_prebuilt_spec_is_served(self, tmp_path, monkeypatch):
+        """Test con SWAGGER_SPEC_PATH se sirve el archivo exportado sin generar la especificación"""
+        path = tmp_path / 'openapi.json'
+        result = build_app().test_cli_runner().invoke(args=['docs', 'export', str(path)])
+        assert result.exit_code == 0, result.output
+
+        app = build_app(SWAGGER_SPEC_PATH=str(path))
+        monkeypatch.setattr(app.swag, 'get_apispecs', lambda endpoint: pytest.fail('no debe generarse'))
+        response = app.test_client().get('/apispec_1.json')
+
+        assert response.data == path.read_bytes()
+        assert '/users' in json.loads(path.read_bytes())['paths']
+
+    def test_corrupt_prebuilt_spec_fails_at_startup(self, tmp_path):
+        """Test un archivo de especificación inválido impide arrancar"""
+        path = tmp_path / 'openapi.json'
+        path.write_text('{"paths":')
+
+        with pytest.raises(ValueError):
+            build_app(SWAGGER_SPEC_PATH=str(path))
+
+    def test_export_requires_docs(self, tmp_path):
+        """Test exportar con la documentación deshabilitada falla con un mensaje claro"""
+        result = build_app(SWAGGER_ENABLED=False).test_cli_runner().invoke(
+            args=['docs', 'export', str(tmp_path / 'openapi.json')]
+        )
+
+        assert result.exit_code != 0
+        assert 'SWAGGER_ENABLED' in result.output
+
+    def test_flasgger_is_not_imported_without_docs(self, tmp_path):
+        """Test la aplicación sin documentación no importa flasgger"""
+        code = (
+            "import sys; from src.app import create_app; "
+            "from src.config import DevelopmentConfig; DevelopmentConfig.SWAGGER_ENABLED = False; "
+            "create_app('development'); print('flasgger' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                env=dict(os.environ, DATABASE_URL=f'sqlite:///{tmp_path}/users.db'))
+
+        assert result.stdout.strip() == 'False', result.stderr
@@ -0,0 +1,69 @@
+import pytest
+
+from src.core.entities.user_event import USER_CREATED, UserEvent
+from src.infrastructure.events.broker import InProcessEventBroker
+
+
+@pytest.fixture
+def broker():
+    return InProcessEventBroker(queue_size=2)
+
+
+class TestInProcessEventBroker:
+    def test_publish_fans_out_to_subscribers(self, broker):
+        """Test todos los suscriptores reciben el evento"""
+        first, second = broker.subscribe(), broker.subscribe()
+        event = UserEvent(type=USER_CREATED, user_id=1)
+
+        broker.publish(event)
+
+        assert first.get(timeout=0)[1] == event
+        assert second.get(timeout=0)[1] == event
+
+    def test_sequence_is_monotonic(self, broker):
+        """Test cada evento recibe un número de secuencia creciente"""
+        subscription = broker.subscribe()
+        broker.publish(UserEvent(type=USER_CREATED, user_id=1))
+        broker.publish(UserEvent(type=USER_CREATED, user_id=2))
+
+        first, second = subscription.get(timeout=0), subscription.get(timeout=0)
+
+        assert first[0] < second[0]
+
+    def test_slow_consumer_is_dropped(self, broker):
+        """Test un suscriptor con la cola llena se desconecta sin bloquear"""
+        slow, fast = broker.subscribe(), broker.subscribe()
+        for user_id in range(3):
+            broker.publish(UserEvent(type=USER_CREATED, user_id=user_id))
+            fast.get(timeout=0)
+
+        assert slow.dropped is True
+        assert fast.dropped is False
+        assert broker.subscriber_count == 1
+
+    def test_close_unsubscribes(self, broker):
+        """Test cerrar la suscripción deja de recibir eventos"""
+        subscription = broker.subscribe()
+
+        subscription.close()
+        broker.publish(UserEvent(type=USER_CREATED, user_id=1))
+
+        assert broker.subscriber_count == 0
+        assert subscription.get(timeout=0) is None
+
+    def test_listener_receives_events(self, broker):
+        """Test los listeners reciben cada evento al despacharlo, hasta eliminarlos"""
+        received = []
+        broker.add_listener(received.append)
+        broker.publish(UserEvent(type=USER_CREATED, user_id=1))
+
+        broker.remove_listener(received.append)
+        broker.publish(UserEvent(type=USER_CREATED, user_id=2))
+
+        assert [event.user_id for event in received] == [1]
+
+    def test_event_round_trip(self):
+        """Test serializar y reconstruir un evento"""
+        event = UserEvent(type=USER_CREATED, user_id=1, data={'first_name': 'José'})
+
+        assert UserEvent.from_dict(event.to_dict()) == event
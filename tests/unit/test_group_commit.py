@@ -0,0 +1,189 @@
+import pytest
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import Mock
+from sqlalchemy import create_engine, func, select
+
+from src.core.entities.user import User
+from src.infrastructure.database.group_commit import GroupCommitBatcher, GroupCommitTimeoutError, users_table
+from src.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Base SQLite en archivo para compartirla entre hilos"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    users_table.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def make_values(email):
+    return {
+        'email': email,
+        'password': 'secret',
+        'first_name': 'Test',
+        'last_name': 'User',
+        'is_active': True,
+        'created_at': datetime.utcnow(),
+        'updated_at': datetime.utcnow()
+    }
+
+
+def count_users(engine):
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(users_table)).scalar()
+
+
+class TestGroupCommitBatcher:
+    def test_flush_resolves_each_future_with_its_id(self, engine):
+        """Test un lote se escribe junto y cada fila recibe su propio ID"""
+        batcher = GroupCommitBatcher(engine)
+        batch = [(make_values(f'user{i}@example.com'), Future()) for i in range(3)]
+
+        batcher.flush(batch)
+
+        ids = [future.result() for _, future in batch]
+        assert len(set(ids)) == 3
+        with engine.connect() as connection:
+            emails = dict(connection.execute(select(users_table.c.id, users_table.c.email)).all())
+        assert [emails[user_id] for user_id in ids] == [values['email'] for values, _ in batch]
+
+    def test_flush_reports_conflicts_per_row(self, engine):
+        """Test un email duplicado solo hace fallar a su propia fila"""
+        batcher = GroupCommitBatcher(engine)
+        batcher.flush([(make_values('taken@example.com'), Future())])
+        batch = [
+            (make_values('taken@example.com'), Future()),
+            (make_values('new@example.com'), Future()),
+            (make_values('new@example.com'), Future())
+        ]
+
+        batcher.flush(batch)
+
+        with pytest.raises(ValueError, match='taken@example.com'):
+            batch[0][1].result()
+        assert batch[1][1].result() > 0
+        with pytest.raises(ValueError, match='new@example.com'):
+            batch[2][1].result()
+        assert count_users(engine) == 2
+
+    def test_flush_propagates_database_errors(self, engine):
+        """Test un fallo de la transacción se entrega a todos los llamadores"""
+        batcher = GroupCommitBatcher(engine)
+        users_table.drop(engine)
+        batch = [(make_values('a@example.com'), Future()), (make_values('b@example.com'), Future())]
+
+        batcher.flush(batch)
+
+        for _, future in batch:
+            assert future.exception() is not None
+
+    def test_flush_retries_rows_when_one_is_invalid(self, engine):
+        """Test una fila inválida no hace fallar a las demás del lote"""
+        batcher = GroupCommitBatcher(engine)
+        invalid = dict(make_values('invalid@example.com'), first_name=None)
+        batch = [(make_values('a@example.com'), Future()), (invalid, Future()), (make_values('b@example.com'), Future())]
+
+        batcher.flush(batch)
+
+        assert batch[0][1].result() > 0
+        assert batch[1][1].exception() is not None
+        assert batch[2][1].result() > 0
+        assert count_users(engine) == 2
+
+    def test_flush_skips_cancelled_rows(self, engine):
+        """Test una fila cuyo llamador dejó de esperar no se inserta"""
+        batcher = GroupCommitBatcher(engine)
+        cancelled, kept = Future(), Future()
+        cancelled.cancel()
+
+        batcher.flush([(make_values('gone@example.com'), cancelled), (make_values('kept@example.com'), kept)])
+
+        assert kept.result() > 0
+        assert count_users(engine) == 1
+
+    def test_submit_batches_concurrent_inserts(self, engine):
+        """Test las altas concurrentes se agrupan en menos transacciones"""
+        batcher = GroupCommitBatcher(engine, max_batch_size=50, max_delay=0.05)
+        flushes = []
+        original_flush = batcher.flush
+        batcher.flush = lambda batch: (flushes.append(len(batch)), original_flush(batch))
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            ids = list(executor.map(
+                lambda i: batcher.submit(make_values(f'user{i}@example.com')).result(timeout=5),
+                range(20)
+            ))
+
+        assert len(set(ids)) == 20
+        assert sum(flushes) == 20
+        assert len(flushes) < 20
+        assert count_users(engine) == 20
+
+    def test_rejects_unsupported_dialect(self):
+        """Test el group commit requiere ON CONFLICT ... RETURNING"""
+        engine = Mock()
+        engine.dialect.name = 'mysql'
+
+        with pytest.raises(ValueError):
+            GroupCommitBatcher(engine)
+
+
+class TestSQLAlchemyUserRepositoryGroupCommit:
+    def test_save_goes_through_batcher(self, engine):
+        """Test save delega el alta en el batcher y retorna el ID asignado"""
+        repository = SQLAlchemyUserRepository(session=object(), group_commit=GroupCommitBatcher(engine))
+        user = User(
+            id=None,
+            email='batched@example.com',
+            password='secret',
+            first_name='Test',
+            last_name='User',
+            is_active=True,
+            created_at=datetime.utcnow()
+        )
+
+        saved = repository.save(user)
+
+        assert saved.id is not None
+        assert saved.email == 'batched@example.com'
+        assert saved.updated_at is not None
+        assert count_users(engine) == 1
+
+    def test_save_duplicate_raises_value_error(self, engine):
+        """Test un email repetido se reporta como ValueError igual que sin batcher"""
+        repository = SQLAlchemyUserRepository(session=object(), group_commit=GroupCommitBatcher(engine))
+        user = User(
+            id=None,
+            email='dup@example.com',
+            password='secret',
+            first_name='Test',
+            last_name='User',
+            is_active=True,
+            created_at=datetime.utcnow()
+        )
+        repository.save(user)
+
+        with pytest.raises(ValueError):
+            repository.save(user)
+
+    def test_save_timeout_cancels_pending_row(self):
+        """Test si el lote no llega a tiempo la fila se cancela y se reporta el timeout"""
+        future = Future()
+        batcher = Mock()
+        batcher.submit.return_value = future
+        repository = SQLAlchemyUserRepository(session=object(), group_commit=batcher, group_commit_timeout=0.01)
+        user = User(
+            id=None,
+            email='slow@example.com',
+            password='secret',
+            first_name='Test',
+            last_name='User',
+            is_active=True,
+            created_at=datetime.utcnow()
+        )
+
+        with pytest.raises(GroupCommitTimeoutError):
+            repository.save(user)
+        assert future.cancelled()
@@ -0,0 +1,186 @@
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from flask import Flask, jsonify, request
+from sqlalchemy import create_engine
+
+from src.infrastructure.database.models import IdempotencyKeyModel
+from src.infrastructure.idempotency.database_store import DatabaseIdempotencyStore
+from src.infrastructure.idempotency.store import (
+    IdempotencyKeyInUseError, IdempotencyKeyMismatchError, InMemoryIdempotencyStore, StoredResponse,
+    build_idempotency_store
+)
+from src.interfaces.rest.idempotency import idempotent
+
+RESPONSE = StoredResponse(status_code=201, body=b'{"id": 1}', content_type='application/json')
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Base SQLite en archivo para compartirla entre hilos"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'keys.db'}")
+    IdempotencyKeyModel.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(params=['memory', 'database'])
+def store(request, engine):
+    """Ambas implementaciones deben cumplir el mismo contrato"""
+    if request.param == 'memory':
+        return InMemoryIdempotencyStore(wait_timeout=0.5)
+    return DatabaseIdempotencyStore(engine, wait_timeout=0.5, poll_interval=0.01)
+
+
+class TestIdempotencyStore:
+    def test_first_claim_executes_and_retries_replay(self, store):
+        """Test la primera reserva ejecuta y los reintentos reciben la respuesta guardada"""
+        assert store.claim('key', 'abc') is None
+        store.complete('key', RESPONSE)
+
+        assert store.claim('key', 'abc') == RESPONSE
+
+    def test_different_body_is_rejected(self, store):
+        """Test reutilizar la clave con otro cuerpo es un error"""
+        store.claim('key', 'abc')
+        store.complete('key', RESPONSE)
+
+        with pytest.raises(IdempotencyKeyMismatchError):
+            store.claim('key', 'other')
+
+    def test_release_lets_a_retry_execute(self, store):
+        """Test liberar la clave permite volver a ejecutar la petición"""
+        store.claim('key', 'abc')
+        store.release('key')
+
+        assert store.claim('key', 'abc') is None
+
+    def test_duplicate_times_out_while_in_flight(self, store):
+        """Test un duplicado no espera indefinidamente a la petición original"""
+        store.claim('key', 'abc')
+
+        with pytest.raises(IdempotencyKeyInUseError):
+            store.claim('key', 'abc')
+
+    def test_concurrent_duplicates_wait_for_result(self, store):
+        """Test los duplicados concurrentes reciben el resultado en curso"""
+        store.claim('key', 'abc')
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(store.claim, 'key', 'abc') for _ in range(3)]
+            store.complete('key', RESPONSE)
+
+            assert [future.result() for future in futures] == [RESPONSE] * 3
+
+
+class TestInMemoryIdempotencyStore:
+    def test_evicts_least_recently_used(self):
+        """Test el almacén está acotado a max_entries respuestas"""
+        store = InMemoryIdempotencyStore(max_entries=2)
+        for key in ('a', 'b', 'c'):
+            store.claim(key, 'abc')
+            store.complete(key, RESPONSE)
+
+        assert store.claim('a', 'abc') is None
+        assert store.claim('c', 'abc') == RESPONSE
+
+    def test_entries_expire_after_ttl(self):
+        """Test las respuestas vencen tras el TTL"""
+        store = InMemoryIdempotencyStore(ttl=0)
+        store.claim('key', 'abc')
+        store.complete('key', RESPONSE)
+
+        assert store.claim('key', 'abc') is None
+
+
+class TestBuildIdempotencyStore:
+    def test_build_from_config(self):
+        """Test IDEMPOTENCY_STORE selecciona la implementación"""
+        app = Flask(__name__)
+        assert isinstance(build_idempotency_store(app), InMemoryIdempotencyStore)
+        app.config['IDEMPOTENCY_STORE'] = 'none'
+        assert build_idempotency_store(app) is None
+        app.config['IDEMPOTENCY_STORE'] = 'redis'
+        with pytest.raises(ValueError):
+            build_idempotency_store(app)
+
+
+@pytest.fixture
+def app():
+    """Aplicación con una vista idempotente que cuenta sus ejecuciones"""
+    app = Flask(__name__)
+    app.extensions['idempotency_store'] = InMemoryIdempotencyStore(wait_timeout=2)
+    app.calls = 0
+    app.release = threading.Event()
+    app.release.set()
+
+    @app.route('/things', methods=['POST'])
+    @idempotent
+    def create_thing():
+        app.calls += 1
+        app.release.wait(2)
+        if request.get_json().get('fail'):
+            return jsonify({'error': 'boom'}), 500
+        return jsonify({'id': app.calls}), 201
+
+    return app
+
+
+class TestIdempotentDecorator:
+    @pytest.fixture(autouse=True)
+    def no_unit_of_work(self):
+        with patch('src.interfaces.rest.transactions.finish_unit_of_work'):
+            yield
+
+    def test_without_key_executes_every_time(self, app):
+        """Test sin Idempotency-Key la vista se ejecuta siempre"""
+        client = app.test_client()
+        client.post('/things', json={})
+        client.post('/things', json={})
+
+        assert app.calls == 2
+
+    def test_retry_replays_first_response(self, app):
+        """Test un reintento repite estado y cuerpo sin volver a ejecutar"""
+        client = app.test_client()
+        headers = {'Idempotency-Key': 'k1'}
+
+        first = client.post('/things', json={}, headers=headers)
+        second = client.post('/things', json={}, headers=headers)
+
+        assert app.calls == 1
+        assert second.status_code == 201
+        assert second.get_json() == first.get_json()
+        assert second.headers['Idempotent-Replayed'] == 'true'
+
+    def test_reused_key_with_other_body_is_422(self, app):
+        """Test la misma clave con otro cuerpo responde 422"""
+        client = app.test_client()
+        client.post('/things', json={'a': 1}, headers={'Idempotency-Key': 'k1'})
+
+        response = client.post('/things', json={'a': 2}, headers={'Idempotency-Key': 'k1'})
+
+        assert response.status_code == 422
+
+    def test_server_errors_are_not_cached(self, app):
+        """Test un 5xx libera la clave para reintentar"""
+        client = app.test_client()
+        client.post('/things', json={'fail': True}, headers={'Idempotency-Key': 'k1'})
+        client.post('/things', json={'fail': True}, headers={'Idempotency-Key': 'k1'})
+
+        assert app.calls == 2
+
+    def test_concurrent_duplicates_execute_once(self, app):
+        """Test los duplicados concurrentes esperan el resultado de la primera petición"""
+        app.release.clear()
+
+        def post(_):
+            return app.test_client().post('/things', json={}, headers={'Idempotency-Key': 'k1'})
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(post, index) for index in range(4)]
+            app.release.set()
+            responses = [future.result() for future in futures]
+
+        assert app.calls == 1
+        assert {response.status_code for response in responses} == {201}
@@ -0,0 +1,162 @@
+import threading
+import pytest
+from datetime import datetime
+from flask import Flask
+
+from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor
+from src.core.exceptions import ConcurrencyConflictError
+from src.infrastructure.repositories.factory import build_user_repository, get_user_repository
+from src.infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from src.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+
+
+@pytest.fixture
+def repository():
+    """Repositorio en memoria vacío"""
+    return InMemoryUserRepository()
+
+
+def make_user(email="test@example.com", first_name="Test"):
+    return User(email=email, password="hashed_password", first_name=first_name, last_name="User")
+
+
+class TestInMemoryUserRepository:
+    def test_save_assigns_sequential_ids(self, repository):
+        """Test guardar usuarios asigna IDs crecientes"""
+        first = repository.save(make_user("a@example.com"))
+        second = repository.save(make_user("b@example.com"))
+
+        assert (first.id, second.id) == (1, 2)
+        assert repository.get_by_id(2).email == "b@example.com"
+
+    def test_save_duplicate_email(self, repository):
+        """Test el índice de email rechaza duplicados"""
+        repository.save(make_user())
+
+        with pytest.raises(ValueError):
+            repository.save(make_user())
+
+    def test_get_by_email_and_exists(self, repository):
+        """Test búsquedas por email"""
+        saved = repository.save(make_user())
+
+        assert repository.get_by_email("test@example.com").id == saved.id
+        assert repository.exists_by_email("test@example.com") is True
+        assert repository.get_by_email("missing@example.com") is None
+        assert repository.get_credentials_by_email("test@example.com").id == saved.id
+
+    def test_returned_entities_are_copies(self, repository):
+        """Test modificar una entidad devuelta no altera el repositorio"""
+        saved = repository.save(make_user())
+        saved.first_name = "Changed"
+
+        assert repository.get_by_id(saved.id).first_name == "Test"
+
+    def test_update_and_reindex_email(self, repository):
+        """Test actualizar reindexa el email"""
+        saved = repository.save(make_user())
+        saved.email = "new@example.com"
+
+        result = repository.update(saved)
+
+        assert result.email == "new@example.com"
+        assert repository.exists_by_email("test@example.com") is False
+        assert repository.update(make_user("ghost@example.com")) is None
+
+    def test_update_bumps_version_and_detects_conflicts(self, repository):
+        """Test cada actualización incrementa la versión y una copia obsoleta falla"""
+        saved = repository.save(make_user())
+        stale = repository.get_by_id(saved.id)
+
+        updated = repository.update(saved)
+
+        assert updated.version == 2
+        with pytest.raises(ConcurrencyConflictError):
+            repository.update(stale)
+
+    def test_delete(self, repository):
+        """Test eliminar libera el email y el ID"""
+        saved = repository.save(make_user())
+
+        assert repository.delete(saved.id) is True
+        assert repository.delete(saved.id) is False
+        assert repository.get_all() == []
+        assert repository.exists_by_email("test@example.com") is False
+
+    def test_get_page(self, repository):
+        """Test paginación por keyset sobre el índice ordenado"""
+        for index in range(5):
+            repository.save(make_user(f"user{index}@example.com"))
+
+        first_page = repository.get_page(None, 2)
+        second_page = repository.get_page(first_page[-1].id, 2)
+
+        assert [user.id for user in first_page] == [1, 2]
+        assert [user.id for user in second_page] == [3, 4]
+        assert repository.get_page(5, 2) == []
+
+    def test_get_changes(self, repository):
+        """Test el flujo de cambios incluye altas, cambios y bajas"""
+        first = repository.save(make_user("a@example.com"))
+        second = repository.save(make_user("b@example.com"))
+        cursor = repository.get_changes(ChangeCursor(), 10, datetime.utcnow()).cursor
+
+        repository.update(first)
+        repository.delete(second.id)
+        changes = repository.get_changes(cursor, 10, datetime.utcnow())
+
+        assert [user.id for user in changes.updated] == [first.id]
+        assert changes.deleted_ids == [second.id]
+
+    def test_concurrent_saves(self, repository):
+        """Test inserciones concurrentes no pierden usuarios ni repiten IDs"""
+        def worker(offset):
+            for index in range(100):
+                repository.save(make_user(f"user{offset}-{index}@example.com"))
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({user.id for user in repository.get_all()}) == 400
+
+    def test_snapshot_round_trip(self, tmp_path):
+        """Test guardar y recargar un snapshot JSON"""
+        path = str(tmp_path / "users.json")
+        repository = InMemoryUserRepository(snapshot_path=path)
+        repository.save(make_user("a@example.com", first_name="José"))
+        deleted = repository.save(make_user("b@example.com"))
+        repository.delete(deleted.id)
+
+        repository.snapshot()
+        restored = InMemoryUserRepository(snapshot_path=path)
+
+        assert restored.get_by_email("a@example.com").first_name == "José"
+        assert restored.save(make_user("c@example.com")).id == 3
+
+
+class TestUserRepositoryFactory:
+    def test_build_sqlalchemy_repository(self):
+        """Test el repositorio por defecto es SQLAlchemy"""
+        assert isinstance(build_user_repository({}), SQLAlchemyUserRepository)
+
+    def test_build_memory_repository(self):
+        """Test seleccionar el repositorio en memoria desde la configuración"""
+        assert isinstance(build_user_repository({'USER_REPOSITORY': 'memory'}), InMemoryUserRepository)
+
+    def test_build_unknown_repository(self):
+        """Test un backend desconocido es un error de configuración"""
+        with pytest.raises(ValueError):
+            build_user_repository({'USER_REPOSITORY': 'redis'})
+
+    def test_get_user_repository_from_app(self):
+        """Test resolver el repositorio registrado en la aplicación"""
+        app = Flask(__name__)
+        repository = InMemoryUserRepository()
+        app.extensions['user_repository'] = repository
+
+        with app.app_context():
+            assert get_user_repository() is repository
@@ -0,0 +1,118 @@
+import tracemalloc
+import pytest
+from flask import Flask
+
+from src.infrastructure.diagnostics.memory import MemoryDiagnostics, memory_diagnostics
+from src.interfaces.rest.admin import admin_api
+
+HEADERS = {'X-Admin-Token': 'secret'}
+
+
+@pytest.fixture
+def diagnostics():
+    diagnostics = MemoryDiagnostics()
+    yield diagnostics
+    diagnostics.stop()
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config['ADMIN_TOKEN'] = 'secret'
+    app.register_blueprint(admin_api, url_prefix='/admin')
+    yield app.test_client()
+    memory_diagnostics.stop()
+
+
+class TestMemoryDiagnostics:
+    def test_snapshot_diff_requires_tracing(self, diagnostics):
+        """Test sin tracemalloc activo no se pueden tomar instantáneas"""
+        with pytest.raises(RuntimeError):
+            diagnostics.snapshot_diff()
+
+    def test_invalid_group_by(self, diagnostics):
+        """Test group_by desconocido lanza ValueError"""
+        diagnostics.start()
+
+        with pytest.raises(ValueError):
+            diagnostics.snapshot_diff(group_by='module')
+
+    def test_diff_shows_retained_allocation(self, diagnostics):
+        """Test la diferencia entre instantáneas apunta a la línea que retiene memoria"""
+        diagnostics.start()
+        diagnostics.snapshot_diff(limit=0)
+
+        retained = [bytearray(1024) for _ in range(1000)]  # noqa: F841
+        stats = diagnostics.snapshot_diff(limit=5)
+
+        assert stats[0]['size_diff'] >= 1000 * 1024
+        assert stats[0]['location'].startswith(__file__)
+
+    def test_report_without_tracing(self, diagnostics):
+        """Test el reporte incluye GC, objetos vivos y sesiones aunque no se trace"""
+        report = diagnostics.report()
+
+        assert len(report['gc']['counts']) == 3
+        assert set(report['live_objects']) == {'User', 'UserModel'}
+        assert report['tracemalloc'] == {'tracing': False}
+
+    def test_stop_disables_tracing(self, diagnostics):
+        """Test stop desactiva tracemalloc"""
+        diagnostics.start()
+        diagnostics.stop()
+
+        assert not tracemalloc.is_tracing()
+
+
+class TestAdminMemoryEndpoints:
+    def test_not_found_without_admin_token(self):
+        """Test sin ADMIN_TOKEN configurado los endpoints no existen"""
+        app = Flask(__name__)
+        app.register_blueprint(admin_api, url_prefix='/admin')
+
+        response = app.test_client().get('/admin/memory', headers=HEADERS)
+
+        assert response.status_code == 404
+
+    def test_wrong_token_is_rejected(self, client):
+        """Test un token incorrecto responde 401"""
+        response = client.get('/admin/memory', headers={'X-Admin-Token': 'otro'})
+
+        assert response.status_code == 401
+
+    def test_memory_report(self, client):
+        """Test GET /admin/memory retorna el reporte"""
+        response = client.get('/admin/memory', headers=HEADERS)
+
+        assert response.status_code == 200
+        assert 'gc' in response.get_json()
+
+    def test_snapshot_without_tracing_conflicts(self, client):
+        """Test pedir una instantánea sin tracemalloc activo responde 409"""
+        response = client.post('/admin/memory/snapshots', headers=HEADERS)
+
+        assert response.status_code == 409
+
+    def test_tracemalloc_lifecycle(self, client):
+        """Test activar, tomar instantáneas y desactivar tracemalloc"""
+        assert client.post('/admin/memory/tracemalloc?frames=5', headers=HEADERS).get_json() == {
+            'tracing': True, 'frames': 5
+        }
+
+        first = client.post('/admin/memory/snapshots?limit=3', headers=HEADERS)
+        second = client.post('/admin/memory/snapshots?group_by=filename', headers=HEADERS)
+        invalid = client.post('/admin/memory/snapshots?group_by=module', headers=HEADERS)
+        stopped = client.delete('/admin/memory/tracemalloc', headers=HEADERS)
+
+        assert first.status_code == 200
+        assert len(first.get_json()['stats']) <= 3
+        assert second.get_json()['group_by'] == 'filename'
+        assert invalid.status_code == 400
+        assert stopped.get_json() == {'tracing': False}
+        assert not tracemalloc.is_tracing()
+
+    def test_invalid_frames(self, client):
+        """Test frames fuera de rango responde 400"""
+        response = client.post('/admin/memory/tracemalloc?frames=0', headers=HEADERS)
+
+        assert response.status_code == 400
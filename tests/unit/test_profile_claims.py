@@ -0,0 +1,73 @@
+import time
+
+from src.core.entities.user import User
+from src.core.entities.user_event import USER_DELETED, USER_UPDATED, UserEvent
+from src.infrastructure.auth.profile_claims import ProfileVersionCache, profile_claims, profile_from_claims
+
+
+def updated(user_id, version):
+    return UserEvent(type=USER_UPDATED, user_id=user_id, data={'version': version})
+
+
+class TestProfileClaims:
+    def test_round_trip(self):
+        """Test los claims reconstruyen el perfil público del usuario"""
+        user = User(id=7, email='ana@example.com', password='secret', first_name='Ana',
+                    last_name='Pérez', version=3)
+
+        profile = profile_from_claims(7, profile_claims(user))
+
+        assert profile == {'id': 7, 'email': 'ana@example.com', 'first_name': 'Ana',
+                           'last_name': 'Pérez', 'is_active': True, 'version': 3}
+
+    def test_missing_claims(self):
+        """Test un token sin todos los claims no produce perfil"""
+        assert profile_from_claims(7, {'sub': '7', 'email': 'ana@example.com'}) is None
+
+
+class TestProfileVersionCache:
+    def test_unknown_user_after_start_is_current(self):
+        """Test un usuario sin cambios desde el arranque conserva sus claims"""
+        cache = ProfileVersionCache()
+
+        assert cache.is_current(1, 1, time.time() + 1)
+
+    def test_tokens_older_than_process_are_stale(self):
+        """Test los tokens emitidos antes del arranque no se consideran vigentes"""
+        cache = ProfileVersionCache()
+
+        assert not cache.is_current(1, 1, time.time() - 60)
+
+    def test_newer_version_invalidates_claims(self):
+        """Test un evento con versión posterior invalida los claims anteriores"""
+        cache = ProfileVersionCache()
+        cache.observe(updated(1, 2))
+
+        assert not cache.is_current(1, 1, time.time())
+        assert cache.is_current(1, 2, time.time())
+
+    def test_versions_never_go_back(self):
+        """Test un evento atrasado no revierte la versión conocida"""
+        cache = ProfileVersionCache()
+        cache.observe(updated(1, 3))
+        cache.observe(updated(1, 2))
+
+        assert not cache.is_current(1, 2, time.time())
+
+    def test_deleted_user_is_stale(self):
+        """Test tras eliminar un usuario ninguna versión es vigente"""
+        cache = ProfileVersionCache()
+        cache.observe(UserEvent(type=USER_DELETED, user_id=1, data={'version': 1}))
+
+        assert not cache.is_current(1, 100, time.time())
+
+    def test_eviction_advances_horizon(self):
+        """Test al expulsar una entrada los tokens previos pasan a ser desactualizados"""
+        cache = ProfileVersionCache(max_entries=1)
+        issued_at = time.time()
+        time.sleep(0.01)
+        cache.observe(updated(1, 2))
+        cache.observe(updated(2, 2))
+
+        assert not cache.is_current(1, 1, issued_at)
+        assert cache.is_current(3, 1, time.time())
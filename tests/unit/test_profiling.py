@@ -0,0 +1,84 @@
+import os
+import pstats
+import pytest
+from flask import Flask
+
+from src.interfaces.rest.profiling import RequestProfiler, rotate_profiles
+
+
+def make_app(tmp_path, **config):
+    app = Flask(__name__)
+    app.config.update({
+        'PROFILING_ENABLED': True,
+        'PROFILING_DIR': str(tmp_path),
+        'ADMIN_TOKEN': 'secret'
+    }, **config)
+    RequestProfiler(app)
+
+    @app.route('/users')
+    def list_users():
+        return {'total': sum(range(1000))}
+
+    return app
+
+
+def profiles(tmp_path):
+    return sorted(name for name in os.listdir(tmp_path) if name.endswith('.prof'))
+
+
+class TestRequestProfiler:
+    def test_disabled_by_default(self, tmp_path):
+        """Test sin PROFILING_ENABLED no se registra ningún hook"""
+        app = make_app(tmp_path, PROFILING_ENABLED=False)
+
+        response = app.test_client().get('/users', headers={'X-Profile': 'secret'})
+
+        assert 'request_profiler' not in app.extensions
+        assert 'X-Profile-Id' not in response.headers
+        assert profiles(tmp_path) == []
+
+    def test_authorized_header_writes_pstats(self, tmp_path):
+        """Test X-Profile con el token genera un archivo pstats legible"""
+        app = make_app(tmp_path)
+
+        response = app.test_client().get('/users', headers={'X-Profile': 'secret'})
+
+        files = profiles(tmp_path)
+        assert len(files) == 1
+        assert response.headers['X-Profile-Id'] + '.prof' == files[0]
+        assert 'list_users' in files[0]
+        stats = pstats.Stats(os.path.join(tmp_path, files[0]))
+        assert stats.total_calls > 0
+
+    def test_wrong_token_is_ignored(self, tmp_path):
+        """Test un token incorrecto no activa el perfilado"""
+        app = make_app(tmp_path)
+
+        app.test_client().get('/users', headers={'X-Profile': 'wrong'})
+
+        assert profiles(tmp_path) == []
+
+    def test_sampling(self, tmp_path):
+        """Test con muestreo total todas las peticiones se perfilan"""
+        app = make_app(tmp_path, PROFILING_SAMPLE_RATE=1.0)
+
+        app.test_client().get('/users')
+
+        assert len(profiles(tmp_path)) == 1
+
+
+class TestRotateProfiles:
+    def test_keeps_newest_files_within_limits(self, tmp_path):
+        """Test se borran los perfiles más antiguos al superar los límites"""
+        for index in range(5):
+            path = tmp_path / f'{index}.prof'
+            path.write_bytes(b'x' * 10)
+            os.utime(path, (index, index))
+        (tmp_path / 'notes.txt').write_text('no se toca')
+
+        rotate_profiles(str(tmp_path), max_files=3, max_bytes=1000)
+        assert profiles(tmp_path) == ['2.prof', '3.prof', '4.prof']
+
+        rotate_profiles(str(tmp_path), max_files=10, max_bytes=15)
+        assert profiles(tmp_path) == ['4.prof']
+        assert (tmp_path / 'notes.txt').exists()
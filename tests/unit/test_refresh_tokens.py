@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from src.core.entities.user_event import USER_DEACTIVATED, UserEvent
+from src.infrastructure.auth.refresh_tokens import (
+    InvalidRefreshTokenError, RefreshTokenReuseError, RefreshTokenStore, refresh_table
+)
+from src.infrastructure.database.models import RefreshTokenModel
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'refresh.db'}")
+    RefreshTokenModel.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def store(engine):
+    return RefreshTokenStore(engine, secret='test-secret', reuse_grace=timedelta(0))
+
+
+class TestRefreshTokenStore:
+    def test_only_hash_is_stored(self, engine, store):
+        """Test la tabla guarda el HMAC del token, nunca el token"""
+        token = store.issue(1)
+
+        with engine.connect() as connection:
+            stored = connection.execute(select(refresh_table.c.token_hash)).scalar_one()
+        assert stored != token
+        assert len(stored) == 64
+
+    def test_rotate_returns_user_and_new_token(self, store):
+        """Test rotar entrega un token nuevo y el anterior deja de valer"""
+        token = store.issue(1)
+
+        user_id, new_token = store.rotate(token)
+
+        assert user_id == 1
+        assert new_token != token
+        assert store.rotate(new_token)[0] == 1
+
+    def test_reuse_revokes_family(self, store):
+        """Test presentar un token ya rotado revoca toda la familia"""
+        stolen = store.issue(1)
+        _, current = store.rotate(stolen)
+        other_session = store.issue(1)
+
+        with pytest.raises(RefreshTokenReuseError):
+            store.rotate(stolen)
+        with pytest.raises(InvalidRefreshTokenError):
+            store.rotate(current)
+        assert store.rotate(other_session)[0] == 1
+
+    def test_retry_within_grace_keeps_family(self, engine):
+        """Test reintentar dentro del margen entrega otro token y anula el sucesor perdido"""
+        store = RefreshTokenStore(engine, secret='test-secret', reuse_grace=timedelta(seconds=30))
+        token = store.issue(1)
+        _, lost = store.rotate(token)
+
+        user_id, retried = store.rotate(token)
+
+        assert user_id == 1
+        with pytest.raises(InvalidRefreshTokenError):
+            store.rotate(lost)
+        assert store.rotate(retried)[0] == 1
+
+    def test_unknown_token(self, store):
+        """Test un token desconocido es inválido"""
+        with pytest.raises(InvalidRefreshTokenError):
+            store.rotate('no-existe')
+
+    def test_expired_token(self, engine):
+        """Test un token vencido es inválido"""
+        store = RefreshTokenStore(engine, secret='test-secret', lifetime=timedelta(seconds=-1))
+        token = store.issue(1)
+
+        with pytest.raises(InvalidRefreshTokenError):
+            store.rotate(token)
+
+    def test_revoke_family(self, store):
+        """Test cerrar sesión revoca el token y sus sucesores"""
+        token = store.issue(1)
+        _, current = store.rotate(token)
+
+        store.revoke(current)
+
+        with pytest.raises(InvalidRefreshTokenError):
+            store.rotate(current)
+
+    def test_deactivation_revokes_user_tokens(self, store):
+        """Test desactivar al usuario revoca sus refresh tokens"""
+        token = store.issue(1)
+
+        store.observe(UserEvent(type=USER_DEACTIVATED, user_id=1))
+
+        with pytest.raises(InvalidRefreshTokenError):
+            store.rotate(token)
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from flask import Flask
+
+from src.core.entities.user import User
+from src.interfaces.rest.serializers import get_request_data, render, render_list, serialize_user
+
+msgpack = pytest.importorskip('msgpack')
+
+
+def make_users(count):
+    return [
+        User(id=i, email=f'user{i}@example.com', password='x', first_name='José', last_name='Pérez')
+        for i in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SERIALIZER_CHUNK_SIZE'] = 3
+    app.json.ensure_ascii = False
+
+    @app.route('/users')
+    def users():
+        return render_list(make_users(int(app.config['COUNT'])), serialize_user)
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return render(get_request_data(), 201)
+
+    return app
+
+
+@pytest.mark.parametrize('count', [2, 7])
+class TestRenderList:
+    def test_json_by_default(self, app, count):
+        """Test sin Accept se responde JSON, en bloques o no según el tamaño"""
+        app.config['COUNT'] = count
+
+        response = app.test_client().get('/users')
+
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == [serialize_user(user) for user in make_users(count)]
+        assert 'José' in response.get_data(as_text=True)
+
+    def test_msgpack_when_accepted(self, app, count):
+        """Test Accept: application/msgpack responde MessagePack con el mismo contenido"""
+        app.config['COUNT'] = count
+
+        response = app.test_client().get('/users', headers={'Accept': 'application/msgpack'})
+
+        assert response.mimetype == 'application/msgpack'
+        assert 'Accept' in response.headers['Vary']
+        assert msgpack.unpackb(response.get_data()) == [serialize_user(user) for user in make_users(count)]
+
+
+class TestNegotiation:
+    def test_large_list_is_streamed(self, app):
+        """Test una lista mayor que el bloque se emite por partes"""
+        app.config['COUNT'] = 7
+
+        response = app.test_client().get('/users')
+
+        assert response.is_streamed
+        assert 'Content-Length' not in response.headers
+
+    def test_json_preferred_on_wildcard(self, app):
+        """Test con Accept: */* se mantiene JSON"""
+        app.config['COUNT'] = 1
+
+        response = app.test_client().get('/users', headers={'Accept': '*/*'})
+
+        assert response.mimetype == 'application/json'
+
+    def test_msgpack_request_body(self, app):
+        """Test un cuerpo MessagePack se decodifica igual que uno JSON"""
+        body = {'first_name': 'José', 'last_name': 'Pérez'}
+
+        response = app.test_client().post('/echo', data=msgpack.packb(body),
+                                          content_type='application/msgpack')
+
+        assert response.status_code == 201
+        assert response.get_json() == body
+
+    def test_invalid_msgpack_body(self, app):
+        """Test un cuerpo MessagePack corrupto responde 400"""
+        response = app.test_client().post('/echo', data=b'\xc1', content_type='application/msgpack')
+
+        assert response.status_code == 400
+
+    def test_json_body_unchanged(self, app):
+        """Test los cuerpos JSON siguen funcionando"""
+        response = app.test_client().post('/echo', data=json.dumps({'a': 1}), content_type='application/json')
+
+        assert response.get_json() == {'a': 1}
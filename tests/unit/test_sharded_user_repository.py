@@ -0,0 +1,104 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+
+from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor
+from src.infrastructure.repositories.sharded_user_repository import (
+    ShardedUserRepository, decode_user_id, encode_user_id
+)
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Repositorio con tres shards SQLite y una base de directorio"""
+    shards = [create_engine(f"sqlite:///{tmp_path / f'shard_{index}.db'}") for index in range(3)]
+    directory = create_engine(f"sqlite:///{tmp_path / 'directory.db'}")
+    repository = ShardedUserRepository(shards, directory)
+    repository.create_schema()
+    return repository
+
+
+def make_user(index):
+    return User(email=f"user{index}@example.com", password="x", first_name="Test", last_name="User")
+
+
+class TestShardedUserRepository:
+    def test_id_encoding_round_trip(self):
+        """Test el ID global codifica el shard y el ID local"""
+        assert decode_user_id(encode_user_id(2, 41)) == (2, 41)
+
+    def test_save_routes_by_email_hash(self, repository):
+        """Test el usuario se guarda en el shard que indica su email"""
+        user = repository.save(make_user(1))
+
+        shard, _ = decode_user_id(user.id)
+        assert shard == repository.shard_for_email(user.email)
+        assert repository.get_by_id(user.id).email == user.email
+
+    def test_users_spread_across_shards(self, repository):
+        """Test el hash reparte los usuarios entre los shards"""
+        users = [repository.save(make_user(index)) for index in range(30)]
+
+        assert {decode_user_id(user.id)[0] for user in users} == {0, 1, 2}
+
+    def test_email_uniqueness_is_global(self, repository):
+        """Test el directorio impide emails duplicados entre shards"""
+        repository.save(make_user(1))
+
+        with pytest.raises(ValueError):
+            repository.save(make_user(1))
+        assert repository.exists_by_email("user1@example.com") is True
+
+    def test_get_by_email_uses_directory(self, repository):
+        """Test buscar por email a través del directorio global"""
+        saved = repository.save(make_user(7))
+
+        assert repository.get_by_email("user7@example.com").id == saved.id
+        assert repository.get_credentials_by_email("user7@example.com").id == saved.id
+        assert repository.get_by_email("missing@example.com") is None
+
+    def test_get_all_merges_shards_in_id_order(self, repository):
+        """Test get_all combina los shards ordenado por ID global"""
+        saved = [repository.save(make_user(index)) for index in range(12)]
+
+        ids = [user.id for user in repository.get_all()]
+
+        assert ids == sorted(user.id for user in saved)
+
+    def test_get_page_scatter_gather(self, repository):
+        """Test paginar recorre todos los shards sin repetir ni saltar usuarios"""
+        saved = sorted(repository.save(make_user(index)).id for index in range(10))
+
+        seen, after_id = [], None
+        while True:
+            page = repository.get_page(after_id, 3)
+            if not page:
+                break
+            seen.extend(user.id for user in page)
+            after_id = page[-1].id
+
+        assert seen == saved
+
+    def test_update_and_delete(self, repository):
+        """Test actualizar y eliminar en el shard correcto"""
+        saved = repository.save(make_user(1))
+        saved.first_name = "José"
+
+        assert repository.update(saved).first_name == "José"
+        assert repository.delete(saved.id) is True
+        assert repository.get_by_id(saved.id) is None
+        assert repository.exists_by_email(saved.email) is False
+
+    def test_get_changes_across_shards(self, repository):
+        """Test el flujo de cambios combina shards y tombstones globales"""
+        saved = [repository.save(make_user(index)) for index in range(6)]
+        first = repository.get_changes(ChangeCursor(), 4, datetime.utcnow())
+        rest = repository.get_changes(first.cursor, 4, datetime.utcnow())
+
+        repository.delete(saved[0].id)
+        deletes = repository.get_changes(rest.cursor, 4, datetime.utcnow())
+
+        assert first.has_more is True
+        assert len(first.updated) + len(rest.updated) == 6
+        assert deletes.deleted_ids == [saved[0].id]
@@ -2,8 +2,13 @@ import pytest
 from datetime import datetime
 from unittest.mock import Mock, patch
 from flask import Flask
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.orm import Session
 
 from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor
+from src.core.exceptions import ConcurrencyConflictError
 from src.infrastructure.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
 from src.infrastructure.database.models import UserModel, db
 @pytest.fixture
@@ -138,6 +143,28 @@ class TestSQLAlchemyUserRepository:
             updated_user = repository.get_by_id(saved_user.id)
             assert updated_user.first_name == "Updated"
 
+    def test_update_bumps_version(self, repository, sample_user, app):
+        """Test cada actualización incrementa la versión de la fila"""
+        with app.app_context():
+            saved_user = repository.save(sample_user)
+
+            result = repository.update(saved_user)
+
+            assert saved_user.version == 1
+            assert result.version == 2
+            assert repository.get_by_id(saved_user.id).version == 2
+
+    def test_update_stale_version_raises_conflict(self, repository, sample_user, app):
+        """Test una actualización con una versión obsoleta no sobrescribe cambios ajenos"""
+        with app.app_context():
+            saved_user = repository.save(sample_user)
+            repository.update(saved_user)
+            saved_user.first_name = "Stale"
+
+            with pytest.raises(ConcurrencyConflictError):
+                repository.update(saved_user)
+            assert repository.get_by_id(saved_user.id).first_name == sample_user.first_name
+
     def test_update_non_existing_user(self, repository, sample_user, app):
         """Test actualizar usuario no existente"""
         with app.app_context():
@@ -170,4 +197,133 @@ class TestSQLAlchemyUserRepository:
             result = repository.delete(999)
             
             # Verificar
-            assert result is False
\ No newline at end of file
+            assert result is False
+
+
+class TestSQLAlchemyUserRepositoryCredentials:
+    def test_get_credentials_by_email(self, repository, sample_user, app):
+        """Test obtener solo las columnas necesarias para el login"""
+        with app.app_context():
+            saved_user = repository.save(sample_user)
+
+            # Ejecutar
+            credentials = repository.get_credentials_by_email(sample_user.email)
+
+            # Verificar
+            assert credentials.id == saved_user.id
+            assert credentials.password == sample_user.password
+            assert credentials.is_active is True
+            assert repository.get_credentials_by_email("missing@example.com") is None
+
+
+class TestSQLAlchemyUserRepositoryPagination:
+    def test_get_page(self, repository, app):
+        """Test paginación por keyset ordenada por ID"""
+        with app.app_context():
+            for index in range(3):
+                repository.save(User(email=f"user{index}@example.com", password="x",
+                                     first_name="Test", last_name="User"))
+
+            # Ejecutar
+            first_page = repository.get_page(None, 2)
+            second_page = repository.get_page(first_page[-1].id, 2)
+
+            # Verificar
+            assert len(first_page) == 2
+            assert [user.id for user in second_page] == [first_page[-1].id + 1]
+
+
+class TestSQLAlchemyUserRepositoryChanges:
+    def test_get_changes_from_start(self, repository, sample_user, app):
+        """Test obtener cambios sin cursor devuelve todos los usuarios"""
+        with app.app_context():
+            saved_user = repository.save(sample_user)
+
+            # Ejecutar
+            changes = repository.get_changes(ChangeCursor(), 10, datetime.utcnow())
+
+            # Verificar
+            assert [user.id for user in changes.updated] == [saved_user.id]
+            assert changes.deleted_ids == []
+            assert changes.cursor.user_id == saved_user.id
+            assert changes.has_more is False
+
+    def test_get_changes_since_cursor(self, repository, sample_user, app):
+        """Test el cursor solo devuelve cambios posteriores"""
+        with app.app_context():
+            saved_user = repository.save(sample_user)
+            first = repository.get_changes(ChangeCursor(), 10, datetime.utcnow())
+
+            saved_user.first_name = "Updated"
+            repository.update(saved_user)
+
+            # Ejecutar
+            changes = repository.get_changes(first.cursor, 10, datetime.utcnow())
+            empty = repository.get_changes(changes.cursor, 10, datetime.utcnow())
+
+            # Verificar
+            assert [user.first_name for user in changes.updated] == ["Updated"]
+            assert empty.updated == []
+
+    def test_get_changes_reports_deletes(self, repository, sample_user, app):
+        """Test las eliminaciones aparecen como tombstones"""
+        with app.app_context():
+            saved_user = repository.save(sample_user)
+            cursor = repository.get_changes(ChangeCursor(), 10, datetime.utcnow()).cursor
+            repository.delete(saved_user.id)
+
+            # Ejecutar
+            changes = repository.get_changes(cursor, 10, datetime.utcnow())
+
+            # Verificar
+            assert changes.updated == []
+            assert changes.deleted_ids == [saved_user.id]
+            assert changes.cursor.tombstone_id > cursor.tombstone_id
+
+    def test_get_changes_paginates(self, repository, app):
+        """Test has_more cuando hay más cambios que el límite"""
+        with app.app_context():
+            for index in range(3):
+                repository.save(User(email=f"user{index}@example.com", password="x",
+                                     first_name="Test", last_name="User"))
+
+            # Ejecutar
+            page = repository.get_changes(ChangeCursor(), 2, datetime.utcnow())
+            rest = repository.get_changes(page.cursor, 2, datetime.utcnow())
+
+            # Verificar
+            assert len(page.updated) == 2 and page.has_more is True
+            assert len(rest.updated) == 1 and rest.has_more is False
+
+
+class TestSQLAlchemyUserRepositoryStatements:
+    def test_repeated_lookups_hit_compiled_cache(self, repository, sample_user, app):
+        """Test las búsquedas repetidas reutilizan el SQL compilado del engine"""
+        with app.app_context():
+            repository.save(sample_user)
+            cache_hits = []
+            event.listen(db.engine, 'after_cursor_execute',
+                         lambda conn, cursor, statement, params, context, many:
+                         cache_hits.append(context.cache_hit is CACHE_HIT))
+
+            for method in ('get_by_email', 'get_credentials_by_email', 'exists_by_email'):
+                getattr(repository, method)(sample_user.email)
+                getattr(repository, method)('otro@example.com')
+
+            assert cache_hits[1::2] == [True, True, True]
+
+    def test_uses_its_own_session(self, db_session, sample_user, app, tmp_path):
+        """Test las consultas van por la sesión del repositorio, no por db.session"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'other.db'}")
+        db.metadata.create_all(engine)
+        with app.app_context(), Session(engine) as session:
+            repository = SQLAlchemyUserRepository(session)
+
+            saved_user = repository.save(sample_user)
+
+            assert repository.get_by_id(saved_user.id).email == sample_user.email
+            assert repository.get_by_email(sample_user.email).id == saved_user.id
+            assert repository.exists_by_email(sample_user.email) is True
+            assert [user.id for user in repository.get_page(None, 10)] == [saved_user.id]
+            assert db.session.get(UserModel, saved_user.id) is None
+        engine.dispose()
@@ -0,0 +1,32 @@
+from src.infrastructure.database.synthetic_users import ascii_slug, generate_users
+
+
+class TestSyntheticUsers:
+    def test_generation_is_deterministic(self):
+        """Test la misma semilla produce las mismas filas"""
+        first = [row['email'] for row in generate_users(100, seed=7)]
+        second = [row['email'] for row in generate_users(100, seed=7)]
+
+        assert first == second
+        assert first != [row['email'] for row in generate_users(100, seed=8)]
+
+    def test_split_runs_match_single_run(self):
+        """Test generar por tramos con start produce las mismas filas que una sola ejecución"""
+        single = [row['email'] for row in generate_users(100, seed=7)]
+        split = [row['email'] for row in generate_users(50, seed=7)]
+        split += [row['email'] for row in generate_users(50, seed=7, start=50)]
+
+        assert split == single
+
+    def test_emails_are_unique_and_ascii(self):
+        """Test los emails son únicos y ASCII aunque los nombres sean UTF-8"""
+        rows = list(generate_users(1000))
+
+        assert len({row['email'] for row in rows}) == 1000
+        assert all(row['email'].isascii() for row in rows)
+
+    def test_ascii_slug(self):
+        """Test normalizar nombres con acentos y caracteres especiales"""
+        assert ascii_slug('Núñez') == 'nunez'
+        assert ascii_slug('Øvergaard') == 'overgaard'
+        assert ascii_slug('Łukasz') == 'lukasz'
@@ -0,0 +1,188 @@
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token, decode_token, jwt_required
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.exc import OperationalError
+
+from src.core.entities.user_event import USER_DEACTIVATED, USER_UPDATED, UserEvent
+from src.infrastructure.auth.bloom_filter import BloomFilter
+from src.infrastructure.auth.token_blocklist import ALL_TOKENS, TokenBlocklist, blocklist_table
+from src.infrastructure.database.models import TokenBlocklistModel
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'blocklist.db'}")
+    TokenBlocklistModel.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def blocklist(engine):
+    return TokenBlocklist(engine, refresh_interval=60)
+
+
+@pytest.fixture
+def statements(engine):
+    """Registra las consultas ejecutadas sobre el engine"""
+    executed = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: executed.append(args[2]))
+    return executed
+
+
+def payload(jti='token-1', user_id=1, issued_at=None):
+    return {'jti': jti, 'sub': str(user_id), 'iat': int(issued_at or time.time())}
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        """Test todo elemento agregado se reporta como presente"""
+        bloom = BloomFilter(1000, 0.01)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate(self):
+        """Test la tasa de falsos positivos se mantiene cerca de la configurada"""
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+
+        false_positives = sum(f'otro-{i}' in bloom for i in range(10000))
+
+        assert false_positives < 300
+
+    def test_saturation(self):
+        """Test superar la capacidad marca el filtro como saturado"""
+        bloom = BloomFilter(2)
+        for item in 'abc':
+            bloom.add(item)
+
+        assert bloom.saturated
+
+
+class TestTokenBlocklist:
+    def test_unrevoked_token_needs_no_query(self, blocklist, statements):
+        """Test con el filtro cargado, un token no revocado se acepta sin consultas"""
+        blocklist.is_revoked(payload())
+        statements.clear()
+
+        assert blocklist.is_revoked(payload('token-2', user_id=2)) is False
+        assert statements == []
+
+    def test_revoked_token(self, blocklist):
+        """Test un jti revocado se rechaza y los demás tokens del usuario no"""
+        blocklist.is_revoked(payload())
+        blocklist.revoke_token('token-1', 1, datetime.utcnow() + timedelta(hours=1))
+
+        assert blocklist.is_revoked(payload('token-1')) is True
+        assert blocklist.is_revoked(payload('token-2')) is False
+
+    def test_revoke_user_only_affects_older_tokens(self, blocklist):
+        """Test revocar un usuario invalida sus tokens emitidos antes, no los posteriores"""
+        revoked_at = datetime.utcnow()
+        blocklist.revoke_user(1, revoked_at)
+
+        assert blocklist.is_revoked(payload('old', issued_at=revoked_at.timestamp() - 60)) is True
+        assert blocklist.is_revoked(payload('new', issued_at=time.time() + 60)) is False
+
+    def test_verdict_is_cached(self, blocklist, statements):
+        """Test el resultado de un positivo del filtro queda en el LRU"""
+        blocklist.revoke_token('token-1', 1, datetime.utcnow() + timedelta(hours=1))
+        blocklist.is_revoked(payload('token-1'))
+        statements.clear()
+
+        assert blocklist.is_revoked(payload('token-1')) is True
+        assert statements == []
+
+    def test_incremental_refresh_sees_other_workers(self, engine, blocklist):
+        """Test las revocaciones de otro proceso se incorporan en el siguiente refresco"""
+        blocklist.is_revoked(payload())
+        with engine.begin() as connection:
+            connection.execute(insert(blocklist_table).values(
+                user_id=1, jti='token-1', revoked_at=datetime.utcnow(),
+                expires_at=datetime.utcnow() + timedelta(hours=1)
+            ))
+
+        assert blocklist.is_revoked(payload('token-1')) is False
+        blocklist._next_refresh = 0
+        assert blocklist.is_revoked(payload('token-1')) is True
+
+    def test_refresh_keeps_verdicts_for_known_revocations(self, blocklist, statements):
+        """Test releer revocaciones ya conocidas (margen del refresco) no vacía el LRU"""
+        blocklist.revoke_user(2)
+        blocklist.is_revoked(payload('token-2', user_id=2, issued_at=time.time() - 60))
+        blocklist.refresh()
+        statements.clear()
+
+        assert blocklist.is_revoked(payload('token-2', user_id=2, issued_at=time.time() - 60)) is True
+        assert statements == []
+
+    def test_rebuild_purges_expired(self, engine, blocklist):
+        """Test reconstruir el filtro borra las revocaciones vencidas"""
+        blocklist.revoke_token('token-1', 1, datetime.utcnow() - timedelta(seconds=1))
+
+        blocklist.rebuild()
+
+        with engine.connect() as connection:
+            assert connection.execute(blocklist_table.select()).all() == []
+
+    def test_deactivation_event_revokes_user(self, engine, blocklist):
+        """Test desactivar un usuario revoca sus tokens, una sola vez aunque el evento se repita"""
+        event_ = UserEvent(type=USER_DEACTIVATED, user_id=1)
+
+        blocklist.observe(event_)
+        blocklist.observe(event_)
+        blocklist.observe(UserEvent(type=USER_UPDATED, user_id=2))
+
+        with engine.connect() as connection:
+            rows = connection.execute(blocklist_table.select()).all()
+        assert [(row.user_id, row.jti) for row in rows] == [(1, ALL_TOKENS)]
+
+    def test_refresh_failure_keeps_previous_filter(self, blocklist):
+        """Test si la base falla al refrescar se sigue usando el filtro anterior"""
+        blocklist.is_revoked(payload())
+        blocklist._next_refresh = 0
+
+        with patch.object(blocklist.engine, 'connect', side_effect=OperationalError('SELECT', {}, Exception())):
+            assert blocklist.is_revoked(payload('token-2')) is False
+
+
+@pytest.fixture
+def app(blocklist):
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    jwt = JWTManager(app)
+    app.extensions['token_blocklist'] = blocklist
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(_jwt_header, jwt_payload):
+        return blocklist.is_revoked(jwt_payload)
+
+    @app.route('/protected')
+    @jwt_required()
+    def protected():
+        return {'ok': True}
+
+    return app
+
+
+class TestTokenInBlocklistLoader:
+    def test_revoked_token_is_rejected(self, app, blocklist):
+        """Test flask_jwt_extended rechaza los tokens revocados con 401"""
+        with app.app_context():
+            token = create_access_token(identity='1')
+            jti = decode_token(token)['jti']
+        headers = {'Authorization': f'Bearer {token}'}
+        client = app.test_client()
+
+        assert client.get('/protected', headers=headers).status_code == 200
+        blocklist.revoke_token(jti, 1, datetime.utcnow() + timedelta(hours=1))
+        assert client.get('/protected', headers=headers).status_code == 401
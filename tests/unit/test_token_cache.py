@@ -0,0 +1,125 @@
+import pytest
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from flask import Flask
+from flask_jwt_extended import create_access_token, decode_token, get_jwt, jwt_required
+from flask_jwt_extended.jwt_manager import JWTManager
+
+from src.infrastructure.auth.token_cache import CachingJWTManager, VerifiedTokenCache
+
+
+def make_app(cache_size=16, revoked=()):
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['JWT_VERIFIED_TOKEN_CACHE_SIZE'] = cache_size
+    jwt = CachingJWTManager(app)
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(_jwt_header, jwt_payload):
+        return jwt_payload['jti'] in revoked
+
+    @app.route('/protected')
+    @jwt_required()
+    def protected():
+        return {'sub': get_jwt()['sub']}
+
+    return app
+
+
+def bearer(app, **kwargs):
+    with app.app_context():
+        return {'Authorization': f"Bearer {create_access_token(identity='1', **kwargs)}"}
+
+
+class TestVerifiedTokenCache:
+    def test_expired_entry_is_dropped(self):
+        """Test una entrada no se sirve una vez alcanzado el exp del token"""
+        cache = VerifiedTokenCache()
+        cache.put(b'key', {'sub': '1', 'exp': time.time() - 1})
+
+        assert cache.get(b'key') is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test al superar el tamaño se descarta el token menos usado"""
+        cache = VerifiedTokenCache(max_entries=2)
+        cache.put(b'a', {'sub': '1'})
+        cache.put(b'b', {'sub': '2'})
+        cache.get(b'a')
+        cache.put(b'c', {'sub': '3'})
+
+        assert cache.get(b'b') is None
+        assert cache.get(b'a') == {'sub': '1'}
+
+    def test_returns_copies(self):
+        """Test modificar los claims devueltos no altera la caché"""
+        cache = VerifiedTokenCache()
+        cache.put(b'key', {'sub': '1'})
+
+        cache.get(b'key')['sub'] = '2'
+
+        assert cache.get(b'key') == {'sub': '1'}
+
+
+class TestCachingJWTManager:
+    def test_signature_verified_once(self):
+        """Test un token reutilizado se verifica solo en la primera petición"""
+        app = make_app()
+        headers = bearer(app)
+        client = app.test_client()
+
+        with patch.object(JWTManager, '_decode_jwt_from_config',
+                          autospec=True, side_effect=JWTManager._decode_jwt_from_config) as decode:
+            responses = [client.get('/protected', headers=headers) for _ in range(3)]
+
+        assert [response.status_code for response in responses] == [200, 200, 200]
+        assert decode.call_count == 1
+
+    def test_disabled_by_default(self):
+        """Test sin JWT_VERIFIED_TOKEN_CACHE_SIZE no hay caché"""
+        app = make_app(cache_size=0)
+
+        assert app.extensions['flask-jwt-extended'].token_cache is None
+        assert app.test_client().get('/protected', headers=bearer(app)).status_code == 200
+
+    def test_revoked_token_rejected_even_if_cached(self):
+        """Test la revocación se consulta aunque los claims estén en caché"""
+        revoked = set()
+        app = make_app(revoked=revoked)
+        headers = bearer(app)
+        client = app.test_client()
+        client.get('/protected', headers=headers)
+
+        with app.app_context():
+            revoked.add(decode_token(headers['Authorization'].split()[1])['jti'])
+
+        assert client.get('/protected', headers=headers).status_code == 401
+
+    def test_expired_token_rejected_even_if_cached(self):
+        """Test un token en caché que vence se rechaza con el error habitual"""
+        app = make_app()
+        headers = bearer(app, expires_delta=timedelta(seconds=1))
+        client = app.test_client()
+        assert client.get('/protected', headers=headers).status_code == 200
+
+        time.sleep(1.1)
+
+        assert client.get('/protected', headers=headers).status_code == 401
+
+    def test_invalid_token_not_cached(self):
+        """Test un token con firma inválida no entra en la caché"""
+        app = make_app()
+        response = app.test_client().get('/protected', headers={'Authorization': 'Bearer a.b.c'})
+
+        assert response.status_code == 422
+        assert len(app.extensions['flask-jwt-extended'].token_cache) == 0
+
+    def test_missing_decode_hook_fails_at_startup(self):
+        """Test si flask_jwt_extended deja de usar el método sobrescrito la app no arranca"""
+        with patch('src.infrastructure.auth.token_cache.DECODE_HOOK', '_renamed_decode'):
+            with pytest.raises(RuntimeError):
+                make_app()
+            # Sin caché no se depende del método privado
+            make_app(cache_size=0)
@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import Mock, patch
+from flask import Flask, jsonify
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.core.exceptions import ConcurrencyConflictError
+from src.interfaces.rest.transactions import transactional
+
+
+@pytest.fixture
+def app():
+    """Aplicación con una vista transaccional que responde el estado pedido"""
+    app = Flask(__name__)
+    app.testing = True
+
+    @app.route('/things/<int:status>', methods=['POST'])
+    @transactional
+    def create_thing(status):
+        return jsonify({'ok': status < 400}), status
+
+    return app
+
+
+@pytest.fixture
+def finish():
+    with patch('src.interfaces.rest.transactions.finish_unit_of_work') as finish_unit_of_work:
+        yield finish_unit_of_work
+
+
+class TestTransactional:
+    def test_commits_before_responding(self, app, finish):
+        """Test una respuesta exitosa se envía después de confirmar"""
+        response = app.test_client().post('/things/201')
+
+        assert response.status_code == 201
+        finish.assert_called_once_with(commit=True)
+
+    def test_rolls_back_error_responses(self, app, finish):
+        """Test una respuesta de error revierte la transacción"""
+        response = app.test_client().post('/things/404')
+
+        assert response.status_code == 404
+        finish.assert_called_once_with(commit=False)
+
+    @pytest.mark.parametrize('error', [
+        IntegrityError('INSERT', {}, Exception('UNIQUE constraint failed')),
+        ConcurrencyConflictError()
+    ])
+    def test_conflicting_commit_returns_409(self, app, finish, error):
+        """Test un commit rechazado por otra escritura responde 409 en lugar del 2xx"""
+        finish.side_effect = error
+
+        response = app.test_client().post('/things/201')
+
+        assert response.status_code == 409
+
+    def test_unavailable_database_returns_503(self, app, finish):
+        """Test un commit que falla por la base de datos responde 503 con Retry-After"""
+        finish.side_effect = OperationalError('COMMIT', {}, Exception('server closed the connection'))
+
+        response = app.test_client().post('/things/201')
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+
+    def test_timeout_is_left_to_deadline_handler(self, app, finish):
+        """Test un commit cancelado por el plazo no se convierte en 503"""
+        finish.side_effect = OperationalError('COMMIT', {}, Mock(pgcode='57014'))
+
+        with pytest.raises(OperationalError):
+            app.test_client().post('/things/201')
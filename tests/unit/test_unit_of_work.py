@@ -0,0 +1,151 @@
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from flask import Flask, g
+
+from src.application.unit_of_work import AutocommitUnitOfWork
+from src.core.entities.user import User
+from src.core.entities.user_event import USER_CREATED, UserEvent
+from src.infrastructure.database.models import UserModel, db
+from src.infrastructure.repositories.factory import finish_unit_of_work, get_unit_of_work
+from src.infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from src.infrastructure.repositories.sqlalchemy_unit_of_work import SQLAlchemyUnitOfWork
+
+
+@pytest.fixture
+def app():
+    """Create test Flask app"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def make_user(email):
+    return User(
+        id=None,
+        email=email,
+        password='secret',
+        first_name='Test',
+        last_name='User',
+        is_active=True,
+        created_at=datetime.utcnow()
+    )
+
+
+def make_event(user_id=1):
+    return UserEvent(type=USER_CREATED, user_id=user_id, data={'id': user_id})
+
+
+class TestSQLAlchemyUnitOfWork:
+    def test_commits_once_at_the_end(self, app):
+        """Test los repositorios solo hacen flush y la unidad confirma una vez"""
+        unit_of_work = SQLAlchemyUnitOfWork(db.session)
+        db.session.commit = Mock(wraps=db.session.commit)
+
+        first = unit_of_work.users.save(make_user('a@example.com'))
+        unit_of_work.users.save(make_user('b@example.com'))
+        unit_of_work.users.delete(first.id)
+        unit_of_work.commit()
+
+        assert db.session.commit.call_count == 1
+        assert [user.email for user in UserModel.query.all()] == ['b@example.com']
+
+    def test_rollback_discards_changes(self, app):
+        """Test revertir la unidad descarta todo lo escrito en la petición"""
+        unit_of_work = SQLAlchemyUnitOfWork(db.session)
+
+        saved = unit_of_work.users.save(make_user('a@example.com'))
+        assert saved.id is not None
+        unit_of_work.rollback()
+
+        assert UserModel.query.count() == 0
+
+    def test_savepoint_rolls_back_only_nested_block(self, app):
+        """Test un fallo dentro de un savepoint no revierte el resto de la transacción"""
+        unit_of_work = SQLAlchemyUnitOfWork(db.session)
+        unit_of_work.users.save(make_user('a@example.com'))
+
+        with pytest.raises(ValueError):
+            with unit_of_work.savepoint():
+                unit_of_work.users.save(make_user('b@example.com'))
+                raise ValueError('fallo')
+        unit_of_work.commit()
+
+        assert [user.email for user in UserModel.query.all()] == ['a@example.com']
+
+    def test_events_are_published_after_commit(self, app):
+        """Test los eventos se retienen hasta el commit"""
+        publisher = Mock()
+        unit_of_work = SQLAlchemyUnitOfWork(db.session, event_publisher=publisher)
+
+        unit_of_work.publish(make_event())
+        publisher.publish.assert_not_called()
+        unit_of_work.commit()
+
+        publisher.publish.assert_called_once()
+
+    def test_events_are_dropped_on_rollback(self, app):
+        """Test revertir descarta también los eventos del savepoint y de la unidad"""
+        publisher = Mock()
+        unit_of_work = SQLAlchemyUnitOfWork(db.session, event_publisher=publisher)
+        unit_of_work.publish(make_event(1))
+
+        with pytest.raises(ValueError):
+            with unit_of_work.savepoint():
+                unit_of_work.publish(make_event(2))
+                raise ValueError('fallo')
+        unit_of_work.commit()
+        unit_of_work.publish(make_event(3))
+        unit_of_work.rollback()
+        unit_of_work.commit()
+
+        assert [call.args[0].user_id for call in publisher.publish.call_args_list] == [1]
+
+    def test_context_manager_commits_on_success(self, app):
+        """Test usar la unidad como context manager confirma al salir"""
+        with SQLAlchemyUnitOfWork(db.session) as unit_of_work:
+            unit_of_work.users.save(make_user('a@example.com'))
+        db.session.expire_all()
+
+        assert UserModel.query.count() == 1
+
+
+class TestAutocommitUnitOfWork:
+    def test_publishes_immediately(self):
+        """Test con repositorios que confirman cada operación los eventos no se retienen"""
+        publisher = Mock()
+        unit_of_work = AutocommitUnitOfWork(InMemoryUserRepository(), event_publisher=publisher)
+
+        unit_of_work.publish(make_event())
+
+        publisher.publish.assert_called_once()
+
+
+class TestRequestUnitOfWork:
+    def test_get_unit_of_work_is_request_scoped(self, app):
+        """Test la unidad se crea una vez por petición y se cierra al terminar"""
+        with app.test_request_context():
+            unit_of_work = get_unit_of_work()
+            assert get_unit_of_work() is unit_of_work
+            unit_of_work.users.save(make_user('a@example.com'))
+
+            finish_unit_of_work(commit=True)
+
+            assert 'unit_of_work' not in g
+            assert get_unit_of_work() is not unit_of_work
+
+    def test_uses_configured_repository(self, app):
+        """Test con un repositorio no SQLAlchemy se usa una unidad sin transacción"""
+        repository = InMemoryUserRepository()
+        app.extensions['user_repository'] = repository
+        with app.test_request_context():
+            unit_of_work = get_unit_of_work()
+
+            assert isinstance(unit_of_work, AutocommitUnitOfWork)
+            assert unit_of_work.users is repository
@@ -0,0 +1,113 @@
+import json
+import os
+import pytest
+from flask import Flask
+
+from src.infrastructure.database.models import UserModel, db
+from src.interfaces.cli.user_commands import users_cli
+
+
+@pytest.fixture
+def app():
+    """Create test Flask app with the users CLI"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    app.cli.add_command(users_cli)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def runner(app):
+    return app.test_cli_runner()
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'users.csv'
+    path.write_text(
+        'email,password,first_name,last_name,is_active\n'
+        'ana@example.com,secret,Ana,Núñez,true\n'
+        'not-an-email,secret,Bad,Row,true\n'
+        'luis@example.com,secret,Luis,Peña,false\n',
+        encoding='utf-8'
+    )
+    return path
+
+
+class TestImportUsersCommand:
+    def test_import_csv(self, runner, csv_file):
+        """Test importar un CSV válido con una fila inválida"""
+        result = runner.invoke(args=['users', 'import', str(csv_file), '--chunk-size', '2'])
+
+        assert result.exit_code == 0
+        assert UserModel.query.count() == 2
+        assert UserModel.query.filter_by(email='luis@example.com').one().is_active is False
+        assert 'Fila 2 rechazada' in result.output
+        assert not os.path.exists(f'{csv_file}.checkpoint.json')
+
+    def test_import_ndjson(self, runner, tmp_path):
+        """Test importar un archivo NDJSON"""
+        path = tmp_path / 'users.ndjson'
+        path.write_text(
+            json.dumps({'email': 'zoe@example.com', 'password': 'x',
+                        'first_name': 'Zoë', 'last_name': 'Björk'}) + '\n',
+            encoding='utf-8'
+        )
+
+        result = runner.invoke(args=['users', 'import', str(path)])
+
+        assert result.exit_code == 0
+        assert UserModel.query.one().first_name == 'Zoë'
+
+    def test_import_ndjson_rejects_malformed_line(self, runner, tmp_path):
+        """Test una línea NDJSON mal formada se rechaza sin abortar la importación"""
+        path = tmp_path / 'users.ndjson'
+        valid = {'email': 'zoe@example.com', 'password': 'x', 'first_name': 'Zoë', 'last_name': 'Björk'}
+        path.write_text(
+            json.dumps(valid) + '\n\n{"email": "roto@example.com",\n'
+            + json.dumps(dict(valid, email='ines@example.com')) + '\n',
+            encoding='utf-8'
+        )
+
+        result = runner.invoke(args=['users', 'import', str(path)])
+
+        assert result.exit_code == 0
+        assert UserModel.query.count() == 2
+        assert 'Fila 2 rechazada: JSON inválido en la línea 3' in result.output
+
+    def test_import_resumes_from_checkpoint(self, runner, csv_file):
+        """Test reanudar la importación desde un checkpoint existente"""
+        checkpoint = f'{csv_file}.checkpoint.json'
+        with open(checkpoint, 'w', encoding='utf-8') as handle:
+            json.dump({'records': 2, 'loaded': 1, 'rejected': 1}, handle)
+
+        result = runner.invoke(args=['users', 'import', str(csv_file)])
+
+        assert result.exit_code == 0
+        assert 'Reanudando desde la fila 2' in result.output
+        assert [user.email for user in UserModel.query.all()] == ['luis@example.com']
+
+
+class TestSeedUsersCommand:
+    def test_seed_generates_unique_users(self, runner):
+        """Test generar usuarios sintéticos con emails únicos"""
+        result = runner.invoke(args=['users', 'seed', '--count', '250', '--batch-size', '100'])
+
+        assert result.exit_code == 0
+        assert UserModel.query.count() == 250
+        assert db.session.query(UserModel.email).distinct().count() == 250
+
+    def test_seed_extends_table_with_start_index(self, runner):
+        """Test ampliar una tabla sembrada sin colisiones de email"""
+        runner.invoke(args=['users', 'seed', '--count', '50'])
+
+        result = runner.invoke(args=['users', 'seed', '--count', '50', '--start-index', '50'])
+
+        assert result.exit_code == 0
+        assert UserModel.query.count() == 100
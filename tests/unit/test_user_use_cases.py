@@ -3,6 +3,9 @@ from datetime import datetime
 from unittest.mock import Mock
 
 from src.core.entities.user import User
+from src.core.entities.user_changes import ChangeCursor, UserChanges
+from src.core.entities.user_event import USER_CREATED, USER_DEACTIVATED, USER_DELETED
+from src.core.exceptions import ConcurrencyConflictError
 from src.application.use_cases.user_use_cases import UserUseCases, CreateUserDTO, UpdateUserDTO
 
 
@@ -14,6 +17,14 @@ def mock_repository():
 def user_use_cases(mock_repository):
     return UserUseCases(mock_repository)
 
+@pytest.fixture
+def mock_publisher():
+    return Mock()
+
+@pytest.fixture
+def publishing_use_cases(mock_repository, mock_publisher):
+    return UserUseCases(mock_repository, mock_publisher)
+
 @pytest.fixture
 def sample_user():
     return User(
@@ -99,6 +110,16 @@ class TestUserUseCases:
         mock_repository.get_by_id.assert_called_once_with(1)
         mock_repository.update.assert_called_once()
 
+    def test_update_user_version_mismatch(self, user_use_cases, mock_repository, sample_user):
+        # Arrange
+        sample_user.version = 3
+        mock_repository.get_by_id.return_value = sample_user
+
+        # Act & Assert
+        with pytest.raises(ConcurrencyConflictError):
+            user_use_cases.update_user(1, UpdateUserDTO(first_name="Updated", last_name="Name"), expected_version=2)
+        mock_repository.update.assert_not_called()
+
     def test_delete_user_success(self, user_use_cases, mock_repository, sample_user):
         # Arrange
         mock_repository.get_by_id.return_value = sample_user
@@ -124,4 +145,68 @@ class TestUserUseCases:
         assert result == sample_user
         assert not result.is_active
         mock_repository.get_by_id.assert_called_once_with(1)
-        mock_repository.update.assert_called_once()
\ No newline at end of file
+        mock_repository.update.assert_called_once()
+
+    def test_get_user_changes(self, user_use_cases, mock_repository):
+        # Arrange
+        cursor = ChangeCursor()
+        until = datetime.utcnow()
+        mock_repository.get_changes.return_value = UserChanges(cursor=cursor)
+
+        # Act
+        result = user_use_cases.get_user_changes(cursor, 100, until)
+
+        # Assert
+        assert result.cursor == cursor
+        mock_repository.get_changes.assert_called_once_with(cursor, 100, until)
+
+
+class TestUserUseCasesEvents:
+    def test_create_user_publishes_event(self, publishing_use_cases, mock_repository, mock_publisher, sample_user):
+        # Arrange
+        mock_repository.exists_by_email.return_value = False
+        mock_repository.save.return_value = sample_user
+
+        # Act
+        publishing_use_cases.create_user(CreateUserDTO(
+            email="test@example.com", password="password123", first_name="Test", last_name="User"
+        ))
+
+        # Assert
+        event = mock_publisher.publish.call_args[0][0]
+        assert event.type == USER_CREATED
+        assert event.user_id == sample_user.id
+        assert 'password' not in event.data
+
+    def test_deactivate_publishes_event(self, publishing_use_cases, mock_repository, mock_publisher, sample_user):
+        # Arrange
+        mock_repository.get_by_id.return_value = sample_user
+        mock_repository.update.return_value = sample_user
+
+        # Act
+        publishing_use_cases.toggle_user_status(1, False)
+
+        # Assert
+        assert mock_publisher.publish.call_args[0][0].type == USER_DEACTIVATED
+
+    def test_delete_publishes_event(self, publishing_use_cases, mock_repository, mock_publisher, sample_user):
+        # Arrange
+        mock_repository.get_by_id.return_value = sample_user
+        mock_repository.delete.return_value = True
+
+        # Act
+        publishing_use_cases.delete_user(1)
+
+        # Assert
+        assert mock_publisher.publish.call_args[0][0].type == USER_DELETED
+
+    def test_failed_create_does_not_publish(self, publishing_use_cases, mock_repository, mock_publisher):
+        # Arrange
+        mock_repository.exists_by_email.return_value = True
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            publishing_use_cases.create_user(CreateUserDTO(
+                email="test@example.com", password="x", first_name="Test", last_name="User"
+            ))
+        mock_publisher.publish.assert_not_called()
@@ -0,0 +1,123 @@
+import time
+
+import pytest
+from flask import Flask
+
+from src.interfaces.rest.docs import swag_from
+from src.interfaces.rest.schemas import CREATE_USER_SCHEMA
+from src.interfaces.rest.validation import USER_FIELD_LIMITS, compile_schema, validate_body
+
+VALID_USER = {'email': 'ana@example.com', 'password': 'secret', 'first_name': 'Ana', 'last_name': 'Pérez'}
+
+
+@pytest.fixture
+def validate():
+    return compile_schema(CREATE_USER_SCHEMA, USER_FIELD_LIMITS)
+
+
+class TestCompileSchema:
+    def test_limits_match_user_model(self):
+        """Test los límites salen del tamaño de las columnas de UserModel"""
+        assert USER_FIELD_LIMITS['email'] == 255
+        assert USER_FIELD_LIMITS['first_name'] == 100
+
+    def test_valid_object(self, validate):
+        """Test un objeto válido no tiene errores"""
+        assert validate(VALID_USER) == {}
+
+    @pytest.mark.parametrize('changes, field, error', [
+        ({'email': None}, 'email', 'es obligatorio'),
+        ({'first_name': 123}, 'first_name', 'debe ser de tipo string'),
+        ({'last_name': ''}, 'last_name', 'debe tener al menos 1 caracteres'),
+        ({'first_name': 'a' * 101}, 'first_name', 'supera 100 caracteres'),
+        ({'email': 'no-es-un-email'}, 'email', 'formato inválido'),
+    ])
+    def test_field_errors(self, validate, changes, field, error):
+        """Test cada regla del esquema produce un error por campo"""
+        assert validate(dict(VALID_USER, **changes)) == {field: error}
+
+    def test_non_object(self, validate):
+        """Test un cuerpo que no es objeto se rechaza"""
+        assert validate(['a']) == {'body': 'se esperaba un objeto'}
+
+    def test_bool_is_not_a_number(self):
+        """Test un booleano no pasa por integer"""
+        validate = compile_schema({'properties': {'age': {'type': 'integer'}}})
+
+        assert validate({'age': True}) == {'age': 'debe ser de tipo integer'}
+
+    def test_unsupported_type(self):
+        """Test un tipo desconocido falla al compilar, no al validar"""
+        with pytest.raises(ValueError):
+            compile_schema({'properties': {'x': {'type': 'uuid'}}})
+
+    def test_validation_is_fast(self, validate):
+        """Test validar un cuerpo cuesta microsegundos"""
+        started = time.perf_counter()
+        for _ in range(10000):
+            validate(VALID_USER)
+
+        assert (time.perf_counter() - started) / 10000 < 50e-6
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config['REQUEST_MAX_BODY_SIZE'] = 1024
+    calls = []
+
+    @app.route('/users', methods=['POST'])
+    @validate_body
+    @swag_from({'parameters': [{'in': 'body', 'name': 'body', 'schema': CREATE_USER_SCHEMA}]})
+    def create_user():
+        calls.append(True)
+        return {'ok': True}, 201
+
+    client = app.test_client()
+    client.calls = calls
+    return client
+
+
+class TestValidateBody:
+    def test_valid_body_reaches_view(self, client):
+        """Test un cuerpo válido llega a la vista"""
+        response = client.post('/users', json=VALID_USER)
+
+        assert response.status_code == 201
+        assert client.calls == [True]
+
+    def test_invalid_body_returns_400(self, client):
+        """Test un cuerpo inválido responde 400 con el detalle y no ejecuta la vista"""
+        response = client.post('/users', json=dict(VALID_USER, first_name=['x']))
+
+        assert response.status_code == 400
+        assert response.get_json() == {
+            'error': 'Datos inválidos', 'fields': {'first_name': 'debe ser de tipo string'}
+        }
+        assert client.calls == []
+
+    def test_malformed_json_returns_400(self, client):
+        """Test un JSON mal formado responde 400"""
+        response = client.post('/users', data='{"email":', content_type='application/json')
+
+        assert response.status_code == 400
+        assert client.calls == []
+
+    def test_non_json_body_returns_400(self, client):
+        """Test un cuerpo que no es JSON responde 400 en lugar de 500"""
+        response = client.post('/users', data='email=a', content_type='application/x-www-form-urlencoded')
+
+        assert response.status_code == 400
+
+    def test_oversized_body_returns_413(self, client):
+        """Test un cuerpo mayor que REQUEST_MAX_BODY_SIZE responde 413 sin leerlo"""
+        response = client.post('/users', json=dict(VALID_USER, password='x' * 2000))
+
+        assert response.status_code == 413
+        assert response.get_json() == {'error': 'Cuerpo de la petición demasiado grande'}
+        assert client.calls == []
+
+    def test_requires_body_schema(self):
+        """Test aplicar el decorador a una vista sin esquema falla al importar"""
+        with pytest.raises(ValueError):
+            validate_body(swag_from({'parameters': []})(lambda: None))
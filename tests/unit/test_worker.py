@@ -0,0 +1,141 @@
+import os
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from src.config import Config
+from src.infrastructure.auth.token_blocklist import TokenBlocklist
+from src.infrastructure.database.models import TokenBlocklistModel, db
+from src.infrastructure.events.broker import InProcessEventBroker
+from src.infrastructure.events.postgres_bridge import PostgresNotifyBridge
+from src.interfaces.rest.docs import ApiDocs
+from src.worker import after_fork, app_engines, warm_pool, warm_up
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'users.db'}"
+    app.config['SWAGGER'] = Config.SWAGGER
+    app.config['WORKER_WARMUP_CONNECTIONS'] = 2
+    db.init_app(app)
+    with app.app_context():
+        TokenBlocklistModel.__table__.create(db.engine)
+        app.extensions['token_blocklist'] = TokenBlocklist(db.engine)
+    ApiDocs(app)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def engine_of(app):
+    return app_engines(app)[0]
+
+
+class TestWarmPool:
+    def test_opens_connections_up_to_pool_size(self, tmp_path):
+        """Test abre las conexiones pedidas sin superar el tamaño del pool"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=3)
+
+        assert warm_pool(engine, 2) == 2
+        assert engine.pool.checkedin() == 2
+        assert warm_pool(engine, 10) == 3
+        assert engine.pool.checkedin() == 3
+
+    def test_skips_pools_that_do_not_keep_connections(self, tmp_path):
+        """Test con NullPool no hay nada que precalentar"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=NullPool)
+
+        assert warm_pool(engine, 2) == 0
+
+
+class TestWorkerLifecycle:
+    def test_warm_up_fills_pool_and_caches(self, app):
+        """Test el precalentamiento abre conexiones, carga el filtro y genera la especificación"""
+        elapsed = warm_up(app)
+
+        assert elapsed > 0
+        assert engine_of(app).pool.checkedin() == 2
+        assert app.extensions['token_blocklist']._bloom is not None
+        assert 'apispec_1' in app.extensions['api_docs']._documents
+
+    def test_warm_up_survives_database_errors(self, app, tmp_path):
+        """Test una base de datos inaccesible no impide arrancar el worker"""
+        app.extensions['token_blocklist'] = TokenBlocklist(create_engine(f"sqlite:///{tmp_path}/missing/x.db"))
+
+        warm_up(app)
+
+        assert 'apispec_1' in app.extensions['api_docs']._documents
+
+    def test_after_fork_forgets_inherited_connections(self, app):
+        """Test tras el fork el pool queda vacío sin cerrar las conexiones del padre"""
+        warm_up(app)
+        with engine_of(app).connect() as connection:
+            inherited = connection.connection.dbapi_connection
+
+        after_fork(app)
+
+        assert engine_of(app).pool.checkedin() == 0
+        assert inherited.execute('SELECT 1').fetchone() == (1,)
+
+    def test_forked_worker_uses_its_own_connections(self, app):
+        """Test un proceso hijo consulta con conexiones propias y el padre conserva las suyas"""
+        warm_up(app)
+        pid = os.fork()
+        if pid == 0:
+            try:
+                after_fork(app)
+                with engine_of(app).connect() as connection:
+                    connection.exec_driver_sql('SELECT 1')
+                os._exit(0 if engine_of(app).pool.checkedin() == 1 else 1)
+            except BaseException:
+                os._exit(2)
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert engine_of(app).pool.checkedin() == 2
+
+    def test_broker_restarts_bridge_after_fork(self, monkeypatch):
+        """Test el puente de eventos se recrea con la misma configuración y se inicia"""
+        started = []
+        monkeypatch.setattr(PostgresNotifyBridge, 'start', lambda bridge: started.append(bridge))
+        monkeypatch.setattr(PostgresNotifyBridge, 'started', property(lambda bridge: bridge in started))
+        broker = InProcessEventBroker()
+        inherited = PostgresNotifyBridge('postgresql://admin@localhost/users_db', 'user_events', broker.dispatch)
+        inherited.start()
+        broker.bridge = inherited
+
+        broker.after_fork()
+
+        assert broker.bridge is not inherited
+        assert (broker.bridge.dsn, broker.bridge.channel) == (inherited.dsn, inherited.channel)
+        assert started == [inherited, broker.bridge]
+
+    def test_broker_starts_deferred_bridge_after_fork(self, monkeypatch):
+        """Test un puente que el maestro no inició se inicia en el worker sin recrearlo"""
+        started = []
+        monkeypatch.setattr(PostgresNotifyBridge, 'start', lambda bridge: started.append(bridge))
+        app = Flask(__name__)
+        app.config.update(
+            EVENT_BRIDGE='postgres', EVENT_BRIDGE_AUTOSTART=False,
+            SQLALCHEMY_DATABASE_URI='postgresql://admin@localhost/users_db'
+        )
+        broker = InProcessEventBroker()
+        broker.init_app(app)
+        bridge = broker.bridge
+
+        assert started == []
+        broker.after_fork()
+
+        assert broker.bridge is bridge
+        assert started == [bridge]
+
+    def test_broker_without_bridge_is_unchanged(self):
+        """Test sin puente after_fork no hace nada"""
+        broker = InProcessEventBroker()
+
+        broker.after_fork()
+
+        assert broker.bridge is None